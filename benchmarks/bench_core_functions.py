@@ -0,0 +1,260 @@
+"""
+Benchmarks of the loan_ranger hot paths.
+
+Times the scalar and batch entry points over a realistic parameter grid, records
+TAEG solver iteration counts, and writes everything as JSON. A previous JSON
+file can be given as baseline to flag regressions, the exit code is then 1 if
+any benchmark got slower than the allowed tolerance.
+
+Usage
+-----
+python -m benchmarks.bench_core_functions --output bench.json
+python -m benchmarks.bench_core_functions --compare bench.json --tolerance 0.2
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import timeit
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+import numpy as np
+import scipy
+
+from loan_ranger.batch_functions import compute_all_quantities_batch, compute_taeg_batch
+from loan_ranger.common_objects import LoanInputs
+from loan_ranger.core_functions import (
+    compute_all_quantities,
+    compute_interest_cost,
+    compute_taeg,
+    compute_taeg_pair,
+)
+
+DURATIONS = (12, 60, 120, 240, 360, 480)
+RATES = (0.0, 0.005, 0.02, 0.05, 0.1, 0.2)
+INITIAL_COSTS = (0.0, 1500.0)
+INSURANCE_COSTS = (0.0, 10000.0)
+INITIAL_CAPITAL = 200000.0
+BATCH_SIZE = 100_000
+
+
+def _parameter_grid() -> list[LoanInputs]:
+    """
+    Build the benchmark grid: every duration x rate x fees x insurance combination.
+
+    Returns
+    -------
+    list[LoanInputs]
+        One loan per grid cell
+    """
+    return [
+        LoanInputs(INITIAL_CAPITAL, rate, duration, initial_cost, insurance_cost)
+        for duration, rate, initial_cost, insurance_cost in itertools.product(
+            DURATIONS, RATES, INITIAL_COSTS, INSURANCE_COSTS
+        )
+    ]
+
+
+def _time_per_call(function: Callable[[], object], calls: int, repeat: int) -> float:
+    """
+    Time a function, keeping the best of several repeats.
+
+    Parameters
+    ----------
+    function : Callable[[], object]
+        Function to time, without arguments
+    calls : int
+        Number of loans processed by one call of `function`
+    repeat : int
+        Number of timing repeats
+
+    Returns
+    -------
+    float
+        Best time per processed loan, in seconds
+    """
+    timer = timeit.Timer(function)
+    loops, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=loops)) / (loops * calls)
+
+
+def run_benchmarks(repeat: int = 5) -> dict:
+    """
+    Run every benchmark.
+
+    Parameters
+    ----------
+    repeat : int, optional
+        Number of timing repeats per benchmark, by default 5
+
+    Returns
+    -------
+    dict
+        JSON-serializable results, with `metadata`, `timings` (seconds per loan)
+        and `iterations` (TAEG solver iteration statistics) sections
+    """
+    grid = _parameter_grid()
+    costs = [
+        compute_interest_cost(loan.annual_rate, loan.month_number, loan.initial_capital)[1]
+        + loan.initial_cost
+        + loan.insurance_cost
+        for loan in grid
+    ]
+
+    batch = LoanInputs(*(np.resize(np.array(column), BATCH_SIZE) for column in zip(*grid, strict=True)))
+    batch_costs = np.resize(np.array(costs), BATCH_SIZE)
+
+    timings = {
+        "compute_interest_cost": _time_per_call(
+            lambda: [compute_interest_cost(loan.annual_rate, loan.month_number, loan.initial_capital) for loan in grid],
+            len(grid),
+            repeat,
+        ),
+        "compute_taeg": _time_per_call(
+            lambda: [
+                compute_taeg(loan.month_number, cost, loan.initial_cost, loan.initial_capital)
+                for loan, cost in zip(grid, costs, strict=True)
+            ],
+            len(grid),
+            repeat,
+        ),
+        "compute_all_quantities": _time_per_call(
+            lambda: [compute_all_quantities(loan) for loan in grid], len(grid), repeat
+        ),
+        "compute_taeg_batch": _time_per_call(
+            lambda: compute_taeg_batch(batch.month_number, batch_costs, batch.initial_cost, batch.initial_capital),
+            BATCH_SIZE,
+            repeat,
+        ),
+        "compute_all_quantities_batch": _time_per_call(lambda: compute_all_quantities_batch(batch), BATCH_SIZE, repeat),
+    }
+
+    taeg_pairs = [
+        compute_taeg_pair(
+            loan.month_number,
+            cost,
+            cost - loan.insurance_cost,
+            loan.initial_cost,
+            loan.initial_capital,
+        )
+        for loan, cost in zip(grid, costs, strict=True)
+    ]
+    full_iterations = np.array([pair.full_iterations for pair in taeg_pairs])
+    no_insurance_iterations = np.array([pair.no_insurance_iterations for pair in taeg_pairs])
+
+    iterations = {
+        "full_taeg_mean": float(full_iterations.mean()),
+        "full_taeg_max": int(full_iterations.max()),
+        "no_insurance_taeg_mean": float(no_insurance_iterations.mean()),
+        "no_insurance_taeg_max": int(no_insurance_iterations.max()),
+    }
+
+    metadata = {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "grid_size": len(grid),
+        "batch_size": BATCH_SIZE,
+    }
+
+    return {"metadata": metadata, "timings": timings, "iterations": iterations}
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    List the benchmarks that regressed compared to a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        Output of `run_benchmarks`
+    baseline : dict
+        Previous output of `run_benchmarks`
+    tolerance : float
+        Allowed relative slowdown (or iteration increase), e.g. 0.2 for 20%
+
+    Returns
+    -------
+    list[str]
+        One human readable line per regression, empty if none
+    """
+    regressions = []
+    for section in ("timings", "iterations"):
+        for name, baseline_value in baseline.get(section, {}).items():
+            value = results.get(section, {}).get(name)
+            if value is None or baseline_value <= 0:
+                continue
+            ratio = value / baseline_value
+            if ratio > 1 + tolerance:
+                regressions.append(f"{section}.{name}: {baseline_value:.4g} -> {value:.4g} ({ratio - 1:+.1%})")
+    return regressions
+
+
+def _print_results(results: dict) -> None:
+    """
+    Print a readable summary of the benchmark results on stderr.
+
+    Parameters
+    ----------
+    results : dict
+        Output of `run_benchmarks`
+    """
+    for name, seconds in results["timings"].items():
+        print(f"{name:<32} {seconds * 1e6:>12.3f} µs/loan", file=sys.stderr)
+    for name, value in results["iterations"].items():
+        print(f"{name:<32} {value:>12.2f} iterations", file=sys.stderr)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the benchmarks from the command line.
+
+    Parameters
+    ----------
+    argv : list[str] | None, optional
+        Command-line arguments, by default None (read from sys.argv)
+
+    Returns
+    -------
+    int
+        Exit code, 1 if a regression was found against the baseline
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="JSON file receiving the results, stdout by default")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown, default 0.2")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per benchmark, default 5")
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    results = run_benchmarks(repeat=args.repeat)
+    _print_results(results)
+    print(f"Benchmarks ran in {time.perf_counter() - start_time:.1f} s", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            regressions = compare_to_baseline(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No regression against baseline", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
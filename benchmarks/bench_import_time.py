@@ -0,0 +1,144 @@
+"""
+Benchmark of the loan_ranger start-up cost.
+
+Each scenario runs in fresh interpreters, timing the statements from inside the
+child process so interpreter start-up noise is left out. Also checks which heavy
+dependencies each scenario pulls in, a single quote must not import SciPy.
+
+Usage
+-----
+python -m benchmarks.bench_import_time --output import.json
+python -m benchmarks.bench_import_time --compare import.json --tolerance 0.3
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import UTC, datetime
+
+from benchmarks.bench_core_functions import compare_to_baseline
+
+SCENARIOS = {
+    "import_package": "import loan_ranger",
+    "first_quote": (
+        "from loan_ranger import LoanInputs, compute_all_quantities\n"
+        "compute_all_quantities(LoanInputs(200000.0, 0.02, 240, 1000.0, 8000.0))"
+    ),
+    "first_batch_quote": (
+        "import numpy as np\n"
+        "from loan_ranger import LoanInputs, compute_all_quantities_batch\n"
+        "compute_all_quantities_batch(LoanInputs(np.array([200000.0]), 0.02, 240, 1000.0, 8000.0))"
+    ),
+}
+
+HEAVY_MODULES = ("numpy", "scipy")
+
+CHILD_TEMPLATE = """
+import json, sys, time
+start_time = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start_time
+print(json.dumps({{"seconds": elapsed, "modules": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def _run_scenario(statement: str) -> dict:
+    """
+    Time a statement in a fresh interpreter.
+
+    Parameters
+    ----------
+    statement : str
+        Python code to run
+
+    Returns
+    -------
+    dict
+        Elapsed seconds and heavy modules loaded by the statement
+    """
+    code = CHILD_TEMPLATE.format(statement=statement, heavy=HEAVY_MODULES)
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmarks(repeat: int = 10) -> dict:
+    """
+    Run every start-up scenario.
+
+    Parameters
+    ----------
+    repeat : int, optional
+        Number of fresh interpreters per scenario, by default 10
+
+    Returns
+    -------
+    dict
+        JSON-serializable results, with `metadata`, `timings` (best seconds per
+        scenario) and `modules` (heavy modules loaded per scenario) sections
+    """
+    timings = {}
+    modules = {}
+    for name, statement in SCENARIOS.items():
+        runs = [_run_scenario(statement) for _ in range(repeat)]
+        timings[name] = min(run["seconds"] for run in runs)
+        modules[name] = runs[0]["modules"]
+
+    metadata = {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+    }
+
+    return {"metadata": metadata, "timings": timings, "modules": modules}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the start-up benchmarks from the command line.
+
+    Parameters
+    ----------
+    argv : list[str] | None, optional
+        Command-line arguments, by default None (read from sys.argv)
+
+    Returns
+    -------
+    int
+        Exit code, 1 if a regression was found or a single quote imported SciPy
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="JSON file receiving the results, stdout by default")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed relative slowdown, default 0.3")
+    parser.add_argument("--repeat", type=int, default=10, help="fresh interpreters per scenario, default 10")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(repeat=args.repeat)
+    for name, seconds in results["timings"].items():
+        loaded = ", ".join(results["modules"][name]) or "-"
+        print(f"{name:<24} {seconds * 1e3:>10.1f} ms   loads: {loaded}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    problems = []
+    if "scipy" in results["modules"]["first_quote"]:
+        problems.append("first_quote imports scipy")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            problems += compare_to_baseline(results, json.load(baseline_file), args.tolerance)
+
+    for problem in problems:
+        print(f"REGRESSION {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,126 @@
-from .common_objects import LoanInputs, LoanResult
-from .core_functions import compute_all_quantities
-from .shell_interface import full_simu
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["LoanInputs", "LoanResult", "compute_all_quantities", "full_simu"]
+if TYPE_CHECKING:
+    from .annuity_table import AnnuityTable
+    from .batch_functions import compute_all_quantities_batch
+    from .cache import QuoteCache
+    from .cash_flows import compute_effective_rate, compute_effective_rate_batch
+    from .common_objects import (
+        BorrowerProfile,
+        LoanEvent,
+        LoanInputs,
+        LoanInputsBatch,
+        LoanResult,
+        LoanResultBatch,
+        Offer,
+        Tranche,
+        VariableRateModel,
+    )
+    from .core_functions import (
+        compute_all_quantities,
+        compute_implied_rate,
+        compute_max_capital,
+        compute_required_duration,
+    )
+    from .exact_cents import compute_exact_quantities_batch, compute_exact_schedule
+    from .instrumentation import collect_solver_stats
+    from .offers import OfferCatalog
+    from .packages import compute_package, compute_package_batch
+    from .parallel import compute_portfolio
+    from .portfolio_file import PortfolioWriter, open_portfolio, price_portfolio_file, write_portfolio
+    from .profiling import profile
+    from .rate_grid import compute_rate_grid
+    from .scenarios import LoanScenario, evaluate_scenario, sweep_prepayment_month
+    from .schedule import compute_amortization_schedule, iter_amortization_schedule
+    from .server import MicroBatcher, QuoteServer
+    from .session import QuoteSession
+    from .shell_interface import full_simu
+    from .variable_rate import simulate_variable_rate
+
+# Public names and the submodule defining them, submodules are only imported on first access
+_LAZY_NAMES = {
+    "AnnuityTable": "annuity_table",
+    "BorrowerProfile": "common_objects",
+    "LoanEvent": "common_objects",
+    "LoanInputs": "common_objects",
+    "LoanInputsBatch": "common_objects",
+    "LoanResult": "common_objects",
+    "LoanResultBatch": "common_objects",
+    "LoanScenario": "scenarios",
+    "MicroBatcher": "server",
+    "Offer": "common_objects",
+    "OfferCatalog": "offers",
+    "PortfolioWriter": "portfolio_file",
+    "QuoteCache": "cache",
+    "QuoteServer": "server",
+    "QuoteSession": "session",
+    "Tranche": "common_objects",
+    "VariableRateModel": "common_objects",
+    "collect_solver_stats": "instrumentation",
+    "compute_all_quantities": "core_functions",
+    "compute_all_quantities_batch": "batch_functions",
+    "compute_amortization_schedule": "schedule",
+    "compute_effective_rate": "cash_flows",
+    "compute_effective_rate_batch": "cash_flows",
+    "compute_exact_quantities_batch": "exact_cents",
+    "compute_exact_schedule": "exact_cents",
+    "compute_implied_rate": "core_functions",
+    "compute_max_capital": "core_functions",
+    "compute_package": "packages",
+    "compute_package_batch": "packages",
+    "compute_portfolio": "parallel",
+    "compute_rate_grid": "rate_grid",
+    "compute_required_duration": "core_functions",
+    "evaluate_scenario": "scenarios",
+    "full_simu": "shell_interface",
+    "iter_amortization_schedule": "schedule",
+    "open_portfolio": "portfolio_file",
+    "price_portfolio_file": "portfolio_file",
+    "profile": "profiling",
+    "simulate_variable_rate": "variable_rate",
+    "sweep_prepayment_month": "scenarios",
+    "write_portfolio": "portfolio_file",
+}
+
+__all__ = list(_LAZY_NAMES)
+
+
+def __getattr__(name: str):
+    """
+    Resolve public names lazily, importing their submodule on first access.
+
+    Parameters
+    ----------
+    name : str
+        Attribute looked up on the package
+
+    Returns
+    -------
+    object
+        The public object, cached in the package namespace afterwards
+
+    Raises
+    ------
+    AttributeError
+        If the name is not part of the public API
+    """
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """
+    List module attributes including not yet imported public names.
+
+    Returns
+    -------
+    list[str]
+        Sorted attribute names
+    """
+    return sorted(set(globals()) | set(__all__))
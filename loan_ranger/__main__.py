@@ -1,11 +1,106 @@
+import argparse
+import sys
+from contextlib import ExitStack
+
+from .profiling import profile
 from .shell_interface import full_simu
 
 
-def main():
+def _build_parser() -> argparse.ArgumentParser:
     """
-    Main entry point for the loan ranger application.
+    Build the command-line parser.
 
-    This function provides a simple command-line interface for the loan calculator.
+    Returns
+    -------
+    argparse.ArgumentParser
+        Parser with the optional `price` and `serve` sub-commands. Without
+        sub-command the interactive simulator is started.
+    """
+    parser = argparse.ArgumentParser(prog="python -m loan_ranger", description="Loan calculator and simulator.")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time the pricing stages and print a summary, hottest first, on stderr at exit",
+    )
+    parser.add_argument(
+        "--profile-dump", default=None, help="also run under cProfile and dump the statistics to this file"
+    )
+    parser.add_argument("--profile-json", default=None, help="also export the stage summary as JSON to this file")
+    subparsers = parser.add_subparsers(dest="command")
+
+    price_parser = subparsers.add_parser(
+        "price",
+        help="price a CSV file of loans, results are written as CSV on stdout",
+    )
+    price_parser.add_argument(
+        "input",
+        nargs="?",
+        default="-",
+        help="CSV file with initial_capital, annual_rate, month_number and optionally "
+        "initial_cost and insurance_cost columns, '-' or nothing to read stdin",
+    )
+    price_parser.add_argument(
+        "--rejects",
+        default=None,
+        help="file receiving the malformed rows, by default they are written on stderr",
+    )
+    price_parser.add_argument("--chunk-size", type=int, default=10_000, help="loans priced per batch")
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="run a JSON over HTTP quoting server (POST /quote, GET /stats) with request micro-batching",
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1", help="interface to listen on, default 127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000, help="port to listen on, default 8000")
+    serve_parser.add_argument("--max-batch-size", type=int, default=256, help="loans priced per batch, default 256")
+    serve_parser.add_argument(
+        "--max-wait-ms", type=float, default=2.0, help="batching window in milliseconds, default 2"
+    )
+
+    return parser
+
+
+def _run_price(args: argparse.Namespace) -> None:
+    """
+    Run the bulk CSV pricer and report throughput on stderr.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed arguments of the `price` sub-command
+
+    Raises
+    ------
+    SystemExit
+        With status 1 if a file cannot be opened or the input header misses a mandatory column
+    """
+    from .bulk_pricer import price_csv
+
+    # Unreadable files and a header missing mandatory columns end the command with a message, not a traceback
+    try:
+        with ExitStack() as stack:
+            input_stream = sys.stdin
+            if args.input != "-":
+                input_stream = stack.enter_context(open(args.input, newline="", encoding="utf-8"))
+            reject_stream = sys.stderr
+            if args.rejects is not None:
+                reject_stream = stack.enter_context(open(args.rejects, "w", newline="", encoding="utf-8"))
+
+            stats = price_csv(input_stream, sys.stdout, reject_stream, chunk_size=args.chunk_size)
+    except (OSError, ValueError) as error:
+        sys.exit(f"python -m loan_ranger price: error: {error}")
+
+    rows_per_second = stats.priced_rows / stats.elapsed_seconds if stats.elapsed_seconds > 0 else float("inf")
+    print(
+        f"Priced {stats.priced_rows} rows ({stats.rejected_rows} rejected) "
+        f"in {stats.elapsed_seconds:.2f} s: {rows_per_second:,.0f} rows/s",
+        file=sys.stderr,
+    )
+
+
+def _run_interactive() -> None:
+    """
+    Run the interactive simulator until the user stops.
     """
     print("======================================")
     print("    Loan Calculator and Simulator    ")
@@ -25,5 +120,55 @@ def main():
     print("\nThank you for using the Loan Ranger!")
 
 
+def _run_command(args: argparse.Namespace) -> None:
+    """
+    Dispatch to the selected sub-command, or the interactive simulator.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed command-line arguments
+    """
+    if args.command == "price":
+        _run_price(args)
+    elif args.command == "serve":
+        from .server import run_server
+
+        run_server(args.host, args.port, args.max_batch_size, args.max_wait_ms / 1000)
+    else:
+        _run_interactive()
+
+
+def main(argv: list[str] | None = None):
+    """
+    Main entry point for the loan ranger application.
+
+    This function provides a simple command-line interface for the loan calculator.
+    Without arguments it runs the interactive simulator, `price` runs the
+    non-interactive bulk CSV pricer and `serve` the quoting server. With
+    `--profile`, the time spent in each pricing stage is reported at exit.
+
+    Parameters
+    ----------
+    argv : list[str] | None, optional
+        Command-line arguments, by default None (read from sys.argv)
+    """
+    args = _build_parser().parse_args(argv)
+    if not (args.profile or args.profile_dump is not None or args.profile_json is not None):
+        _run_command(args)
+        return
+
+    profiler = None
+    try:
+        with profile(args.profile_dump) as profiler:
+            _run_command(args)
+    finally:
+        # Report what was recorded even when the command failed, if profiling started at all
+        if profiler is not None:
+            print(profiler.report(), file=sys.stderr)
+            if args.profile_json is not None:
+                profiler.export(args.profile_json)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,195 @@
+import numpy as np
+
+from .batch_functions import _installment_per_period_batch
+from .core_functions import _convert_prop_rate
+
+
+def _annuity_factors(annual_rate: np.ndarray, month_number: np.ndarray) -> np.ndarray:
+    """
+    Compute the installment per unit of capital for monthly payments.
+
+    Parameters
+    ----------
+    annual_rate : np.ndarray
+        Annual interest rates (as decimals)
+    month_number : np.ndarray
+        Total numbers of monthly payments
+
+    Returns
+    -------
+    np.ndarray
+        r * (1 + r)^n / ((1 + r)^n - 1) with r the monthly rate, 1 / n for a zero rate
+    """
+    return _installment_per_period_batch(_convert_prop_rate(annual_rate, 12), month_number, 1.0)
+
+
+class AnnuityTable:
+    """
+    Precomputed annuity factors over a grid of annual rates and durations.
+
+    Parameters
+    ----------
+    rate_step : float, optional
+        Annual rate step of the grid, by default 0.0001 (0.01%)
+    max_rate : float, optional
+        Highest annual rate of the grid, by default 0.20
+    max_months : int, optional
+        Longest duration of the grid, by default 480
+    max_bytes : int, optional
+        Maximum memory allowed for the table, by default 64 MiB
+
+    Notes
+    -----
+    The table is only built on the first lookup. It is stored as one 2-D float64
+    array where row i holds the factors for the annual rate i * rate_step, column n
+    the factor for n months, and column 0 (unused as duration) the annual rate of
+    the row. The file written by `save` is therefore self-describing and `load`
+    only needs to memory map it.
+
+    Rates are looked up by index: a rate is grid-aligned when it is within 1e-6
+    steps of a grid point. Other rates, or durations beyond the table, fall back
+    to the exact formula. `compute_rate_grid` and `compute_all_quantities_batch`
+    accept a table through their `annuity_table` argument.
+
+    Examples
+    --------
+    >>> table = AnnuityTable(max_rate=0.05, max_months=360)
+    >>> float(table.installment(0.0345, 240, 200000.0))
+    1154.7874350779198
+    """
+
+    def __init__(
+        self,
+        rate_step: float = 0.0001,
+        max_rate: float = 0.20,
+        max_months: int = 480,
+        max_bytes: int = 64 * 2**20,
+    ):
+        self.rate_step = rate_step
+        self.rate_number = int(round(max_rate / rate_step)) + 1
+        self.max_months = max_months
+
+        table_bytes = self.rate_number * (max_months + 1) * np.dtype(np.float64).itemsize
+        if table_bytes > max_bytes:
+            raise ValueError(f"Annuity table would use {table_bytes} bytes, more than max_bytes={max_bytes}")
+
+        self._factors: np.ndarray | None = None
+
+    @classmethod
+    def load(cls, path: str) -> "AnnuityTable":
+        """
+        Memory map a table previously written by `save`.
+
+        Parameters
+        ----------
+        path : str
+            Path of the .npy file
+
+        Returns
+        -------
+        AnnuityTable
+            Table reading its factors from the mapped file, pages are only loaded when read
+        """
+        factors = np.load(path, mmap_mode="r")
+        rate_number, month_columns = factors.shape
+        rate_step = float(factors[1, 0] - factors[0, 0]) if rate_number > 1 else 1.0
+
+        table = cls.__new__(cls)
+        table.rate_step = rate_step
+        table.rate_number = rate_number
+        table.max_months = month_columns - 1
+        table._factors = factors
+        return table
+
+    def save(self, path: str) -> None:
+        """
+        Write the table to a .npy file, building it first if needed.
+
+        Parameters
+        ----------
+        path : str
+            Path of the .npy file
+        """
+        np.save(path, self.factors)
+
+    @property
+    def factors(self) -> np.ndarray:
+        """
+        The full table, built on first access.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape (rate_number, max_months + 1), see class notes for the layout
+        """
+        if self._factors is None:
+            annual_rates = np.arange(self.rate_number) * self.rate_step
+            month_numbers = np.arange(1, self.max_months + 1)
+
+            factors = np.empty((self.rate_number, self.max_months + 1))
+            factors[:, 0] = annual_rates
+            factors[:, 1:] = _annuity_factors(annual_rates[:, np.newaxis], month_numbers[np.newaxis, :])
+            self._factors = factors
+
+        return self._factors
+
+    def annuity_factor(self, annual_rate: np.ndarray, month_number: np.ndarray) -> np.ndarray:
+        """
+        Installment per unit of capital, read from the table when the inputs are on the grid.
+
+        Parameters
+        ----------
+        annual_rate : np.ndarray
+            Annual interest rates (scalars are accepted)
+        month_number : np.ndarray
+            Total numbers of monthly payments (scalars are accepted)
+
+        Returns
+        -------
+        np.ndarray
+            Annuity factors, same shape as the broadcast inputs
+        """
+        annual_rate, month_number = np.broadcast_arrays(np.asarray(annual_rate, dtype=np.float64), month_number)
+        month_number = month_number.astype(np.int64, copy=False)
+
+        rate_position = annual_rate / self.rate_step
+        rate_index = np.rint(rate_position).astype(np.int64)
+        on_grid = (
+            (np.abs(rate_position - rate_index) < 1e-6)
+            & (rate_index >= 0)
+            & (rate_index < self.rate_number)
+            & (month_number >= 1)
+            & (month_number <= self.max_months)
+        )
+
+        # Gather through flat indices, noticeably cheaper than 2-D fancy indexing
+        flat_factors = self.factors.ravel()
+        flat_index = rate_index * (self.max_months + 1) + month_number
+
+        if on_grid.all():
+            return flat_factors.take(flat_index)
+
+        factors = np.empty(annual_rate.shape)
+        factors[on_grid] = flat_factors.take(flat_index[on_grid])
+        factors[~on_grid] = _annuity_factors(annual_rate[~on_grid], month_number[~on_grid])
+        return factors
+
+    def installment(self, annual_rate: np.ndarray, month_number: np.ndarray, initial_capital: np.ndarray) -> np.ndarray:
+        """
+        Monthly installments, read from the table when the inputs are on the grid.
+
+        Parameters
+        ----------
+        annual_rate : np.ndarray
+            Annual interest rates (scalars are accepted)
+        month_number : np.ndarray
+            Total numbers of monthly payments (scalars are accepted)
+        initial_capital : np.ndarray
+            Principal amounts of the loans (scalars are accepted)
+
+        Returns
+        -------
+        np.ndarray
+            Monthly installments, same shape as the broadcast inputs
+        """
+        return self.annuity_factor(annual_rate, month_number) * initial_capital
@@ -0,0 +1,841 @@
+import time
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .common_objects import ContinuationStats, LoanInputs, LoanInputsBatch, LoanResult, SolveRecord, TaegPair
+from .core_functions import (
+    _calculate_average_installment,
+    _calculate_compound_factor,
+    _convert_monthly_to_annual_rate,
+    _convert_prop_rate,
+    _discounted_sum_and_derivative,
+)
+from .instrumentation import _notify_solve, _solve_observers
+from .profiling import profiled
+
+if TYPE_CHECKING:
+    from .annuity_table import AnnuityTable
+
+# Loans between two anchors of a continuation solve, anchors are solved cold and seed the others
+_ANCHOR_STRIDE = 16
+
+# Newton iterations allowed from an interpolated seed before falling back to the cold start
+_SEEDED_MAXITER = 8
+
+
+def _as_input_columns(loan_inputs: LoanInputs | LoanInputsBatch | np.ndarray | Sequence[LoanInputs]) -> LoanInputs:
+    """
+    Normalize batch inputs to a LoanInputs of broadcast NumPy columns.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs | LoanInputsBatch | np.ndarray | Sequence[LoanInputs]
+        Either a LoanInputs whose fields are scalars or array-likes (columnar form),
+        a LoanInputsBatch, a structured array with fields named after LoanInputs
+        attributes, or a sequence of scalar LoanInputs (row form)
+
+    Returns
+    -------
+    LoanInputs
+        A named tuple of 1-D arrays of identical length. ``month_number`` is an
+        integer array, every other field is a float64 array.
+
+    Raises
+    ------
+    ValueError
+        If a structured array misses one of the mandatory fields
+    """
+    if isinstance(loan_inputs, LoanInputsBatch):
+        loan_inputs = loan_inputs.records
+
+    if isinstance(loan_inputs, np.ndarray) and loan_inputs.dtype.names is not None:
+        field_names = loan_inputs.dtype.names
+        columns = []
+        for name in LoanInputs._fields:
+            if name in field_names:
+                columns.append(loan_inputs[name])
+            elif name in LoanInputs._field_defaults:
+                columns.append(LoanInputs._field_defaults[name])
+            else:
+                raise ValueError(f"Structured array is missing mandatory field '{name}'")
+    elif isinstance(loan_inputs, LoanInputs):
+        columns = list(loan_inputs)
+    elif len(loan_inputs) == 0:
+        columns = [np.empty(0) for _ in LoanInputs._fields]
+    else:
+        columns = [np.fromiter(column, dtype=np.float64, count=len(loan_inputs)) for column in zip(*loan_inputs)]
+
+    initial_capital, annual_rate, month_number, initial_cost, insurance_cost = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(column)) for column in columns)
+    )
+
+    return LoanInputs(
+        initial_capital=np.ascontiguousarray(initial_capital, dtype=np.float64),
+        annual_rate=np.ascontiguousarray(annual_rate, dtype=np.float64),
+        month_number=np.ascontiguousarray(month_number, dtype=np.int64),
+        initial_cost=np.ascontiguousarray(initial_cost, dtype=np.float64),
+        insurance_cost=np.ascontiguousarray(insurance_cost, dtype=np.float64),
+    )
+
+
+def _installment_per_period_batch(
+    period_rate: np.ndarray, period_number: np.ndarray, initial_capital: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized version of the standard amortization formula.
+
+    Parameters
+    ----------
+    period_rate : np.ndarray
+        Interest rates per period (as decimals)
+    period_number : np.ndarray
+        Total numbers of payment periods
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+
+    Returns
+    -------
+    np.ndarray
+        Payment amounts per period
+
+    Notes
+    -----
+    Same formula as the scalar version, PMT = P * r * (1 + r)^n / ((1 + r)^n - 1),
+    with zero rates falling back to P / n element-wise.
+    """
+    compound_factor = _calculate_compound_factor(period_rate, period_number)
+
+    # Zero rates give 0 / 0 here, they are replaced just below
+    with np.errstate(divide="ignore", invalid="ignore"):
+        installment = initial_capital * period_rate * compound_factor / (compound_factor - 1)
+
+    return np.where(period_rate == 0, initial_capital / period_number, installment)
+
+
+def compute_interest_cost_batch(
+    annual_rate: np.ndarray, month_number: np.ndarray, initial_capital: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute monthly installments and total interest costs for many loans at once.
+
+    Parameters
+    ----------
+    annual_rate : np.ndarray
+        Annual interest rates (as decimals, e.g., 0.05 for 5%)
+    month_number : np.ndarray
+        Total numbers of monthly payments
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+
+    Returns
+    -------
+    monthly_installment : np.ndarray
+        The fixed monthly payment amounts
+    total_cost : np.ndarray
+        The total interest paid over the life of each loan
+    """
+    monthly_rate = _convert_prop_rate(annual_rate, 12)
+    monthly_installment = _installment_per_period_batch(monthly_rate, month_number, initial_capital)
+    total_cost = monthly_installment * month_number - initial_capital
+    return monthly_installment, total_cost
+
+
+def _solve_taeg_newton(
+    month_number: np.ndarray,
+    full_installments: np.ndarray,
+    initial_cost: np.ndarray,
+    initial_capital: np.ndarray,
+    x0: float | np.ndarray = 0.99,
+    xtol: float = 1e-7,
+    maxiter: int = 50,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Solve the TAEG objective for many loans with a vectorized Newton method.
+
+    Parameters
+    ----------
+    month_number : np.ndarray
+        Total numbers of monthly payments
+    full_installments : np.ndarray
+        The average monthly payments including all costs
+    initial_cost : np.ndarray
+        Upfront fees paid at loan origination
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+    x0 : float | np.ndarray, optional
+        Starting discount rate(s), by default 0.99 like `compute_taeg`
+    xtol : float, optional
+        Absolute step tolerance, by default 1e-7 like `compute_taeg`
+    maxiter : int, optional
+        Maximum number of Newton iterations, by default 50
+
+    Returns
+    -------
+    roots : np.ndarray
+        Monthly discount rates solving the objective
+    converged : np.ndarray
+        Boolean mask, True where the step went below `xtol`
+    iterations : np.ndarray
+        Number of Newton iterations performed for each loan
+
+    Notes
+    -----
+    The objective is the one of `_create_taeg_objective_function`, evaluated with
+    the geometric series closed form so one iteration is O(1) per loan. Only
+    loans that have not converged yet are updated at each iteration.
+    """
+    # Timing only happens when someone listens, like the scalar solve
+    start_time = time.perf_counter() if _solve_observers else 0.0
+    roots = np.array(np.broadcast_to(x0, month_number.shape), dtype=np.float64)
+    iterations = np.zeros(month_number.shape, dtype=np.int64)
+    active = np.arange(month_number.size)
+
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+
+        installments = full_installments[active]
+        sum_powers, sum_derivative = _discounted_sum_and_derivative(roots[active], month_number[active])
+
+        # Newton step on initial_cost - initial_capital + installments * sum(rate^k)
+        value = initial_cost[active] - initial_capital[active] + installments * sum_powers
+        step = value / (installments * sum_derivative)
+
+        roots[active] -= step
+        iterations[active] += 1
+        active = active[~(np.abs(step) < xtol)]
+
+    converged = np.ones(month_number.shape, dtype=bool)
+    converged[active] = False
+
+    if _solve_observers:
+        wall_time = time.perf_counter() - start_time
+        sum_powers, _ = _discounted_sum_and_derivative(roots, month_number)
+        _notify_solve(
+            SolveRecord(
+                month_number=month_number,
+                full_installments=full_installments,
+                initial_cost=initial_cost,
+                initial_capital=initial_capital,
+                root=roots,
+                iterations=iterations,
+                function_calls=iterations,
+                converged=converged,
+                residual=initial_cost - initial_capital + full_installments * sum_powers,
+                wall_time=wall_time,
+            )
+        )
+
+    return roots, converged, iterations
+
+
+def _solve_taeg_bracketed(
+    month_number: np.ndarray,
+    full_installments: np.ndarray,
+    initial_cost: np.ndarray,
+    initial_capital: np.ndarray,
+    xtol: float = 1e-7,
+    maxiter: int = 100,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Solve the TAEG objective for many loans with a Newton method safeguarded by a bracket.
+
+    Parameters
+    ----------
+    month_number : np.ndarray
+        Total numbers of monthly payments
+    full_installments : np.ndarray
+        The average monthly payments including all costs
+    initial_cost : np.ndarray
+        Upfront fees paid at loan origination
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+    xtol : float, optional
+        Absolute step tolerance, by default 1e-7 like `compute_taeg`
+    maxiter : int, optional
+        Maximum number of iterations, by default 100
+
+    Returns
+    -------
+    roots : np.ndarray
+        Monthly discount rates solving the objective
+    converged : np.ndarray
+        Boolean mask, True where the step went below `xtol`, False for loans
+        without a positive root (initial cost not below the capital)
+    iterations : np.ndarray
+        Number of iterations performed for each loan
+
+    Notes
+    -----
+    With a positive installment the objective increases with the discount factor
+    v, is negative at v = 0 and non-negative at v = max(1, ratio / month_number),
+    ratio being (capital - initial cost) / installment: at v = 1 the sum of the
+    powers is month_number, above 1 it is at least month_number * v. The root
+    is kept in that bracket, Newton steps leaving it are replaced by a
+    bisection, so the solve converges from any loan whose root exists. It is
+    slower than `_solve_taeg_newton` and only used as a fallback.
+    """
+    net_capital = initial_capital - initial_cost
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = net_capital / full_installments
+    lower = np.zeros(month_number.shape)
+    upper = np.maximum(1.0, np.nan_to_num(ratio / month_number))
+    roots = np.minimum(0.99, upper)
+    iterations = np.zeros(month_number.shape, dtype=np.int64)
+    solvable = (net_capital > 0) & (full_installments > 0)
+    active = np.flatnonzero(solvable)
+
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+
+        rate = roots[active]
+        installments = full_installments[active]
+        with np.errstate(over="ignore", invalid="ignore"):
+            sum_powers, sum_derivative = _discounted_sum_and_derivative(rate, month_number[active])
+            value = installments * sum_powers - net_capital[active]
+
+        # Shrink the bracket around the sign change, an exact root leaves it as it is
+        exact = value == 0
+        lower[active] = np.where(value < 0, rate, lower[active])
+        upper[active] = np.where(value > 0, rate, upper[active])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            candidate = rate - value / (installments * sum_derivative)
+        outside = ~((candidate > lower[active]) & (candidate < upper[active]))
+        candidate = np.where(outside, (lower[active] + upper[active]) / 2, candidate)
+        candidate = np.where(exact, rate, candidate)
+
+        step = candidate - rate
+        roots[active] = candidate
+        iterations[active] += 1
+        active = active[~((np.abs(step) < xtol) | exact)]
+
+    converged = solvable.copy()
+    converged[active] = False
+    return roots, converged, iterations
+
+
+def _solve_failures_bracketed(
+    loans: np.ndarray,
+    roots: np.ndarray,
+    converged: np.ndarray,
+    iterations: np.ndarray,
+    month_number: np.ndarray,
+    full_installments: np.ndarray,
+    initial_cost: np.ndarray,
+    initial_capital: np.ndarray,
+) -> int:
+    """
+    Solve again with the bracketed method the loans Newton missed, updating the results in place.
+
+    Parameters
+    ----------
+    loans : np.ndarray
+        Indices of the loans just solved
+    roots : np.ndarray
+        Roots of all loans, updated in place
+    converged : np.ndarray
+        Convergence mask of all loans, updated in place
+    iterations : np.ndarray
+        Iteration counts of all loans, the fallback iterations are added in place
+    month_number : np.ndarray
+        Total numbers of monthly payments
+    full_installments : np.ndarray
+        The average monthly payments including all costs
+    initial_cost : np.ndarray
+        Upfront fees paid at loan origination
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+
+    Returns
+    -------
+    int
+        Number of loans solved again
+    """
+    failed = loans[~(converged[loans] & (roots[loans] > 0))]
+    if failed.size:
+        roots[failed], converged[failed], fallback_iterations = _solve_taeg_bracketed(
+            month_number[failed], full_installments[failed], initial_cost[failed], initial_capital[failed]
+        )
+        iterations[failed] += fallback_iterations
+    return failed.size
+
+
+def _solve_taeg_continuation(
+    month_number: np.ndarray,
+    full_installments: np.ndarray,
+    initial_cost: np.ndarray,
+    initial_capital: np.ndarray,
+    anchor_stride: int = _ANCHOR_STRIDE,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, ContinuationStats]:
+    """
+    Solve the TAEG objective for many loans, seeding each solve from its neighbours' roots.
+
+    Parameters
+    ----------
+    month_number : np.ndarray
+        Total numbers of monthly payments
+    full_installments : np.ndarray
+        The average monthly payments including all costs
+    initial_cost : np.ndarray
+        Upfront fees paid at loan origination
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+    anchor_stride : int, optional
+        Number of sorted loans per anchor, by default 16
+
+    Returns
+    -------
+    roots : np.ndarray
+        Monthly discount rates solving the objective
+    converged : np.ndarray
+        Boolean mask, True where the step went below the tolerance
+    iterations : np.ndarray
+        Number of Newton iterations performed for each loan, fallbacks included
+    stats : ContinuationStats
+        Iteration counts of the solve and estimated savings against the cold start
+
+    Notes
+    -----
+    Dividing the objective by the installment shows the root only depends on
+    the duration and on the cost ratio (capital - initial cost) / installment,
+    which is the annuity factor at the root. Loans are sorted by duration then
+    ratio; every `anchor_stride`-th loan, and the first and last loan of each
+    duration, is an anchor solved from the usual cold start x0=0.99. Every
+    other loan starts from the linear interpolation, on the ratio, of the roots
+    of the anchors around it, which are of the same duration.
+
+    Seeded Newton runs are capped to a few iterations. Loans that do not
+    converge, or end on a non-positive discount factor, anchors included, are
+    solved again with the bracketed `_solve_taeg_bracketed`, so the result is
+    never worse than the plain batch solve.
+    """
+    loan_number = month_number.size
+    if loan_number == 0:
+        roots, converged, iterations = _solve_taeg_newton(
+            month_number, full_installments, initial_cost, initial_capital
+        )
+        return roots, converged, iterations, ContinuationStats(0, 0, 0, 0, 0.0, 0.0)
+
+    # The ratio is the annuity factor at the root, at most the duration for a non-negative TAEG, so
+    # duration + ratio / (duration + 1) sorts by duration then ratio with a single float key
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = (initial_capital - initial_cost) / full_installments
+        fraction = np.clip(np.nan_to_num(ratio / (month_number + 1)), 0.0, 1 - 1e-9)
+    order = np.argsort(month_number + fraction)
+    sorted_ratio = ratio[order]
+
+    # Anchors on a regular stride and on both sides of every duration change
+    is_anchor = np.zeros(loan_number, dtype=bool)
+    is_anchor[::anchor_stride] = True
+    is_anchor[-1] = True
+    duration_change = np.flatnonzero(np.diff(month_number[order]))
+    is_anchor[duration_change] = True
+    is_anchor[duration_change + 1] = True
+    anchor_positions = np.flatnonzero(is_anchor)
+    seeded_positions = np.flatnonzero(~is_anchor)
+
+    roots = np.empty(loan_number)
+    converged = np.empty(loan_number, dtype=bool)
+    iterations = np.empty(loan_number, dtype=np.int64)
+
+    anchors = order[anchor_positions]
+    roots[anchors], converged[anchors], iterations[anchors] = _solve_taeg_newton(
+        month_number[anchors], full_installments[anchors], initial_cost[anchors], initial_capital[anchors]
+    )
+    fallback_number = _solve_failures_bracketed(
+        anchors, roots, converged, iterations, month_number, full_installments, initial_cost, initial_capital
+    )
+
+    if seeded_positions.size:
+        # Anchors just before and after each seeded loan, both of its duration
+        next_anchor = np.searchsorted(anchor_positions, seeded_positions)
+        lower, upper = anchor_positions[next_anchor - 1], anchor_positions[next_anchor]
+        lower_root, upper_root = roots[order[lower]], roots[order[upper]]
+        ratio_span = sorted_ratio[upper] - sorted_ratio[lower]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weight = np.where(ratio_span > 0, (sorted_ratio[seeded_positions] - sorted_ratio[lower]) / ratio_span, 0.0)
+        seeds = lower_root + np.nan_to_num(weight) * (upper_root - lower_root)
+
+        seeded = order[seeded_positions]
+        roots[seeded], converged[seeded], iterations[seeded] = _solve_taeg_newton(
+            month_number[seeded],
+            full_installments[seeded],
+            initial_cost[seeded],
+            initial_capital[seeded],
+            x0=seeds,
+            maxiter=_SEEDED_MAXITER,
+        )
+
+        # Safe path for seeds that led Newton astray
+        fallback_number += _solve_failures_bracketed(
+            seeded, roots, converged, iterations, month_number, full_installments, initial_cost, initial_capital
+        )
+
+    cold_iterations = float(iterations[anchors].mean()) * loan_number
+    total_iterations = int(iterations.sum())
+    stats = ContinuationStats(
+        solves=loan_number,
+        anchor_solves=anchors.size,
+        fallback_solves=fallback_number,
+        iterations=total_iterations,
+        cold_iterations=cold_iterations,
+        saved_iterations=cold_iterations - total_iterations,
+    )
+    return roots, converged, iterations, stats
+
+
+def compute_taeg_batch(
+    month_number: np.ndarray, total_cost: np.ndarray, initial_cost: np.ndarray, initial_capital: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the TAEG for many loans at once.
+
+    Parameters
+    ----------
+    month_number : np.ndarray
+        Total numbers of monthly payments
+    total_cost : np.ndarray
+        Total costs of the loans including all expenses
+    initial_cost : np.ndarray
+        Upfront fees paid at loan origination
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+
+    Returns
+    -------
+    taeg : np.ndarray
+        The effective annual percentage rates (TAEG)
+    full_installments : np.ndarray
+        The average monthly payments including all costs
+
+    Raises
+    ------
+    RuntimeError
+        If the optimization algorithm fails to converge for any loan
+
+    Notes
+    -----
+    Same objective, starting point (x0=0.99) and tolerance (xtol=1e-7) as
+    `compute_taeg`, but all loans are solved together by `_solve_taeg_newton`.
+    """
+    full_installments = _calculate_average_installment(total_cost + initial_capital, initial_cost, month_number)
+
+    roots, converged, _ = _solve_taeg_newton(month_number, full_installments, initial_cost, initial_capital)
+    if not converged.all():
+        raise RuntimeError(f"TAEG computation failed to converge for {np.count_nonzero(~converged)} loan(s)")
+
+    taeg = _convert_monthly_to_annual_rate(roots)
+
+    return taeg, full_installments
+
+
+def compute_taeg_continuation_batch(
+    month_number: np.ndarray,
+    total_cost: np.ndarray,
+    initial_cost: np.ndarray,
+    initial_capital: np.ndarray,
+    anchor_stride: int = _ANCHOR_STRIDE,
+) -> tuple[np.ndarray, np.ndarray, ContinuationStats]:
+    """
+    Calculate the TAEG for many loans, seeding each solve from similar loans.
+
+    Parameters
+    ----------
+    month_number : np.ndarray
+        Total numbers of monthly payments
+    total_cost : np.ndarray
+        Total costs of the loans including all expenses
+    initial_cost : np.ndarray
+        Upfront fees paid at loan origination
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+    anchor_stride : int, optional
+        Number of similar loans per cold-started anchor, by default 16
+
+    Returns
+    -------
+    taeg : np.ndarray
+        The effective annual percentage rates (TAEG)
+    full_installments : np.ndarray
+        The average monthly payments including all costs
+    stats : ContinuationStats
+        Iterations performed, fallbacks, and iterations saved against the
+        cold start of `compute_taeg_batch`
+
+    Raises
+    ------
+    RuntimeError
+        If the optimization algorithm fails to converge for any loan
+
+    Notes
+    -----
+    Same results as `compute_taeg_batch` up to the solver tolerance, the
+    inputs do not need to be sorted. See `_solve_taeg_continuation`.
+
+    Examples
+    --------
+    >>> capital = np.linspace(100000.0, 300000.0, 1000)
+    >>> taeg, _, stats = compute_taeg_continuation_batch(
+    ...     np.full(1000, 240), capital * 0.25, np.full(1000, 1000.0), capital
+    ... )
+    >>> stats.anchor_solves, stats.fallback_solves, stats.iterations < stats.cold_iterations / 3
+    (64, 0, True)
+    """
+    full_installments = _calculate_average_installment(total_cost + initial_capital, initial_cost, month_number)
+
+    roots, converged, _, stats = _solve_taeg_continuation(
+        month_number, full_installments, initial_cost, initial_capital, anchor_stride
+    )
+    if not converged.all():
+        raise RuntimeError(f"TAEG computation failed to converge for {np.count_nonzero(~converged)} loan(s)")
+
+    return _convert_monthly_to_annual_rate(roots), full_installments, stats
+
+
+def _solve_taeg_pair_batch(
+    month_number: np.ndarray,
+    total_cost: np.ndarray,
+    total_cost_no_insurance: np.ndarray,
+    initial_cost: np.ndarray,
+    initial_capital: np.ndarray,
+    continuation: bool = False,
+) -> tuple[TaegPair, np.ndarray]:
+    """
+    Run the shared TAEG solves of `compute_taeg_pair_batch`, keeping loans that do not converge.
+
+    Parameters
+    ----------
+    month_number : np.ndarray
+        Total numbers of monthly payments
+    total_cost : np.ndarray
+        Total costs of the loans including all expenses
+    total_cost_no_insurance : np.ndarray
+        Total costs of the loans excluding insurance
+    initial_cost : np.ndarray
+        Upfront fees paid at loan origination
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+    continuation : bool, optional
+        Seed the full TAEG solves from neighbouring loans, by default False
+
+    Returns
+    -------
+    pair : TaegPair
+        A named tuple where each field is an array with one entry per loan, the
+        rates of loans that did not converge are the last iterates
+    converged : np.ndarray
+        Boolean mask of loans for which both solves converged
+    """
+    full_installments = _calculate_average_installment(total_cost + initial_capital, initial_cost, month_number)
+    installments_no_insurance = _calculate_average_installment(
+        total_cost_no_insurance + initial_capital, initial_cost, month_number
+    )
+
+    if continuation:
+        full_roots, full_converged, full_iterations, _ = _solve_taeg_continuation(
+            month_number, full_installments, initial_cost, initial_capital
+        )
+    else:
+        full_roots, full_converged, full_iterations = _solve_taeg_newton(
+            month_number, full_installments, initial_cost, initial_capital
+        )
+
+    # Loans without insurance reuse the full root, the others are warm started from it
+    no_insurance_roots = full_roots.copy()
+    no_insurance_converged = full_converged.copy()
+    no_insurance_iterations = np.zeros_like(full_iterations)
+    insured = installments_no_insurance != full_installments
+    insured_roots, insured_converged, insured_iterations = _solve_taeg_newton(
+        month_number[insured],
+        installments_no_insurance[insured],
+        initial_cost[insured],
+        initial_capital[insured],
+        x0=full_roots[insured],
+    )
+    # A warm start on the far side of the root can diverge, retry those loans from the cold start
+    diverged = ~insured_converged
+    if diverged.any():
+        retried = np.flatnonzero(insured)[diverged]
+        retry_roots, insured_converged[diverged], retry_iterations = _solve_taeg_newton(
+            month_number[retried], installments_no_insurance[retried], initial_cost[retried], initial_capital[retried]
+        )
+        insured_roots[diverged] = retry_roots
+        insured_iterations[diverged] += retry_iterations
+    no_insurance_roots[insured] = insured_roots
+    no_insurance_converged[insured] = insured_converged
+    no_insurance_iterations[insured] = insured_iterations
+
+    pair = TaegPair(
+        full_taeg=_convert_monthly_to_annual_rate(full_roots),
+        taeg_no_insurance=_convert_monthly_to_annual_rate(no_insurance_roots),
+        full_installments=full_installments,
+        full_iterations=full_iterations,
+        no_insurance_iterations=no_insurance_iterations,
+    )
+    return pair, full_converged & no_insurance_converged
+
+
+def compute_taeg_pair_batch(
+    month_number: np.ndarray,
+    total_cost: np.ndarray,
+    total_cost_no_insurance: np.ndarray,
+    initial_cost: np.ndarray,
+    initial_capital: np.ndarray,
+    continuation: bool = False,
+) -> TaegPair:
+    """
+    Calculate the TAEG with and without insurance for many loans in a shared solve.
+
+    Parameters
+    ----------
+    month_number : np.ndarray
+        Total numbers of monthly payments
+    total_cost : np.ndarray
+        Total costs of the loans including all expenses
+    total_cost_no_insurance : np.ndarray
+        Total costs of the loans excluding insurance
+    initial_cost : np.ndarray
+        Upfront fees paid at loan origination
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+    continuation : bool, optional
+        Seed the full TAEG solves from neighbouring loans, see
+        `_solve_taeg_continuation`, by default False
+
+    Returns
+    -------
+    TaegPair
+        A named tuple where each field is an array with one entry per loan
+
+    Raises
+    ------
+    RuntimeError
+        If the optimization algorithm fails to converge for any loan
+
+    Notes
+    -----
+    Batch counterpart of `compute_taeg_pair`: the solve without insurance starts
+    from the roots of the full TAEG solve, and the loans for which that warm start
+    does not converge are solved again from the cold start.
+    """
+    pair, converged = _solve_taeg_pair_batch(
+        month_number, total_cost, total_cost_no_insurance, initial_cost, initial_capital, continuation
+    )
+    if not converged.all():
+        raise RuntimeError(f"TAEG computation failed to converge for {np.count_nonzero(~converged)} loan(s)")
+    return pair
+
+
+@profiled("compute_all_quantities_batch")
+def _price_input_columns(
+    columns: LoanInputs, continuation: bool = False, annuity_table: "AnnuityTable | None" = None
+) -> tuple[LoanResult, np.ndarray]:
+    """
+    Compute all quantities for loan columns, keeping loans whose TAEG does not converge.
+
+    Parameters
+    ----------
+    columns : LoanInputs
+        Loan columns as returned by `_as_input_columns`
+    continuation : bool, optional
+        Seed the TAEG solves from neighbouring loans, by default False
+    annuity_table : AnnuityTable | None, optional
+        Table the installments are read from, by default None (computed)
+
+    Returns
+    -------
+    results : LoanResult
+        A named tuple of 1-D float64 arrays with one entry per loan, the rates of
+        loans that did not converge are meaningless
+    converged : np.ndarray
+        Boolean mask of loans whose TAEG solves converged
+    """
+    # Installments, interest and costs in one broadcast pass
+    if annuity_table is None:
+        monthly_installment_no_insurance, total_interests = compute_interest_cost_batch(
+            columns.annual_rate, columns.month_number, columns.initial_capital
+        )
+    else:
+        monthly_installment_no_insurance = annuity_table.installment(
+            columns.annual_rate, columns.month_number, columns.initial_capital
+        )
+        total_interests = monthly_installment_no_insurance * columns.month_number - columns.initial_capital
+    total_cost_no_insurance = total_interests + columns.initial_cost
+    total_cost = total_cost_no_insurance + columns.insurance_cost
+
+    # Calculate TAEG with and without insurance in one shared solve
+    taeg_pair, converged = _solve_taeg_pair_batch(
+        columns.month_number,
+        total_cost,
+        total_cost_no_insurance,
+        columns.initial_cost,
+        columns.initial_capital,
+        continuation=continuation,
+    )
+
+    results = LoanResult(
+        monthly_installment_no_insurance,
+        taeg_pair.full_installments,
+        total_interests,
+        total_cost_no_insurance,
+        total_cost,
+        taeg_pair.full_taeg,
+        taeg_pair.full_taeg - taeg_pair.taeg_no_insurance,
+    )
+    return results, converged
+
+
+def compute_all_quantities_batch(
+    loan_inputs: LoanInputs | LoanInputsBatch | np.ndarray | Sequence[LoanInputs],
+    continuation: bool = False,
+    annuity_table: "AnnuityTable | None" = None,
+) -> LoanResult:
+    """
+    Compute all quantities for a batch of loans.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs | LoanInputsBatch | np.ndarray | Sequence[LoanInputs]
+        Either a LoanInputs whose fields are array-likes (scalars are broadcast),
+        a LoanInputsBatch, a structured array with fields named after LoanInputs
+        attributes, or a sequence of scalar LoanInputs.
+        Missing optional fields (initial_cost, insurance_cost) default to 0.
+    continuation : bool, optional
+        Seed the TAEG solves from neighbouring loans instead of the cold start,
+        worth it for rate sheets and portfolios of similar loans, by default False
+    annuity_table : AnnuityTable | None, optional
+        Precomputed annuity factors the installments are read from, for inputs
+        on its grid, by default None (installments computed with the formula)
+
+    Returns
+    -------
+    LoanResult
+        A named tuple with the same fields as the scalar result, where each
+        field is a 1-D float64 array with one entry per loan
+
+    Raises
+    ------
+    RuntimeError
+        If the TAEG computation fails to converge for any loan
+
+    Examples
+    --------
+    >>> batch = LoanInputs(
+    ...     initial_capital=np.array([200000.0, 150000.0]),
+    ...     annual_rate=np.array([0.02, 0.035]),
+    ...     month_number=np.array([240, 300]),
+    ...     initial_cost=1000.0,
+    ...     insurance_cost=8000.0,
+    ... )
+    >>> results = compute_all_quantities_batch(batch)
+    >>> results.monthly_installment_no_insurance.round(2)
+    array([1011.77,  750.94])
+    """
+    results, converged = _price_input_columns(_as_input_columns(loan_inputs), continuation, annuity_table)
+    if not converged.all():
+        raise RuntimeError(f"TAEG computation failed to converge for {np.count_nonzero(~converged)} loan(s)")
+    return results
@@ -0,0 +1,199 @@
+import csv
+import math
+import time
+from collections.abc import Iterable
+from typing import TextIO
+
+import numpy as np
+
+from .batch_functions import _as_input_columns, _price_input_columns
+from .common_objects import BulkPricingStats, LoanInputs, LoanResult
+from .profiling import profiled
+
+MANDATORY_COLUMNS = ("initial_capital", "annual_rate", "month_number")
+
+# Longest supported loan, 100 years of monthly payments
+MAX_MONTH_NUMBER = 1200
+
+
+def _check_loan_inputs(loan_inputs: LoanInputs) -> None:
+    """
+    Check that loan inputs are in the range the pricing functions support.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs
+        Parsed loan inputs
+
+    Raises
+    ------
+    ValueError
+        If a value is not finite or out of range
+    """
+    if not all(math.isfinite(value) for value in loan_inputs):
+        raise ValueError("values must be finite numbers")
+    if not loan_inputs.initial_capital > 0:
+        raise ValueError("initial_capital must be positive")
+    if not 1 <= loan_inputs.month_number <= MAX_MONTH_NUMBER:
+        raise ValueError(f"month_number must be between 1 and {MAX_MONTH_NUMBER}")
+    if not (loan_inputs.annual_rate >= 0 and loan_inputs.initial_cost >= 0 and loan_inputs.insurance_cost >= 0):
+        raise ValueError("annual_rate, initial_cost and insurance_cost must be non negative")
+    if loan_inputs.initial_cost >= loan_inputs.initial_capital:
+        raise ValueError("initial_cost must be lower than initial_capital")
+
+
+@profiled("parse_inputs")
+def _parse_row(row: list[str], column_index: dict[str, int]) -> LoanInputs:
+    """
+    Parse and validate one CSV row.
+
+    Parameters
+    ----------
+    row : list[str]
+        Raw row values as read by csv.reader
+    column_index : dict[str, int]
+        Position of each LoanInputs field present in the header
+
+    Returns
+    -------
+    LoanInputs
+        The validated loan inputs
+
+    Raises
+    ------
+    ValueError
+        If a value is missing, not a number or out of range
+    """
+    values = {}
+    for name in LoanInputs._fields:
+        index = column_index.get(name)
+        raw_value = row[index].strip() if index is not None and index < len(row) else ""
+        if raw_value == "":
+            if name in MANDATORY_COLUMNS:
+                raise ValueError(f"missing value for '{name}'")
+            values[name] = LoanInputs._field_defaults[name]
+        elif name == "month_number":
+            values[name] = int(raw_value)
+        else:
+            values[name] = float(raw_value.replace(",", "."))
+
+    loan_inputs = LoanInputs(**values)
+    _check_loan_inputs(loan_inputs)
+    return loan_inputs
+
+
+@profiled("price_and_write_chunk")
+def _write_priced_chunk(
+    writer: csv.writer, reject_writer: csv.writer, chunk: list[LoanInputs], raw_rows: list[tuple[int, list[str]]]
+) -> int:
+    """
+    Price a chunk of loans and write inputs and results side by side.
+
+    Parameters
+    ----------
+    writer : csv.writer
+        Writer of the output stream
+    reject_writer : csv.writer
+        Writer of the reject stream, for loans whose TAEG does not converge
+    chunk : list[LoanInputs]
+        Validated loans to price
+    raw_rows : list[tuple[int, list[str]]]
+        Line number and raw values of each loan of the chunk
+
+    Returns
+    -------
+    int
+        Number of loans rejected because their TAEG did not converge
+    """
+    results, converged = _price_input_columns(_as_input_columns(chunk))
+    input_columns = zip(*chunk, strict=True)
+    priced_rows = zip(*input_columns, *(np.asarray(column).tolist() for column in results), strict=True)
+    if converged.all():
+        writer.writerows(priced_rows)
+        return 0
+
+    for priced_row, is_converged, (line_number, row) in zip(priced_rows, converged, raw_rows, strict=True):
+        if is_converged:
+            writer.writerow(priced_row)
+        else:
+            reject_writer.writerow([line_number, "TAEG computation failed to converge", *row])
+    return np.count_nonzero(~converged).item()
+
+
+def price_csv(
+    input_stream: Iterable[str],
+    output_stream: TextIO,
+    reject_stream: TextIO,
+    chunk_size: int = 10_000,
+) -> BulkPricingStats:
+    """
+    Price every loan of a CSV stream, chunk by chunk.
+
+    Parameters
+    ----------
+    input_stream : Iterable[str]
+        CSV lines with a header row naming LoanInputs fields. initial_cost and
+        insurance_cost columns are optional and default to 0.
+    output_stream : TextIO
+        Where the priced rows are written, as CSV with LoanInputs then LoanResult columns
+    reject_stream : TextIO
+        Where malformed rows and rows whose TAEG does not converge are written,
+        as CSV with the line number, the error and the raw row
+    chunk_size : int, optional
+        Number of loans priced per vectorized call, by default 10 000
+
+    Returns
+    -------
+    BulkPricingStats
+        Number of priced and rejected rows, and elapsed time
+
+    Raises
+    ------
+    ValueError
+        If the header misses a mandatory column
+
+    Notes
+    -----
+    At most `chunk_size` parsed rows are held at once, so memory use does not
+    depend on the size of the input.
+    """
+    start_time = time.perf_counter()
+
+    reader = csv.reader(input_stream)
+    header = [name.strip() for name in next(reader, [])]
+    missing_columns = [name for name in MANDATORY_COLUMNS if name not in header]
+    if missing_columns:
+        raise ValueError(f"Input header is missing column(s): {', '.join(missing_columns)}")
+    column_index = {name: header.index(name) for name in LoanInputs._fields if name in header}
+
+    writer = csv.writer(output_stream, lineterminator="\n")
+    writer.writerow(LoanInputs._fields + LoanResult._fields)
+    reject_writer = csv.writer(reject_stream, lineterminator="\n")
+    reject_writer.writerow(["line_number", "error", *header])
+
+    priced_rows = 0
+    rejected_rows = 0
+    chunk = []
+    raw_rows = []
+    for row in reader:
+        try:
+            chunk.append(_parse_row(row, column_index))
+        except ValueError as error:
+            rejected_rows += 1
+            reject_writer.writerow([reader.line_num, str(error), *row])
+            continue
+        raw_rows.append((reader.line_num, row))
+
+        if len(chunk) == chunk_size:
+            failures = _write_priced_chunk(writer, reject_writer, chunk, raw_rows)
+            priced_rows += len(chunk) - failures
+            rejected_rows += failures
+            chunk = []
+            raw_rows = []
+
+    if chunk:
+        failures = _write_priced_chunk(writer, reject_writer, chunk, raw_rows)
+        priced_rows += len(chunk) - failures
+        rejected_rows += failures
+
+    return BulkPricingStats(priced_rows, rejected_rows, time.perf_counter() - start_time)
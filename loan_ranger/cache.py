@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+from .common_objects import CacheStats, LoanInputs, LoanResult
+from .core_functions import compute_all_quantities
+
+
+def normalize_loan_inputs(loan_inputs: LoanInputs) -> LoanInputs:
+    """
+    Round loan inputs to the precision used as cache key.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs
+        A named tuple containing all input parameters for the loan
+
+    Returns
+    -------
+    LoanInputs
+        Same inputs with amounts rounded to the cent and the annual rate rounded
+        to the basis point (0.01%)
+
+    Examples
+    --------
+    >>> normalize_loan_inputs(LoanInputs(200000.004, 0.0345000001, 240, 999.999))
+    LoanInputs(initial_capital=200000.0, annual_rate=0.0345, month_number=240, initial_cost=1000.0, insurance_cost=0.0)
+    """
+    return LoanInputs(
+        initial_capital=round(loan_inputs.initial_capital, 2),
+        annual_rate=round(loan_inputs.annual_rate * 10_000) / 10_000,
+        month_number=int(loan_inputs.month_number),
+        initial_cost=round(loan_inputs.initial_cost, 2),
+        insurance_cost=round(loan_inputs.insurance_cost, 2),
+    )
+
+
+class QuoteCache:
+    """
+    Memoizing wrapper around `compute_all_quantities` with LRU eviction.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of results kept, by default 4096
+    compute : Callable[[LoanInputs], LoanResult], optional
+        Function computing the results on a cache miss, by default `compute_all_quantities`
+
+    Notes
+    -----
+    Inputs are normalized with `normalize_loan_inputs` before lookup, and results
+    are computed from the normalized inputs, so a cached result never depends on
+    which of the equivalent inputs was seen first.
+    The cache can be shared between threads.
+
+    Examples
+    --------
+    >>> cache = QuoteCache(maxsize=2)
+    >>> result = cache(LoanInputs(200000, 0.02, 240, 1000, 8000))
+    >>> result = cache(LoanInputs(200000.001, 0.02, 240, 1000, 8000))
+    >>> cache.stats
+    CacheStats(hits=1, misses=1, evictions=0, size=1, maxsize=2)
+    """
+
+    def __init__(self, maxsize: int = 4096, compute: Callable[[LoanInputs], LoanResult] = compute_all_quantities):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self._compute = compute
+        self._results: OrderedDict[LoanInputs, LoanResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __call__(self, loan_inputs: LoanInputs) -> LoanResult:
+        """
+        Return the results for the given inputs, computing them on a miss.
+
+        Parameters
+        ----------
+        loan_inputs : LoanInputs
+            A named tuple containing all input parameters for the loan
+
+        Returns
+        -------
+        LoanResult
+            The results for the normalized inputs
+        """
+        key = normalize_loan_inputs(loan_inputs)
+
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self._hits += 1
+                return result
+            self._misses += 1
+
+        # Computation happens outside the lock, concurrent misses on one key only cost a duplicate solve
+        result = self._compute(key)
+
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+                self._evictions += 1
+
+        return result
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Snapshot of the cache counters.
+
+        Returns
+        -------
+        CacheStats
+            Hits, misses, evictions and current size
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._results), self.maxsize)
+
+    def clear(self) -> None:
+        """
+        Drop every cached result and reset the counters.
+        """
+        with self._lock:
+            self._results.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
@@ -0,0 +1,344 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from .common_objects import LoanInputs
+from .core_functions import _convert_monthly_to_annual_rate, _convert_prop_rate
+from .schedule import compute_amortization_schedule
+
+# Maximum number of discount factors held at once by the batch solver (8 bytes each)
+_MAX_SOLVER_CELLS = 2**21
+
+
+def dated_cash_flows(periods: np.ndarray, amounts: np.ndarray, length: int | None = None) -> np.ndarray:
+    """
+    Build a monthly cash-flow vector from dated amounts.
+
+    Parameters
+    ----------
+    periods : np.ndarray
+        Month of each amount, 0 being the signing date. Several amounts may share a month.
+    amounts : np.ndarray
+        Signed amounts, positive when received by the borrower, negative when paid
+    length : int | None, optional
+        Length of the vector, by default just long enough for the last period
+
+    Returns
+    -------
+    np.ndarray
+        Net cash flow of every month, zero for the months without any amount
+
+    Examples
+    --------
+    >>> dated_cash_flows([0, 0, 2, 3], [1000.0, -50.0, -500.0, -510.0])
+    array([ 950.,    0., -500., -510.])
+    """
+    periods = np.asarray(periods, dtype=np.int64)
+    if periods.size and periods.min() < 0:
+        raise ValueError("Cash-flow periods must be non-negative")
+    return np.bincount(periods, weights=np.asarray(amounts, dtype=np.float64), minlength=length or 0)
+
+
+def pad_cash_flows(cash_flows: Sequence[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Stack cash-flow vectors of different lengths into one zero-padded 2-D array.
+
+    Parameters
+    ----------
+    cash_flows : Sequence[np.ndarray]
+        One monthly cash-flow vector per loan
+
+    Returns
+    -------
+    padded : np.ndarray
+        Array of shape (loan number, longest length), zeros after the end of each vector
+    lengths : np.ndarray
+        Length of each vector
+    """
+    lengths = np.fromiter((len(flows) for flows in cash_flows), dtype=np.int64, count=len(cash_flows))
+    padded = np.zeros((len(cash_flows), lengths.max(initial=0)))
+    for row, flows in zip(padded, cash_flows, strict=True):
+        row[: len(flows)] = flows
+    return padded, lengths
+
+
+def loan_cash_flows(
+    loan_inputs: LoanInputs, deferred_months: int = 0, monthly_insurance_rate: float = 0.0
+) -> np.ndarray:
+    """
+    Cash flows of an amortizing loan, seen from the borrower.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs
+        A named tuple containing all input parameters for the loan
+    deferred_months : int, optional
+        Months of partial deferral before the amortization starts, during which
+        only the interest (and insurance) is paid, by default 0
+    monthly_insurance_rate : float, optional
+        Insurance charged every month on the capital still due at the start of
+        the month, on top of `insurance_cost`, by default 0
+
+    Returns
+    -------
+    np.ndarray
+        Monthly cash flows: capital minus upfront fees at month 0, then one
+        negative payment per month
+
+    Notes
+    -----
+    `insurance_cost` is spread evenly over the payments like in the rest of the
+    package, so without deferral nor insurance on the remaining capital the
+    effective rate of these flows is the TAEG of `compute_all_quantities`.
+
+    Step-up payments or fees paid later can be added to the result with
+    `dated_cash_flows`.
+
+    Examples
+    --------
+    >>> flows = loan_cash_flows(LoanInputs(1200.0, 0.12, 12, initial_cost=100.0))
+    >>> flows[:3].round(2)
+    array([1100.  , -106.62, -106.62])
+    """
+    schedule = compute_amortization_schedule(loan_inputs)
+    monthly_rate = _convert_prop_rate(loan_inputs.annual_rate, 12)
+    payment_number = deferred_months + loan_inputs.month_number
+
+    # Capital due at the start of each month, constant during the deferral
+    opening_balance = np.empty(payment_number)
+    opening_balance[:deferred_months] = loan_inputs.initial_capital
+    opening_balance[deferred_months] = loan_inputs.initial_capital
+    opening_balance[deferred_months + 1 :] = schedule.remaining_balance[:-1]
+
+    flows = np.empty(payment_number + 1)
+    flows[0] = loan_inputs.initial_capital - loan_inputs.initial_cost
+    payments = flows[1:]
+    payments[:deferred_months] = loan_inputs.initial_capital * monthly_rate
+    payments[deferred_months:] = schedule.interest + schedule.principal
+    payments += loan_inputs.insurance_cost / payment_number
+    payments += monthly_insurance_rate * opening_balance
+    np.negative(payments, out=payments)
+
+    return flows
+
+
+def _solve_discount_factor(
+    cash_flows: np.ndarray,
+    lengths: np.ndarray,
+    x0: float | np.ndarray = 0.99,
+    xtol: float = 1e-7,
+    maxiter: int = 100,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the monthly discount factor cancelling the present value of cash flows.
+
+    Parameters
+    ----------
+    cash_flows : np.ndarray
+        Zero-padded 2-D array of monthly cash flows, one row per loan
+    lengths : np.ndarray
+        Number of meaningful months in each row
+    x0 : float | np.ndarray, optional
+        Starting discount factor(s), in ]0, 2[, by default 0.99 like `compute_taeg`
+    xtol : float, optional
+        Absolute step tolerance, by default 1e-7 like `compute_taeg`
+    maxiter : int, optional
+        Maximum number of iterations, by default 100
+
+    Returns
+    -------
+    roots : np.ndarray
+        Discount factors v such that sum(cash_flows[k] * v^k) = 0
+    converged : np.ndarray
+        Boolean mask, True where the step went below `xtol`
+    iterations : np.ndarray
+        Number of iterations performed for each loan
+
+    Raises
+    ------
+    ValueError
+        If the present value has the same sign at both ends of the bracket for some loan
+
+    Notes
+    -----
+    Every iteration is a Newton step kept inside a bracket [lo, hi] where the
+    present value changes sign, the bracket starting at [0, 2] (any rate above
+    -100%). Steps leaving the bracket are replaced by a bisection, so the solve
+    cannot diverge even from a poor starting point.
+
+    The powers v^k are obtained with one cumulative product along the months,
+    and both the present value and v times its derivative are row-wise dot
+    products with the flows and the flows weighted by k. Only the columns up
+    to the longest remaining active row are processed.
+    """
+    loan_number, width = cash_flows.shape
+    months = np.arange(width)
+    flows = np.where(months < lengths[:, np.newaxis], cash_flows, 0.0)
+    weighted_flows = flows * months
+
+    # Close to v = 0 the present value has the sign of the first non-zero flow. At v = 2
+    # it is evaluated scaled by 2^-(width - 1), which keeps the sign and avoids overflows.
+    lower = np.zeros(loan_number)
+    upper = np.full(loan_number, 2.0)
+    nonzero = flows != 0
+    lower_sign = np.sign(flows[np.arange(loan_number), nonzero.argmax(axis=1)])
+    upper_sign = np.sign(flows @ np.power(2.0, months - (width - 1)))
+    no_root = ~nonzero.any(axis=1) | (lower_sign * upper_sign > 0)
+    if no_root.any():
+        raise ValueError(f"Cash flows of {np.count_nonzero(no_root)} loan(s) have no effective rate above -100%")
+
+    roots = np.array(np.broadcast_to(x0, loan_number), dtype=np.float64)
+    iterations = np.zeros(loan_number, dtype=np.int64)
+    active = np.arange(loan_number)
+
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+
+        active_width = lengths[active].max()
+        rate = roots[active]
+
+        # Incremental discount factors: row i holds 1, v_i, v_i^2, ...
+        powers = np.empty((active.size, active_width))
+        powers[:, 0] = 1.0
+        powers[:, 1:] = rate[:, np.newaxis]
+        np.cumprod(powers, axis=1, out=powers)
+
+        value = np.einsum("ij,ij->i", flows[active, :active_width], powers)
+        derivative = np.einsum("ij,ij->i", weighted_flows[active, :active_width], powers) / rate
+
+        # Shrink the bracket around the sign change, an exact root leaves it as it is
+        exact = value == 0
+        below = np.sign(value) == lower_sign[active]
+        lower[active] = np.where(below, rate, lower[active])
+        upper[active] = np.where(below | exact, upper[active], rate)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            candidate = rate - value / derivative
+        outside = ~((candidate > lower[active]) & (candidate < upper[active]))
+        candidate = np.where(outside, (lower[active] + upper[active]) / 2, candidate)
+        candidate = np.where(exact, rate, candidate)
+
+        step = candidate - rate
+        roots[active] = candidate
+        iterations[active] += 1
+        active = active[~((np.abs(step) < xtol) | (value == 0))]
+
+    converged = np.ones(loan_number, dtype=bool)
+    converged[active] = False
+
+    return roots, converged, iterations
+
+
+def _solve_discount_factor_chunked(
+    cash_flows: np.ndarray, lengths: np.ndarray, x0: float | np.ndarray = 0.99
+) -> np.ndarray:
+    """
+    Run `_solve_discount_factor` by chunks of rows and check convergence.
+
+    Parameters
+    ----------
+    cash_flows : np.ndarray
+        Zero-padded 2-D array of monthly cash flows, one row per loan
+    lengths : np.ndarray
+        Number of meaningful months in each row
+    x0 : float | np.ndarray, optional
+        Starting discount factor(s), by default 0.99
+
+    Returns
+    -------
+    np.ndarray
+        Discount factor of each row
+
+    Raises
+    ------
+    RuntimeError
+        If the solver fails to converge for any row
+    """
+    loan_number, width = cash_flows.shape
+    lengths = np.minimum(lengths.astype(np.int64, copy=False), width)
+    x0 = np.broadcast_to(x0, loan_number)
+
+    roots = np.empty(loan_number)
+    converged = np.empty(loan_number, dtype=bool)
+    chunk_size = max(1, _MAX_SOLVER_CELLS // max(width, 1))
+    for start in range(0, loan_number, chunk_size):
+        chunk = slice(start, start + chunk_size)
+        roots[chunk], converged[chunk], _ = _solve_discount_factor(cash_flows[chunk], lengths[chunk], x0[chunk])
+
+    if not converged.all():
+        raise RuntimeError(f"Effective rate computation failed to converge for {np.count_nonzero(~converged)} loan(s)")
+
+    return roots
+
+
+def compute_effective_rate_batch(cash_flows: np.ndarray, lengths: np.ndarray | None = None) -> np.ndarray:
+    """
+    Calculate the effective annual rate (TAEG) of many cash-flow schedules.
+
+    Parameters
+    ----------
+    cash_flows : np.ndarray
+        2-D array of monthly cash flows seen from the borrower, one row per loan,
+        zero-padded after the end of shorter schedules (see `pad_cash_flows`)
+    lengths : np.ndarray | None, optional
+        Number of meaningful months in each row, by default the full width
+
+    Returns
+    -------
+    np.ndarray
+        Effective annual rates, such that the flows discounted monthly at the
+        equivalent rate sum to zero
+
+    Raises
+    ------
+    ValueError
+        If a schedule has no effective rate (flows not changing sign)
+    RuntimeError
+        If the solver fails to converge for any loan
+
+    Notes
+    -----
+    Loans are solved by chunks of rows so that the discount factors never
+    take more than about 16 MB, whatever the batch size.
+
+    Examples
+    --------
+    >>> flows = np.array([[1000.0, -510.0, -510.0], [1000.0, -1020.0, 0.0]])
+    >>> compute_effective_rate_batch(flows, lengths=np.array([3, 2])).round(4)
+    array([0.1719, 0.2682])
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=np.float64))
+    if lengths is None:
+        lengths = np.full(len(cash_flows), cash_flows.shape[1])
+
+    return _convert_monthly_to_annual_rate(_solve_discount_factor_chunked(cash_flows, np.asarray(lengths)))
+
+
+def compute_effective_rate(cash_flows: Sequence[float]) -> float:
+    """
+    Calculate the effective annual rate (TAEG) of one cash-flow schedule.
+
+    Parameters
+    ----------
+    cash_flows : Sequence[float]
+        Monthly cash flows seen from the borrower, index 0 being the signing date
+
+    Returns
+    -------
+    float
+        Effective annual rate
+
+    Examples
+    --------
+    >>> round(compute_effective_rate(loan_cash_flows(LoanInputs(200000.0, 0.02, 240, 1000.0, 8000.0))), 6)
+    0.024293
+
+    A one-month schedule is linear in the discount factor, Newton lands on the root exactly:
+
+    >>> from loan_ranger.core_functions import compute_all_quantities
+    >>> loan = LoanInputs(1000.0, 0.01, 1, 10.0, 0.0)
+    >>> bool(np.isclose(compute_effective_rate(loan_cash_flows(loan)), compute_all_quantities(loan).full_taeg))
+    True
+    """
+    return float(compute_effective_rate_batch(np.asarray(cash_flows, dtype=np.float64)[np.newaxis, :])[0])
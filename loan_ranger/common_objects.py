@@ -1,5 +1,7 @@
 from typing import NamedTuple
 
+import numpy as np
+
 
 class LoanResult(NamedTuple):
     """
@@ -55,3 +57,724 @@ class LoanInputs(NamedTuple):
     month_number: int
     initial_cost: float = 0.0
     insurance_cost: float = 0.0
+
+
+# Packed record layout of LoanInputs, used to ship many loans as one contiguous buffer
+LOAN_INPUTS_DTYPE = np.dtype(
+    [
+        ("initial_capital", np.float64),
+        ("annual_rate", np.float64),
+        ("month_number", np.int64),
+        ("initial_cost", np.float64),
+        ("insurance_cost", np.float64),
+    ]
+)
+
+
+class TaegPair(NamedTuple):
+    """
+    Container for the TAEG computed with and without insurance in a shared solve.
+
+    Attributes
+    ----------
+    full_taeg : float
+        Taux Annuel Effectif Global including all costs
+    taeg_no_insurance : float
+        Taux Annuel Effectif Global excluding insurance costs
+    full_installments : float
+        Average monthly payment including all costs
+    full_iterations : int
+        Number of solver iterations of the full TAEG solve
+    no_insurance_iterations : int
+        Number of solver iterations of the warm-started solve without insurance
+    """
+
+    full_taeg: float
+    taeg_no_insurance: float
+    full_installments: float
+    full_iterations: int
+    no_insurance_iterations: int
+
+
+class ScheduleRow(NamedTuple):
+    """
+    Container for one period of an amortization schedule.
+
+    Attributes
+    ----------
+    period : int
+        Period number, starting at 1 for the first installment
+    interest : float
+        Interest part of the installment
+    principal : float
+        Principal part of the installment
+    remaining_balance : float
+        Capital still due after the installment
+    insurance : float
+        Insurance paid over the period
+    """
+
+    period: int
+    interest: float
+    principal: float
+    remaining_balance: float
+    insurance: float
+
+
+class AmortizationSchedule(NamedTuple):
+    """
+    Container for a full amortization schedule stored as columns.
+
+    Same attributes as ScheduleRow, each one being an array with one entry per period.
+
+    Attributes
+    ----------
+    period : np.ndarray
+        Period numbers, from 1 to the number of installments
+    interest : np.ndarray
+        Interest part of each installment
+    principal : np.ndarray
+        Principal part of each installment
+    remaining_balance : np.ndarray
+        Capital still due after each installment
+    insurance : np.ndarray
+        Insurance paid over each period
+    """
+
+    period: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    remaining_balance: np.ndarray
+    insurance: np.ndarray
+
+
+class CacheStats(NamedTuple):
+    """
+    Container for the counters of a result cache.
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups answered from the cache
+    misses : int
+        Number of lookups that required a computation
+    evictions : int
+        Number of entries dropped to respect the maximum size
+    size : int
+        Number of entries currently stored
+    maxsize : int
+        Maximum number of entries kept
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class BulkPricingStats(NamedTuple):
+    """
+    Container for the summary of a bulk pricing run.
+
+    Attributes
+    ----------
+    priced_rows : int
+        Number of rows priced and written to the output
+    rejected_rows : int
+        Number of malformed rows sent to the reject stream
+    elapsed_seconds : float
+        Wall time of the whole run
+    """
+
+    priced_rows: int
+    rejected_rows: int
+    elapsed_seconds: float
+
+
+class ExactSchedule(NamedTuple):
+    """
+    Container for a cent-exact amortization schedule, amounts as int64 cents.
+
+    Attributes
+    ----------
+    period : np.ndarray
+        Period numbers, from 1 to the number of installments
+    installment : np.ndarray
+        Installment without insurance, constant except the last one which absorbs the rounding residual
+    interest : np.ndarray
+        Interest part of each installment, rounded to the cent
+    principal : np.ndarray
+        Principal part of each installment
+    remaining_balance : np.ndarray
+        Capital still due after each installment, 0 after the last one
+    insurance : np.ndarray
+        Insurance paid over each period
+    """
+
+    period: np.ndarray
+    installment: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    remaining_balance: np.ndarray
+    insurance: np.ndarray
+
+
+class ExactLoanResult(NamedTuple):
+    """
+    Container for the cent-exact results of loans, amounts as int64 cents.
+
+    For batches every attribute is an array with one entry per loan.
+
+    Attributes
+    ----------
+    monthly_installment : int
+        Installment without insurance, rounded to the cent
+    last_installment : int
+        Last installment without insurance, absorbing the rounding residual
+    monthly_insurance : int
+        Insurance paid each month, truncated to the cent
+    last_insurance : int
+        Insurance paid the last month, absorbing the truncation residual
+    total_interests : int
+        Sum of the interest lines of the schedule
+    total_cost_no_insurance : int
+        Total interest plus initial cost
+    total_cost : int
+        Total cost including insurance
+    full_taeg : float
+        Effective annual rate of the exact cash flows
+    taea : float
+        Full TAEG minus the TAEG of the cash flows without insurance
+    """
+
+    monthly_installment: int
+    last_installment: int
+    monthly_insurance: int
+    last_insurance: int
+    total_interests: int
+    total_cost_no_insurance: int
+    total_cost: int
+    full_taeg: float
+    taea: float
+
+
+class ContinuationStats(NamedTuple):
+    """
+    Container for the iteration counts of a continuation TAEG solve.
+
+    Attributes
+    ----------
+    solves : int
+        Number of loans solved
+    anchor_solves : int
+        Number of loans solved from the cold start to seed their neighbours
+    fallback_solves : int
+        Number of loans re-solved with the bracketed fallback
+    iterations : int
+        Newton iterations of the whole solve, anchors and fallbacks included
+    cold_iterations : float
+        Estimated iterations of the same solve from the cold start, i.e. the
+        mean iteration count of the anchors times the number of loans
+    saved_iterations : float
+        cold_iterations - iterations
+    """
+
+    solves: int
+    anchor_solves: int
+    fallback_solves: int
+    iterations: int
+    cold_iterations: float
+    saved_iterations: float
+
+
+class SolveRecord(NamedTuple):
+    """
+    Container describing one TAEG solve, passed to solver observers.
+
+    For batch solves every per-loan field is an array with one entry per loan,
+    and `wall_time` is the time of the whole batch solve.
+
+    Attributes
+    ----------
+    month_number : int
+        Total number of monthly payments
+    full_installments : float
+        Average monthly payment used in the objective
+    initial_cost : float
+        Upfront fees paid at loan origination
+    initial_capital : float
+        Principal amount of the loan
+    root : float
+        Monthly discount rate found by the solver
+    iterations : int
+        Number of solver iterations
+    function_calls : int
+        Number of objective evaluations (value and derivative count as one)
+    converged : bool
+        Whether the solver reached the requested tolerance
+    residual : float
+        Objective value at the returned root
+    wall_time : float
+        Wall time of the solve, in seconds
+    """
+
+    month_number: int
+    full_installments: float
+    initial_cost: float
+    initial_capital: float
+    root: float
+    iterations: int
+    function_calls: int
+    converged: bool
+    residual: float
+    wall_time: float
+
+
+class RateGrid(NamedTuple):
+    """
+    Container for loan results evaluated over a grid of inputs.
+
+    Attributes
+    ----------
+    axes : dict[str, np.ndarray]
+        Grid axes, in dimension order. Keys are LoanInputs field names, values
+        the coordinates along that dimension.
+    results : LoanResult
+        A named tuple where each field is an N-dimensional array, with one
+        dimension per entry of `axes`
+    """
+
+    axes: dict[str, np.ndarray]
+    results: LoanResult
+
+
+class Tranche(NamedTuple):
+    """
+    Container for one loan of a multi-loan package.
+
+    Attributes
+    ----------
+    loan_inputs : LoanInputs
+        Input parameters of the loan, amortized over `loan_inputs.month_number` months
+    start_month : int
+        Month of the disbursement, counted from the signing of the package
+    deferred_months : int
+        Months after the disbursement during which only the interest (and
+        insurance) is paid, before the amortization starts. For a zero-rate
+        loan this is a total deferral.
+    """
+
+    loan_inputs: LoanInputs
+    start_month: int = 0
+    deferred_months: int = 0
+
+
+class PackageResult(NamedTuple):
+    """
+    Container for the consolidated results of a multi-loan package.
+
+    For batches every field is an array with one entry per package.
+
+    Attributes
+    ----------
+    total_capital : float
+        Sum of the capital of every tranche
+    peak_monthly_payment : float
+        Highest monthly payment of the merged schedule, insurance included
+    total_interests : float
+        Total interest paid over all tranches, deferral interest included
+    total_cost_no_insurance : float
+        Total cost of the package excluding insurance (interest + initial costs)
+    total_cost : float
+        Total cost of the package including all expenses
+    full_taeg : float
+        Taux Annuel Effectif Global of the merged cash flows
+    taea : float
+        Taux Annuel Effectif d'Assurance of the merged cash flows
+    """
+
+    total_capital: float
+    peak_monthly_payment: float
+    total_interests: float
+    total_cost_no_insurance: float
+    total_cost: float
+    full_taeg: float
+    taea: float
+
+
+class VariableRateModel(NamedTuple):
+    """
+    Container for the parameters of a capped variable-rate loan and of its rate model.
+
+    The loan rate follows a mean-reverting (Ornstein-Uhlenbeck) process starting
+    at the initial annual rate, and is only applied at the reset dates, kept
+    between the floor and the cap.
+
+    Attributes
+    ----------
+    volatility : float
+        Annual volatility of the rate, in rate units (0.01 for 1 point)
+    reversion_speed : float
+        Speed of the return towards `long_term_rate`, per year
+    long_term_rate : float | None
+        Rate towards which the process reverts, None for the initial annual rate
+    rate_cap : float
+        Maximum increase of the applied rate above the initial rate
+    rate_floor : float
+        Maximum decrease of the applied rate below the initial rate, the applied
+        rate never goes below zero
+    reset_months : int
+        Months between two rate resets, the installment is recomputed at each reset
+    """
+
+    volatility: float = 0.01
+    reversion_speed: float = 0.3
+    long_term_rate: float | None = None
+    rate_cap: float = 0.01
+    rate_floor: float = 0.01
+    reset_months: int = 12
+
+
+class VariableRateResult(NamedTuple):
+    """
+    Container for the distribution of variable-rate loan outcomes over simulated paths.
+
+    Attributes
+    ----------
+    path_number : int
+        Number of simulated rate paths
+    quantile_levels : np.ndarray
+        Probability levels of the reported quantiles
+    total_cost : np.ndarray
+        Quantiles of the total cost (interest, initial costs and insurance), one per level
+    peak_installment : np.ndarray
+        Quantiles of the highest monthly installment (insurance excluded), one per level
+    full_taeg : np.ndarray
+        Quantiles of the TAEG computed on the realized cash flows, one per level
+    """
+
+    path_number: int
+    quantile_levels: np.ndarray
+    total_cost: np.ndarray
+    peak_installment: np.ndarray
+    full_taeg: np.ndarray
+
+
+class LoanEvent(NamedTuple):
+    """
+    Container for a change to a running loan, applied right after an installment.
+
+    Attributes
+    ----------
+    month : int
+        Number of installments already paid when the event happens
+    prepayment : float
+        Capital repaid early, capped to the capital still due
+    annual_rate : float | None
+        New annual rate for the remaining capital, None to keep the current one
+    month_number : int | None
+        New number of remaining monthly payments, None to keep the current end date
+        (a prepayment then lowers the installment)
+    fees : float
+        Penalties or renegotiation fees paid at the event
+    """
+
+    month: int
+    prepayment: float = 0.0
+    annual_rate: float | None = None
+    month_number: int | None = None
+    fees: float = 0.0
+
+
+class ScenarioResult(NamedTuple):
+    """
+    Container for the results of a loan after early repayments or renegotiations.
+
+    For sweeps every field is an array with one entry per candidate scenario.
+
+    Attributes
+    ----------
+    final_installment : float
+        Monthly installment after the last event, insurance excluded
+    end_month : int
+        Month of the last payment
+    total_interests : float
+        Total interest paid over the life of the loan
+    total_cost : float
+        Total cost including initial costs, event fees and insurance
+    full_taeg : float
+        Taux Annuel Effectif Global of the actual cash flows
+    """
+
+    final_installment: float
+    end_month: int
+    total_interests: float
+    total_cost: float
+    full_taeg: float
+
+
+class Offer(NamedTuple):
+    """
+    Container for a bank offer of a catalog.
+
+    Attributes
+    ----------
+    name : str
+        Identifier of the offer
+    rate_grid : dict[int, float]
+        Annual rate offered for each available duration in months
+    fixed_fee : float
+        Upfront fees independent of the capital
+    fee_rate : float
+        Upfront fees as a fraction of the capital
+    insurance_rate : float
+        Yearly insurance cost as a fraction of the initial capital
+    """
+
+    name: str
+    rate_grid: dict[int, float]
+    fixed_fee: float = 0.0
+    fee_rate: float = 0.0
+    insurance_rate: float = 0.0
+
+
+class BorrowerProfile(NamedTuple):
+    """
+    Container for what a client asks for when comparing offers.
+
+    Attributes
+    ----------
+    initial_capital : float
+        Amount to borrow
+    month_number : int
+        Wanted duration in months
+    """
+
+    initial_capital: float
+    month_number: int
+
+
+class OfferQuote(NamedTuple):
+    """
+    Container for one offer priced for a client.
+
+    Attributes
+    ----------
+    name : str
+        Identifier of the offer
+    loan_inputs : LoanInputs
+        Loan resulting from the offer terms and the client profile
+    result : LoanResult
+        All quantities of that loan
+    """
+
+    name: str
+    loan_inputs: LoanInputs
+    result: LoanResult
+
+
+# Packed record layout of LoanResult, seven float64 fields so 56 bytes per loan
+LOAN_RESULT_DTYPE = np.dtype([(name, np.float64) for name in LoanResult._fields])
+
+
+class _RecordBatch:
+    """
+    Base class of the columnar containers, many named tuples stored as one structured array.
+
+    Subclasses set `_record_type` to the NamedTuple class of one element and
+    `_dtype` to the matching structured dtype.
+
+    Parameters
+    ----------
+    records : np.ndarray
+        1-D structured array with the `_dtype` layout, kept without copy
+    """
+
+    __slots__ = ("records",)
+
+    _record_type: type
+    _dtype: np.dtype
+
+    # Number of records converted to Python objects at once while iterating
+    _iteration_chunk = 4096
+
+    def __init__(self, records: np.ndarray):
+        if records.dtype != self._dtype or records.ndim != 1:
+            raise ValueError(f"{type(self).__name__} expects a 1-D structured array with dtype {self._dtype}")
+        self.records = records
+
+    @classmethod
+    def empty(cls, size: int):
+        """
+        Allocate an uninitialized batch.
+
+        Parameters
+        ----------
+        size : int
+            Number of elements
+
+        Returns
+        -------
+        Batch of the calling class, to be filled through its column views
+        """
+        return cls(np.empty(size, dtype=cls._dtype))
+
+    @classmethod
+    def from_columns(cls, columns: tuple):
+        """
+        Pack columns into a batch, in a single contiguous buffer.
+
+        Parameters
+        ----------
+        columns : tuple
+            Named tuple of the element type whose fields are scalars or arrays,
+            such as the output of the batch functions. Fields are broadcast together.
+
+        Returns
+        -------
+        Batch of the calling class
+        """
+        arrays = np.broadcast_arrays(*(np.atleast_1d(np.asarray(column)) for column in columns))
+        batch = cls.empty(len(arrays[0]))
+        for name, column in zip(cls._record_type._fields, arrays, strict=True):
+            batch.records[name] = column
+        return batch
+
+    @classmethod
+    def from_list(cls, elements: list):
+        """
+        Pack a list of named tuples into a batch.
+
+        Parameters
+        ----------
+        elements : list
+            Named tuples of the element type, or plain tuples in the same field order
+
+        Returns
+        -------
+        Batch of the calling class
+        """
+        return cls(np.array([tuple(element) for element in elements], dtype=cls._dtype))
+
+    def to_list(self) -> list:
+        """
+        Convert the batch to a list of named tuples of Python scalars.
+
+        Returns
+        -------
+        list
+            One named tuple of the element type per element
+        """
+        make = self._record_type._make
+        return [make(row) for row in self.records.tolist()]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Zero-copy view on one field of every element.
+
+        Parameters
+        ----------
+        name : str
+            Field name of the element type
+
+        Returns
+        -------
+        np.ndarray
+            Strided view on the batch buffer, writing to it modifies the batch
+        """
+        return self.records[name]
+
+    def columns(self) -> tuple:
+        """
+        Zero-copy views on every field, as a named tuple of arrays.
+
+        Returns
+        -------
+        tuple
+            Named tuple of the element type whose fields are the column views,
+            accepted by the batch functions
+        """
+        return self._record_type._make(self.records[name] for name in self._record_type._fields)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        if name in self._record_type._fields:
+            return self.records[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index):
+        if isinstance(index, int | np.integer):
+            return self._record_type._make(self.records[index].tolist())
+        # Slices give views, index arrays and masks give copies, as with NumPy
+        return type(self)(self.records[index])
+
+    def __iter__(self):
+        make = self._record_type._make
+        for start in range(0, len(self.records), self._iteration_chunk):
+            for row in self.records[start : start + self._iteration_chunk].tolist():
+                yield make(row)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(size={len(self)})"
+
+
+class LoanInputsBatch(_RecordBatch):
+    """
+    Columnar container for many loan inputs, one LOAN_INPUTS_DTYPE record per loan.
+
+    Accepted directly by the batch functions. Fields are available as zero-copy
+    column views, e.g. ``batch.annual_rate``, indexing with an integer gives a
+    LoanInputs and slicing gives a batch sharing the same buffer.
+
+    Parameters
+    ----------
+    records : np.ndarray
+        1-D structured array with the LOAN_INPUTS_DTYPE layout, kept without copy
+
+    Examples
+    --------
+    >>> batch = LoanInputsBatch.from_list([LoanInputs(200000.0, 0.02, 240), LoanInputs(150000.0, 0.03, 300)])
+    >>> batch.records.itemsize
+    40
+    >>> batch[1]
+    LoanInputs(initial_capital=150000.0, annual_rate=0.03, month_number=300, initial_cost=0.0, insurance_cost=0.0)
+    """
+
+    __slots__ = ()
+
+    _record_type = LoanInputs
+    _dtype = LOAN_INPUTS_DTYPE
+
+
+class LoanResultBatch(_RecordBatch):
+    """
+    Columnar container for many loan results, one LOAN_RESULT_DTYPE record (56 bytes) per loan.
+
+    Holds the same information as a list of LoanResult at a fraction of the
+    memory, as one contiguous buffer. Fields are available as zero-copy column
+    views, e.g. ``batch.full_taeg``, indexing with an integer gives a LoanResult,
+    slicing gives a batch sharing the same buffer and iteration builds the
+    LoanResult tuples one at a time.
+
+    Parameters
+    ----------
+    records : np.ndarray
+        1-D structured array with the LOAN_RESULT_DTYPE layout, kept without copy
+
+    Examples
+    --------
+    >>> batch = LoanResultBatch.from_columns(LoanResult(*np.zeros((7, 3))))
+    >>> len(batch), batch.records.itemsize
+    (3, 56)
+    >>> batch.full_taeg[:] = 0.05
+    >>> batch[0].full_taeg
+    0.05
+    """
+
+    __slots__ = ()
+
+    _record_type = LoanResult
+    _dtype = LOAN_RESULT_DTYPE
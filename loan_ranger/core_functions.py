@@ -1,9 +1,12 @@
+import time
 from collections.abc import Callable
+from typing import NamedTuple
 
 import numpy as np
-import scipy.optimize as optimize
 
-from .common_objects import LoanInputs, LoanResult
+from .common_objects import LoanInputs, LoanResult, SolveRecord, TaegPair
+from .instrumentation import _notify_solve, _solve_observers
+from .profiling import profiled
 
 
 def _convert_prop_rate(origin_rate: float, periods: int) -> float:
@@ -96,6 +99,150 @@ def _installment_per_period(period_rate: float, period_number: int, initial_capi
     return installment
 
 
+def _capital_per_period(period_rate: np.ndarray, period_number: np.ndarray, installment: np.ndarray) -> np.ndarray:
+    """
+    Calculate the principal repaid by a given installment, inverse of `_installment_per_period`.
+
+    Parameters
+    ----------
+    period_rate : np.ndarray
+        Interest rates per period (as decimals)
+    period_number : np.ndarray
+        Total numbers of payment periods
+    installment : np.ndarray
+        Payment amounts per period
+
+    Returns
+    -------
+    np.ndarray
+        Principal amounts, P = PMT * (1 - (1 + r)^-n) / r, or PMT * n for a zero rate
+    """
+    period_rate = np.asarray(period_rate, dtype=np.float64)
+    installment = np.asarray(installment, dtype=np.float64)
+    safe_rate = np.where(period_rate == 0, 1.0, period_rate)
+    capital = installment * -np.expm1(-period_number * np.log1p(safe_rate)) / safe_rate
+    return np.where(period_rate == 0, installment * period_number, capital)
+
+
+def _period_number_for_installment(
+    period_rate: np.ndarray, initial_capital: np.ndarray, installment: np.ndarray
+) -> np.ndarray:
+    """
+    Calculate the (fractional) number of periods needed to repay a principal.
+
+    Parameters
+    ----------
+    period_rate : np.ndarray
+        Interest rates per period (as decimals)
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+    installment : np.ndarray
+        Payment amounts per period
+
+    Returns
+    -------
+    np.ndarray
+        n = -log(1 - P * r / PMT) / log(1 + r), or P / PMT for a zero rate.
+        Infinite where the installment does not even cover the interest.
+    """
+    period_rate = np.asarray(period_rate, dtype=np.float64)
+    initial_capital = np.asarray(initial_capital, dtype=np.float64)
+    installment = np.asarray(installment, dtype=np.float64)
+    safe_rate = np.where(period_rate == 0, 1.0, period_rate)
+    interest_share = initial_capital * safe_rate / installment
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        period_number = np.where(
+            interest_share < 1, -np.log1p(-np.minimum(interest_share, 1)) / np.log1p(safe_rate), np.inf
+        )
+
+    return np.where(period_rate == 0, initial_capital / installment, period_number)
+
+
+def _period_rate_for_installment(
+    period_number: np.ndarray,
+    initial_capital: np.ndarray,
+    installment: np.ndarray,
+    xtol: float = 1e-12,
+    maxiter: int = 50,
+) -> np.ndarray:
+    """
+    Solve the rate per period giving an installment, with a vectorized Newton method.
+
+    Parameters
+    ----------
+    period_number : np.ndarray
+        Total numbers of payment periods
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+    installment : np.ndarray
+        Payment amounts per period
+    xtol : float, optional
+        Absolute tolerance on the rate per period, by default 1e-12
+    maxiter : int, optional
+        Maximum number of Newton iterations, by default 50
+
+    Returns
+    -------
+    np.ndarray
+        Rates per period, NaN where the installments do not repay the principal
+        (PMT * n < P) or where the solve did not converge
+
+    Notes
+    -----
+    The installment is a convex increasing function of the rate. The starting
+    point is the root of its first order expansion around 0,
+    PMT ~ P / n + r * P * (n + 1) / (2 * n), which lies left of the true root:
+    the first step may overshoot, the following ones then decrease monotonically.
+    """
+    period_number, initial_capital, installment = np.broadcast_arrays(
+        np.asarray(period_number, dtype=np.float64),
+        np.asarray(initial_capital, dtype=np.float64),
+        np.asarray(installment, dtype=np.float64),
+    )
+    shape = period_number.shape
+    period_number, initial_capital, installment = period_number.ravel(), initial_capital.ravel(), installment.ravel()
+
+    rate = np.maximum(
+        (installment - initial_capital / period_number) * 2 * period_number / (initial_capital * (period_number + 1)),
+        0.0,
+    )
+    # Allow for rounding noise on zero rate loans, where PMT * n == P only up to float precision
+    repaid = installment * period_number >= initial_capital * (1 - 1e-12)
+    active = np.flatnonzero(installment * period_number > initial_capital)
+
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+
+        r = rate[active]
+        n = period_number[active]
+        capital = initial_capital[active]
+
+        # PMT(r) = P * r / (1 - v) with v = (1 + r)^-n and its derivative, both taken at their limit for r = 0
+        zero_rate = r == 0
+        safe_r = np.where(zero_rate, 1.0, r)
+        log_discount = -n * np.log1p(safe_r)
+        one_minus_discount = -np.expm1(log_discount)
+        value = np.where(zero_rate, capital / n, capital * safe_r / one_minus_discount) - installment[active]
+        derivative = np.where(
+            zero_rate,
+            capital * (n + 1) / (2 * n),
+            capital * (one_minus_discount - safe_r * n * np.exp(log_discount) / (1 + safe_r)) / one_minus_discount**2,
+        )
+
+        step = value / derivative
+        rate[active] = r - step
+        active = active[~(np.abs(step) < xtol)]
+
+    # Loans still active did not converge, loans never repaid have no non-negative rate
+    rate[active] = np.nan
+    rate[~repaid] = np.nan
+
+    return rate.reshape(shape)
+
+
+@profiled("compute_interest_cost")
 def compute_interest_cost(annual_rate: float, month_number: int, initial_capital: float) -> tuple[float, float]:
     """
     Compute the monthly installment and total interest cost for a loan.
@@ -131,6 +278,178 @@ def compute_interest_cost(annual_rate: float, month_number: int, initial_capital
     return monthly_installment, total_cost
 
 
+def compute_max_capital(
+    annual_rate: np.ndarray, month_number: np.ndarray, monthly_installment: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the largest principal that a monthly budget repays.
+
+    Parameters
+    ----------
+    annual_rate : np.ndarray
+        Annual interest rates (as decimals, e.g., 0.05 for 5%)
+    month_number : np.ndarray
+        Total numbers of monthly payments
+    monthly_installment : np.ndarray
+        Monthly payment budgets
+
+    Returns
+    -------
+    np.ndarray
+        Borrowable principals
+
+    Notes
+    -----
+    Scalars and arrays are accepted, array inputs are broadcast together.
+
+    Examples
+    --------
+    >>> round(float(compute_max_capital(0.05, 360, 1000.0)), 2)
+    186281.62
+    """
+    monthly_rate = _convert_prop_rate(np.asarray(annual_rate, dtype=np.float64), 12)
+    return _capital_per_period(monthly_rate, month_number, monthly_installment)
+
+
+def compute_required_duration(
+    annual_rate: np.ndarray, initial_capital: np.ndarray, monthly_installment: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the number of months needed to repay a principal with a monthly budget.
+
+    Parameters
+    ----------
+    annual_rate : np.ndarray
+        Annual interest rates (as decimals, e.g., 0.05 for 5%)
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+    monthly_installment : np.ndarray
+        Monthly payment budgets
+
+    Returns
+    -------
+    np.ndarray
+        Whole numbers of months (rounded up, so the actual installment does not
+        exceed the budget), as floats. Infinite where the budget does not even
+        cover the first month of interest.
+
+    Examples
+    --------
+    >>> float(compute_required_duration(0.05, 200000, 1100.0))
+    341.0
+    """
+    monthly_rate = _convert_prop_rate(np.asarray(annual_rate, dtype=np.float64), 12)
+    period_number = _period_number_for_installment(monthly_rate, initial_capital, monthly_installment)
+
+    # Tolerate float noise so an exact fit is not pushed to the next month
+    return np.ceil(period_number - 1e-6)
+
+
+def compute_implied_rate(
+    month_number: np.ndarray, initial_capital: np.ndarray, monthly_installment: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the nominal annual rate for which a loan has a given monthly installment.
+
+    Parameters
+    ----------
+    month_number : np.ndarray
+        Total numbers of monthly payments
+    initial_capital : np.ndarray
+        Principal amounts of the loans
+    monthly_installment : np.ndarray
+        Monthly payments
+
+    Returns
+    -------
+    np.ndarray
+        Annual rates (as decimals), NaN where the installments do not repay the principal
+
+    Examples
+    --------
+    >>> round(float(compute_implied_rate(360, 200000, 1073.64)), 5)
+    0.05
+    """
+    return _period_rate_for_installment(month_number, initial_capital, monthly_installment) * 12
+
+
+def _discounted_sum_and_derivative(rate: float, month_number: int) -> tuple[float, float]:
+    """
+    Compute the sum of rate powers and its derivative in closed form.
+
+    Parameters
+    ----------
+    rate : float
+        The discount rate (scalars or NumPy arrays are accepted)
+    month_number : int
+        Total number of monthly payments (scalars or NumPy arrays are accepted)
+
+    Returns
+    -------
+    tuple[float, float]
+        (sum of rate^k for k in 1..n, sum of k * rate^(k-1) for k in 1..n)
+
+    Notes
+    -----
+    Uses the geometric series closed forms:
+    S(r) = r * (1 - r^n) / (1 - r)
+    S'(r) = (1 + S(r) - (n + 1) * r^n) / (1 - r)
+    so the cost does not depend on the number of months. Both expressions are 0 / 0
+    at r = 1, a first order expansion around 1 is used in a small neighbourhood instead.
+    """
+    rate_power_n = rate**month_number
+    one_minus_rate = 1 - rate
+
+    # Closed forms are singular at rate == 1, swap in the Taylor expansion there
+    near_one = np.abs(one_minus_rate) < 1e-8
+    safe_one_minus_rate = np.where(near_one, 1.0, one_minus_rate)
+
+    half_triangle = month_number * (month_number + 1) / 2
+    sum_powers = np.where(
+        near_one,
+        month_number - one_minus_rate * half_triangle,
+        rate * (1 - rate_power_n) / safe_one_minus_rate,
+    )
+    derivative = np.where(
+        near_one,
+        half_triangle - one_minus_rate * half_triangle * (month_number - 1) * 2 / 3,
+        (1 + sum_powers - (month_number + 1) * rate_power_n) / safe_one_minus_rate,
+    )
+
+    return sum_powers, derivative
+
+
+def _discounted_sum_and_derivative_scalar(rate: float, month_number: int) -> tuple[float, float]:
+    """
+    Pure Python version of `_discounted_sum_and_derivative` for a single rate.
+
+    Parameters
+    ----------
+    rate : float
+        The discount rate
+    month_number : int
+        Total number of monthly payments
+
+    Returns
+    -------
+    tuple[float, float]
+        (sum of rate^k for k in 1..n, sum of k * rate^(k-1) for k in 1..n)
+    """
+    one_minus_rate = 1 - rate
+    half_triangle = month_number * (month_number + 1) / 2
+
+    # Closed forms are singular at rate == 1, use the Taylor expansion there
+    if abs(one_minus_rate) < 1e-8:
+        sum_powers = month_number - one_minus_rate * half_triangle
+        derivative = half_triangle - one_minus_rate * half_triangle * (month_number - 1) * 2 / 3
+        return sum_powers, derivative
+
+    rate_power_n = rate**month_number
+    sum_powers = rate * (1 - rate_power_n) / one_minus_rate
+    derivative = (1 + sum_powers - (month_number + 1) * rate_power_n) / one_minus_rate
+    return sum_powers, derivative
+
+
 def _create_taeg_objective_function(
     month_number: int, full_installments: float, initial_cost: float, initial_capital: float
 ) -> Callable[[float], tuple[float, float]]:
@@ -168,21 +487,14 @@ def _create_taeg_objective_function(
         tuple[float, float]
             (function_value, derivative_value)
         """
-        # Create arrays for efficient calculation
-        pow_array = np.arange(1, month_number + 1)
-        deriv_pow = np.arange(0, month_number)
-
-        # Calculate rate raised to different powers
-        rate_array = np.power(rate, pow_array)
-
-        # Calculate sum of installments discounted at the given rate
-        sum_installs = np.sum(full_installments * rate_array)
+        # Closed form sums, constant cost whatever the loan duration
+        sum_powers, sum_derivative = _discounted_sum_and_derivative_scalar(rate, month_number)
 
         # Calculate function value (should be zero at the correct rate)
-        value = initial_cost - initial_capital + sum_installs
+        value = initial_cost - initial_capital + full_installments * sum_powers
 
         # Calculate derivative for more efficient optimization
-        derivative = full_installments * np.sum(pow_array * np.power(rate, deriv_pow))
+        derivative = full_installments * sum_derivative
 
         return value, derivative
 
@@ -228,6 +540,168 @@ def _convert_monthly_to_annual_rate(monthly_rate: float) -> float:
     return (1 / monthly_rate) ** 12 - 1
 
 
+class _RootResult(NamedTuple):
+    """
+    Outcome of a scalar root finding, with the attributes of scipy's RootResults used here.
+    """
+
+    root: float
+    iterations: int
+    function_calls: int
+    converged: bool
+
+
+def _newton_scalar(
+    objective: Callable[[float], tuple[float, float]], x0: float, xtol: float = 1e-7, maxiter: int = 50
+) -> _RootResult:
+    """
+    Find a root with Newton's method in pure Python.
+
+    Parameters
+    ----------
+    objective : Callable[[float], tuple[float, float]]
+        Function returning (function_value, derivative_value)
+    x0 : float
+        Starting point
+    xtol : float, optional
+        Absolute step tolerance, by default 1e-7
+    maxiter : int, optional
+        Maximum number of iterations, by default 50
+
+    Returns
+    -------
+    _RootResult
+        Last iterate, iteration count and convergence flag. A zero derivative
+        or an overflow stops the iterations as not converged, so the caller
+        can fall back to another solver.
+    """
+    rate = x0
+    for iteration in range(1, maxiter + 1):
+        # A diverging iterate can overflow the powers of the rate, report it as a failed solve
+        try:
+            value, derivative = objective(rate)
+            step = value / derivative
+        except (ZeroDivisionError, OverflowError):
+            return _RootResult(rate, iteration, iteration, False)
+
+        rate -= step
+        if abs(step) < xtol:
+            return _RootResult(rate, iteration, iteration, True)
+
+    return _RootResult(rate, maxiter, maxiter, False)
+
+
+def _root_scalar_scipy(objective: Callable[[float], tuple[float, float]], x0: float) -> _RootResult:
+    """
+    Find a root with scipy's root_scalar, importing SciPy on first use.
+
+    Parameters
+    ----------
+    objective : Callable[[float], tuple[float, float]]
+        Function returning (function_value, derivative_value)
+    x0 : float
+        Starting point
+
+    Returns
+    -------
+    _RootResult
+        Root, iteration count and convergence flag reported by SciPy
+    """
+    import scipy.optimize as optimize
+
+    taeg_optim = optimize.root_scalar(objective, x0=x0, xtol=1e-7, fprime=True)
+    return _RootResult(taeg_optim.root, taeg_optim.iterations, taeg_optim.function_calls, taeg_optim.converged)
+
+
+def _add_root_work(previous: _RootResult, retry: _RootResult) -> _RootResult:
+    """
+    Combine a failed root finding with the retry that followed it.
+
+    Parameters
+    ----------
+    previous : _RootResult
+        Result of the attempt that did not converge
+    retry : _RootResult
+        Result of the next attempt
+
+    Returns
+    -------
+    _RootResult
+        Root and convergence flag of the retry, with the iteration and function
+        call counts of both attempts
+    """
+    return retry._replace(
+        iterations=previous.iterations + retry.iterations,
+        function_calls=previous.function_calls + retry.function_calls,
+    )
+
+
+@profiled("compute_taeg")
+def _solve_taeg(
+    month_number: int, full_installments: float, initial_cost: float, initial_capital: float, x0: float = 0.99
+) -> _RootResult:
+    """
+    Run the root finding on the TAEG objective function.
+
+    Parameters
+    ----------
+    month_number : int
+        Total number of monthly payments
+    full_installments : float
+        The average monthly payment including all costs
+    initial_cost : float
+        Upfront fees paid at loan origination
+    initial_capital : float
+        Principal amount of the loan
+    x0 : float, optional
+        Starting monthly discount rate, by default 0.99
+
+    Returns
+    -------
+    _RootResult
+        The solver result, holding the monthly discount rate and iteration counts,
+        summed over every attempt when a retry or the fallback ran
+
+    Notes
+    -----
+    A pure Python Newton method runs first, so pricing a single loan does not
+    need SciPy at all. When a warm start does not converge, Newton is run again
+    from the cold start x0=0.99. SciPy's root_scalar is only imported and used
+    as a last fallback, from the cold start, when Newton does not converge.
+    """
+    # Create the objective function for optimization
+    taeg_objective = _create_taeg_objective_function(month_number, full_installments, initial_cost, initial_capital)
+
+    # Timing only happens when someone listens
+    start_time = time.perf_counter() if _solve_observers else 0.0
+
+    # Find the rate that makes the objective function zero
+    taeg_optim = _newton_scalar(taeg_objective, x0)
+    # A warm start on the far side of the root can diverge where the cold start converges
+    if not taeg_optim.converged and x0 != 0.99:
+        taeg_optim = _add_root_work(taeg_optim, _newton_scalar(taeg_objective, 0.99))
+    if not taeg_optim.converged:
+        taeg_optim = _add_root_work(taeg_optim, _root_scalar_scipy(taeg_objective, 0.99))
+
+    if _solve_observers:
+        _notify_solve(
+            SolveRecord(
+                month_number=month_number,
+                full_installments=full_installments,
+                initial_cost=initial_cost,
+                initial_capital=initial_capital,
+                root=taeg_optim.root,
+                iterations=taeg_optim.iterations,
+                function_calls=taeg_optim.function_calls,
+                converged=taeg_optim.converged,
+                residual=taeg_objective(taeg_optim.root)[0],
+                wall_time=time.perf_counter() - start_time,
+            )
+        )
+
+    return taeg_optim
+
+
 def compute_taeg(
     month_number: int, total_cost: float, initial_cost: float, initial_capital: float
 ) -> tuple[float, float]:
@@ -256,7 +730,7 @@ def compute_taeg(
     -----
     This function uses numerical optimization to find the effective rate that
     satisfies the NPV equation for the loan. The optimization uses a root-finding
-    algorithm with analytical derivatives for efficiency.
+    algorithm with analytical derivatives for efficiency, see `_solve_taeg`.
 
     The starting point for optimization (x0=0.99) is chosen to be near 1 to
     ensure proper convergence of the algorithm for typical loan rates.
@@ -272,16 +746,8 @@ def compute_taeg(
     # Calculate average monthly installment
     full_installments = _calculate_average_installment(total_reimbursed, initial_cost, month_number)
 
-    # Create the objective function for optimization
-    taeg_objective = _create_taeg_objective_function(month_number, full_installments, initial_cost, initial_capital)
-
-    # Find the rate that makes the objective function zero
-    taeg_optim = optimize.root_scalar(
-        taeg_objective,
-        x0=0.99,  # Starting near 1 for convergence
-        xtol=1e-7,
-        fprime=True,
-    )
+    # Find the rate that makes the objective function zero, starting near 1 for convergence
+    taeg_optim = _solve_taeg(month_number, full_installments, initial_cost, initial_capital, x0=0.99)
 
     # Convert the monthly rate to an annual rate
     taeg = _convert_monthly_to_annual_rate(taeg_optim.root)
@@ -289,6 +755,82 @@ def compute_taeg(
     return float(taeg), full_installments
 
 
+def compute_taeg_pair(
+    month_number: int,
+    total_cost: float,
+    total_cost_no_insurance: float,
+    initial_cost: float,
+    initial_capital: float,
+) -> TaegPair:
+    """
+    Calculate the TAEG with and without insurance in one shared solve.
+
+    Parameters
+    ----------
+    month_number : int
+        Total number of monthly payments
+    total_cost : float
+        Total cost of the loan including all expenses
+    total_cost_no_insurance : float
+        Total cost of the loan excluding insurance
+    initial_cost : float
+        Upfront fees paid at loan origination
+    initial_capital : float
+        Principal amount of the loan
+
+    Returns
+    -------
+    TaegPair
+        Both rates, the average full installment and the iteration count of each solve
+
+    Notes
+    -----
+    Both objectives share month_number, initial_cost and initial_capital and only
+    differ by the installment, so their roots are close. The solve without insurance
+    is warm-started from the full TAEG root: its first Newton step is then the first
+    order correction for the installment difference, and it usually needs a couple
+    of iterations where the cold solve from x0=0.99 needs five or more. When the
+    insurance is large compared with the capital the full root is far from the other
+    one and the warm start can diverge, the solve is then retried cold.
+
+    Examples
+    --------
+    The warm-started rate matches the cold solve, even with a large insurance cost:
+
+    >>> pair = compute_taeg_pair(240, 8000.0, 0.0, 0.0, 1000.0)
+    >>> cold_taeg, _ = compute_taeg(240, 0.0, 0.0, 1000.0)
+    >>> abs(pair.taeg_no_insurance - cold_taeg) < 1e-9
+    True
+    >>> round(pair.full_taeg - pair.taeg_no_insurance, 4)
+    0.5554
+    """
+    full_installments = _calculate_average_installment(total_cost + initial_capital, initial_cost, month_number)
+    installments_no_insurance = _calculate_average_installment(
+        total_cost_no_insurance + initial_capital, initial_cost, month_number
+    )
+
+    # Cold solve for the full TAEG
+    full_optim = _solve_taeg(month_number, full_installments, initial_cost, initial_capital, x0=0.99)
+    full_taeg = float(_convert_monthly_to_annual_rate(full_optim.root))
+
+    # Without insurance both objectives are identical, otherwise warm start from the full TAEG root
+    if installments_no_insurance == full_installments:
+        return TaegPair(full_taeg, full_taeg, full_installments, full_optim.iterations, 0)
+
+    no_insurance_optim = _solve_taeg(
+        month_number, installments_no_insurance, initial_cost, initial_capital, x0=full_optim.root
+    )
+
+    return TaegPair(
+        full_taeg=full_taeg,
+        taeg_no_insurance=float(_convert_monthly_to_annual_rate(no_insurance_optim.root)),
+        full_installments=full_installments,
+        full_iterations=full_optim.iterations,
+        no_insurance_iterations=no_insurance_optim.iterations,
+    )
+
+
+@profiled("compute_all_quantities")
 def compute_all_quantities(loan_inputs: LoanInputs) -> LoanResult:
     """
     Compute all quantities related to a loan.
@@ -332,12 +874,13 @@ def compute_all_quantities(loan_inputs: LoanInputs) -> LoanResult:
     total_cost_no_insurance = total_interests + initial_cost
     total_cost = total_cost_no_insurance + insurance_cost
 
-    # Calculate TAEG with and without insurance
-    full_taeg, full_installments = compute_taeg(month_number, total_cost, initial_cost, initial_capital)
-    taeg_no_insurance, _ = compute_taeg(month_number, total_cost_no_insurance, initial_cost, initial_capital)
+    # Calculate TAEG with and without insurance in one shared solve
+    taeg_pair = compute_taeg_pair(month_number, total_cost, total_cost_no_insurance, initial_cost, initial_capital)
+    full_taeg = taeg_pair.full_taeg
+    full_installments = taeg_pair.full_installments
 
     # Calculate insurance effective rate
-    taea = full_taeg - taeg_no_insurance
+    taea = full_taeg - taeg_pair.taeg_no_insurance
 
     # Return all results
     return LoanResult(
@@ -0,0 +1,393 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from .batch_functions import _as_input_columns, _installment_per_period_batch
+from .common_objects import ExactLoanResult, ExactSchedule, LoanInputs, LoanInputsBatch
+from .core_functions import _convert_monthly_to_annual_rate, _discounted_sum_and_derivative
+
+# Annual rates are handled as integer multiples of 1e-8, i.e. a millionth of a percent
+RATE_SCALE = 10**8
+
+# Monthly interest in cents is balance * rate units / _MONTHLY_RATE_SCALE, rounded half up
+_MONTHLY_RATE_SCALE = 12 * RATE_SCALE
+
+# Largest balance * rate units product for which the rounding numerator still fits in int64
+_MAX_INTEREST_PRODUCT = (np.iinfo(np.int64).max - _MONTHLY_RATE_SCALE) // 2
+
+
+def to_cents(amounts: float | np.ndarray) -> np.ndarray:
+    """
+    Convert amounts in euros to int64 cents, rounding halves away from zero.
+
+    Parameters
+    ----------
+    amounts : float | np.ndarray
+        Amounts in euros
+
+    Returns
+    -------
+    np.ndarray
+        Amounts in cents, as int64
+
+    Notes
+    -----
+    Binary noise is removed before rounding (amounts are first rounded to a
+    millionth of a cent), so 0.285 gives 29 cents although 0.285 * 100 is
+    28.499999999999996 in floating point.
+
+    Examples
+    --------
+    >>> to_cents(np.array([0.285, 1234.565, -0.005]))
+    array([    29, 123457,     -1])
+    """
+    cents = np.round(np.asarray(amounts, dtype=np.float64) * 100, 6)
+    return (np.sign(cents) * np.floor(np.abs(cents) + 0.5)).astype(np.int64)
+
+
+def _rate_units(annual_rate: np.ndarray) -> np.ndarray:
+    """
+    Convert annual rates to integer multiples of 1 / RATE_SCALE.
+
+    Parameters
+    ----------
+    annual_rate : np.ndarray
+        Annual interest rates (as decimals)
+
+    Returns
+    -------
+    np.ndarray
+        Rates in units of 1e-8, as int64
+
+    Raises
+    ------
+    ValueError
+        If a rate is negative
+    """
+    rate_units = np.rint(np.asarray(annual_rate, dtype=np.float64) * RATE_SCALE).astype(np.int64)
+    if (rate_units < 0).any():
+        raise ValueError("Cent-exact schedules need non-negative rates")
+    return rate_units
+
+
+def _rounded_installment(capital: np.ndarray, rate_units: np.ndarray, month_number: np.ndarray) -> np.ndarray:
+    """
+    Constant installment of the contract, rounded half up to the cent.
+
+    Parameters
+    ----------
+    capital : np.ndarray
+        Principals in cents
+    rate_units : np.ndarray
+        Annual rates in units of 1 / RATE_SCALE
+    month_number : np.ndarray
+        Total numbers of monthly payments
+
+    Returns
+    -------
+    np.ndarray
+        Installments in cents, as int64
+    """
+    monthly_rate = rate_units / _MONTHLY_RATE_SCALE
+    installment = _installment_per_period_batch(monthly_rate, month_number, capital.astype(np.float64))
+    return np.floor(np.round(installment, 6) + 0.5).astype(np.int64)
+
+
+def _last_installments(
+    capital: np.ndarray, rate_units: np.ndarray, installment: np.ndarray, month_number: np.ndarray
+) -> np.ndarray:
+    """
+    Run the cent-exact balance recurrence of many loans and return their last installment.
+
+    Parameters
+    ----------
+    capital : np.ndarray
+        Principals in cents
+    rate_units : np.ndarray
+        Annual rates in units of 1 / RATE_SCALE
+    installment : np.ndarray
+        Constant installments in cents
+    month_number : np.ndarray
+        Total numbers of monthly payments
+
+    Returns
+    -------
+    np.ndarray
+        Last installments in cents: the balance due before the last month plus its interest
+
+    Notes
+    -----
+    Each month, interest = (2 * balance * rate units + D) // (2 * D) with
+    D = 12 * RATE_SCALE, which is balance * monthly rate rounded half up, then
+    balance -= installment - interest. The loop runs over months and every step
+    is a few in-place int64 operations over all loans. Loans are sorted by
+    decreasing duration, so the loans still running at a given month are a
+    prefix of the arrays and are updated through slices instead of masks.
+    """
+    order = np.argsort(-month_number, kind="stable")
+    balance = capital[order]
+    double_rate_units = 2 * rate_units[order]
+    sorted_installment = installment[order]
+    sorted_month_number = month_number[order]
+    buffer = np.empty_like(balance)
+
+    # Number of loans with more than k months, for k = 0 .. longest duration - 1
+    longest = int(sorted_month_number[0]) if balance.size else 0
+    running = np.searchsorted(-sorted_month_number, -np.arange(longest), side="left")
+
+    # Regular installments of months 1 .. n - 1
+    for month in range(1, longest):
+        count = running[month]
+        interest = buffer[:count]
+        np.multiply(balance[:count], double_rate_units[:count], out=interest)
+        interest += _MONTHLY_RATE_SCALE
+        interest //= 2 * _MONTHLY_RATE_SCALE
+        interest -= sorted_installment[:count]
+        balance[:count] += interest
+
+    # The last installment repays the remaining balance and its interest
+    last_interest = (balance * double_rate_units + _MONTHLY_RATE_SCALE) // (2 * _MONTHLY_RATE_SCALE)
+    last_installment = np.empty_like(balance)
+    last_installment[order] = balance + last_interest
+    return last_installment
+
+
+def _solve_exact_taeg(
+    month_number: np.ndarray,
+    payment: np.ndarray,
+    last_payment: np.ndarray,
+    net_capital: np.ndarray,
+    x0: float | np.ndarray = 0.99,
+    xtol: float = 1e-7,
+    maxiter: int = 50,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Solve the discount factors of schedules with constant payments and a different last one.
+
+    Parameters
+    ----------
+    month_number : np.ndarray
+        Total numbers of monthly payments
+    payment : np.ndarray
+        Payment of months 1 to n - 1
+    last_payment : np.ndarray
+        Payment of month n
+    net_capital : np.ndarray
+        Capital received at month 0, net of initial costs
+    x0 : float | np.ndarray, optional
+        Starting discount factor(s), by default 0.99 like `compute_taeg`
+    xtol : float, optional
+        Absolute step tolerance, by default 1e-7 like `compute_taeg`
+    maxiter : int, optional
+        Maximum number of Newton iterations, by default 50
+
+    Returns
+    -------
+    roots : np.ndarray
+        Monthly discount factors v solving
+        payment * (v + ... + v^(n-1)) + last_payment * v^n = net_capital
+    converged : np.ndarray
+        Boolean mask, True where the step went below `xtol`
+
+    Notes
+    -----
+    Exactly the cash flows of the rounded schedule, yet the geometric series
+    closed form of `_discounted_sum_and_derivative` still applies to the n - 1
+    equal payments, so one Newton iteration stays O(1) per loan.
+    """
+    roots = np.array(np.broadcast_to(x0, month_number.shape), dtype=np.float64)
+    active = np.arange(month_number.size)
+
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+
+        rate = roots[active]
+        periods = month_number[active]
+        sum_powers, sum_derivative = _discounted_sum_and_derivative(rate, periods - 1)
+        rate_power = rate ** (periods - 1)
+
+        value = payment[active] * sum_powers + last_payment[active] * rate_power * rate - net_capital[active]
+        slope = payment[active] * sum_derivative + periods * last_payment[active] * rate_power
+        step = value / slope
+
+        roots[active] -= step
+        active = active[~(np.abs(step) < xtol)]
+
+    converged = np.ones(month_number.shape, dtype=bool)
+    converged[active] = False
+    return roots, converged
+
+
+def compute_exact_schedule(loan_inputs: LoanInputs) -> ExactSchedule:
+    """
+    Compute the cent-exact amortization schedule of a loan, as printed on a contract.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs
+        A named tuple containing all input parameters for the loan
+
+    Returns
+    -------
+    ExactSchedule
+        A named tuple of int64 arrays in cents, one entry per period
+
+    Notes
+    -----
+    The installment is rounded to the cent, each interest line is the balance
+    times the monthly rate rounded half up to the cent, and the last
+    installment repays whatever balance is left. Monthly insurance is the total
+    insurance truncated to the cent, the last month taking the remainder. Same
+    arithmetic as `compute_exact_quantities_batch`, one Python integer step per month.
+
+    Examples
+    --------
+    >>> schedule = compute_exact_schedule(LoanInputs(1200, 0.12, 12, insurance_cost=100))
+    >>> schedule.installment[[0, -1]], schedule.interest[[0, -1]], schedule.insurance[[0, -1]]
+    (array([10662, 10660]), array([1200,  106]), array([833, 837]))
+    >>> int(schedule.principal.sum()), int(schedule.remaining_balance[-1])
+    (120000, 0)
+    """
+    month_number = int(loan_inputs.month_number)
+    if month_number < 1:
+        raise ValueError("month_number must be at least 1")
+
+    capital = int(to_cents(loan_inputs.initial_capital))
+    rate_units = int(_rate_units(loan_inputs.annual_rate))
+    installment = int(_rounded_installment(np.int64(capital), np.int64(rate_units), np.int64(month_number)))
+    insurance = int(to_cents(loan_inputs.insurance_cost))
+
+    columns = np.zeros((5, month_number), dtype=np.int64)
+    installments, interests, principals, balances, insurances = columns
+    balance = capital
+    for month in range(month_number):
+        interest = (2 * balance * rate_units + _MONTHLY_RATE_SCALE) // (2 * _MONTHLY_RATE_SCALE)
+        principal = balance if month == month_number - 1 else installment - interest
+        balance -= principal
+        installments[month], interests[month], principals[month], balances[month] = (
+            interest + principal,
+            interest,
+            principal,
+            balance,
+        )
+
+    insurances[:] = insurance // month_number
+    insurances[-1] = insurance - (month_number - 1) * (insurance // month_number)
+
+    return ExactSchedule(np.arange(1, month_number + 1), installments, interests, principals, balances, insurances)
+
+
+def compute_exact_quantities_batch(
+    loan_inputs: LoanInputs | LoanInputsBatch | np.ndarray | Sequence[LoanInputs],
+) -> ExactLoanResult:
+    """
+    Compute cent-exact contract figures and TAEG for a batch of loans.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs | LoanInputsBatch | np.ndarray | Sequence[LoanInputs]
+        Loans in any form accepted by `compute_all_quantities_batch`
+
+    Returns
+    -------
+    ExactLoanResult
+        A named tuple where each field is an array with one entry per loan,
+        int64 cents for amounts and float64 for rates
+
+    Raises
+    ------
+    ValueError
+        If a duration is not positive, a rate is negative, or a capital is too
+        large for the int64 interest arithmetic
+    RuntimeError
+        If the TAEG solve fails to converge for any loan
+
+    Notes
+    -----
+    Amounts are converted to cents and rates to multiples of 1e-8 once, then
+    the schedule of `compute_exact_schedule` is replayed for all loans at once
+    with int64 arithmetic. Only the balance of each loan is kept along the way:
+    every installment but the last is the constant rounded one, so the last
+    installment gives the total interest, (n - 1) * installment + last - capital.
+
+    The TAEG are solved on those exact cash flows, constant payments then a
+    different last one, with and without insurance, the second solve being
+    warm started from the first like `compute_taeg_pair_batch`, and retried
+    from the cold start when that warm start does not converge.
+
+    Examples
+    --------
+    >>> results = compute_exact_quantities_batch(LoanInputs(200000.0, 0.02, 240, 1000.0, 8000.0))
+    >>> int(results.monthly_installment[0]), int(results.last_installment[0]), int(results.total_interests[0])
+    (101177, 101077, 4282380)
+    >>> float(results.full_taeg[0].round(6))
+    0.024293
+    """
+    columns = _as_input_columns(loan_inputs)
+    month_number = columns.month_number
+    if (month_number < 1).any():
+        raise ValueError("month_number must be at least 1")
+
+    capital = to_cents(columns.initial_capital)
+    initial_cost = to_cents(columns.initial_cost)
+    insurance = to_cents(columns.insurance_cost)
+    rate_units = _rate_units(columns.annual_rate)
+    if capital.size and int(np.abs(capital).max()) * int(rate_units.max()) > _MAX_INTEREST_PRODUCT:
+        raise ValueError("Capital too large for cent-exact int64 interest arithmetic")
+
+    installment = _rounded_installment(capital, rate_units, month_number)
+    last_installment = _last_installments(capital, rate_units, installment, month_number)
+    monthly_insurance = insurance // month_number
+    last_insurance = insurance - (month_number - 1) * monthly_insurance
+
+    total_interests = (month_number - 1) * installment + last_installment - capital
+    total_cost_no_insurance = total_interests + initial_cost
+    total_cost = total_cost_no_insurance + insurance
+
+    net_capital = (capital - initial_cost).astype(np.float64)
+    full_roots, full_converged = _solve_exact_taeg(
+        month_number,
+        (installment + monthly_insurance).astype(np.float64),
+        (last_installment + last_insurance).astype(np.float64),
+        net_capital,
+    )
+
+    # Loans without insurance reuse the full root, the others are warm started from it
+    no_insurance_roots = full_roots.copy()
+    no_insurance_converged = full_converged.copy()
+    insured = insurance != 0
+    no_insurance_roots[insured], no_insurance_converged[insured] = _solve_exact_taeg(
+        month_number[insured],
+        installment[insured].astype(np.float64),
+        last_installment[insured].astype(np.float64),
+        net_capital[insured],
+        x0=full_roots[insured],
+    )
+
+    # A warm start on the far side of the root can diverge, retry those loans from the cold start
+    retried = np.flatnonzero(insured & ~no_insurance_converged)
+    if retried.size:
+        no_insurance_roots[retried], no_insurance_converged[retried] = _solve_exact_taeg(
+            month_number[retried],
+            installment[retried].astype(np.float64),
+            last_installment[retried].astype(np.float64),
+            net_capital[retried],
+        )
+
+    failures = np.count_nonzero(~(full_converged & no_insurance_converged))
+    if failures:
+        raise RuntimeError(f"TAEG computation failed to converge for {failures} loan(s)")
+
+    full_taeg = _convert_monthly_to_annual_rate(full_roots)
+    return ExactLoanResult(
+        monthly_installment=installment,
+        last_installment=last_installment,
+        monthly_insurance=monthly_insurance,
+        last_insurance=last_insurance,
+        total_interests=total_interests,
+        total_cost_no_insurance=total_cost_no_insurance,
+        total_cost=total_cost,
+        full_taeg=full_taeg,
+        taea=full_taeg - _convert_monthly_to_annual_rate(no_insurance_roots),
+    )
@@ -0,0 +1,165 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+import numpy as np
+
+from .common_objects import SolveRecord
+
+# Observers called after each TAEG solve, the solvers skip all bookkeeping while it is empty
+_solve_observers: list[Callable[[SolveRecord], None]] = []
+
+
+def add_solve_observer(observer: Callable[[SolveRecord], None]) -> None:
+    """
+    Register a function called with a SolveRecord after every TAEG solve.
+
+    Parameters
+    ----------
+    observer : Callable[[SolveRecord], None]
+        The callback to register
+    """
+    _solve_observers.append(observer)
+
+
+def remove_solve_observer(observer: Callable[[SolveRecord], None]) -> None:
+    """
+    Unregister a solve observer.
+
+    Parameters
+    ----------
+    observer : Callable[[SolveRecord], None]
+        A callback previously given to `add_solve_observer`
+    """
+    _solve_observers.remove(observer)
+
+
+def _notify_solve(record: SolveRecord) -> None:
+    """
+    Send a solve record to every registered observer.
+
+    Parameters
+    ----------
+    record : SolveRecord
+        Description of the solve that just ended
+    """
+    for observer in _solve_observers:
+        observer(record)
+
+
+class SolverStats:
+    """
+    Solve observer accumulating records for later analysis.
+
+    Scalar and batch records are both accepted, and flattened to one entry per loan.
+
+    Examples
+    --------
+    >>> from loan_ranger import LoanInputs, compute_all_quantities
+    >>> with collect_solver_stats() as stats:
+    ...     result = compute_all_quantities(LoanInputs(200000, 0.02, 240, 1000, 8000))
+    >>> stats.summary()["solves"]
+    2
+    """
+
+    def __init__(self):
+        self._records: list[SolveRecord] = []
+
+    def __call__(self, record: SolveRecord) -> None:
+        """
+        Store a solve record.
+
+        Parameters
+        ----------
+        record : SolveRecord
+            Description of the solve that just ended
+        """
+        self._records.append(record)
+
+    def as_arrays(self) -> SolveRecord:
+        """
+        Gather every recorded solve into columns.
+
+        Returns
+        -------
+        SolveRecord
+            A named tuple of 1-D arrays with one entry per solved loan. The wall
+            time of a batch solve is shared evenly between its loans.
+        """
+        columns = {name: [] for name in SolveRecord._fields}
+        for record in self._records:
+            loan_number = np.size(record.root)
+            for name, value in zip(SolveRecord._fields, record, strict=True):
+                if name == "wall_time":
+                    value = np.full(loan_number, value / loan_number)
+                columns[name].append(np.atleast_1d(value))
+
+        return SolveRecord(*(np.concatenate(values) if values else np.empty(0) for values in columns.values()))
+
+    def summary(self, duration_edges: tuple[int, ...] = (0, 60, 120, 240, 360, 481)) -> dict:
+        """
+        Aggregate the recorded solves.
+
+        Parameters
+        ----------
+        duration_edges : tuple[int, ...], optional
+            Month number bucket edges used to split iterations and time by duration
+
+        Returns
+        -------
+        dict
+            Number of solves and failures, an iteration histogram, wall time
+            statistics, the worst residual and per duration bucket iteration means
+            and total time.
+        """
+        records = self.as_arrays()
+        if records.root.size == 0:
+            return {"solves": 0, "failures": 0}
+
+        iteration_counts = np.bincount(records.iterations.astype(np.int64))
+        bucket = np.digitize(records.month_number, duration_edges)
+        by_duration = {}
+        for index in range(1, len(duration_edges)):
+            in_bucket = bucket == index
+            if in_bucket.any():
+                by_duration[f"{duration_edges[index - 1]}-{duration_edges[index] - 1}"] = {
+                    "solves": int(in_bucket.sum()),
+                    "mean_iterations": float(records.iterations[in_bucket].mean()),
+                    "total_wall_time": float(records.wall_time[in_bucket].sum()),
+                }
+
+        return {
+            "solves": int(records.root.size),
+            "failures": int(np.count_nonzero(~records.converged.astype(bool))),
+            "iteration_histogram": {count: int(number) for count, number in enumerate(iteration_counts) if number},
+            "mean_function_calls": float(records.function_calls.mean()),
+            "total_wall_time": float(records.wall_time.sum()),
+            "wall_time_percentiles": dict(
+                zip(("p50", "p90", "p99"), np.percentile(records.wall_time, [50, 90, 99]).tolist(), strict=True)
+            ),
+            "max_abs_residual": float(np.abs(records.residual).max()),
+            "by_duration": by_duration,
+        }
+
+    def clear(self) -> None:
+        """
+        Drop every recorded solve.
+        """
+        self._records.clear()
+
+
+@contextmanager
+def collect_solver_stats() -> Iterator[SolverStats]:
+    """
+    Record every TAEG solve performed inside the `with` block.
+
+    Yields
+    ------
+    SolverStats
+        The collector, registered as solve observer until the block exits
+    """
+    stats = SolverStats()
+    add_solve_observer(stats)
+    try:
+        yield stats
+    finally:
+        remove_solve_observer(stats)
@@ -0,0 +1,340 @@
+import heapq
+from collections.abc import Sequence
+
+import numpy as np
+
+from .batch_functions import _installment_per_period_batch, _price_input_columns, _solve_taeg_newton
+from .common_objects import BorrowerProfile, LoanInputs, LoanResult, Offer, OfferQuote
+from .core_functions import (
+    _calculate_average_installment,
+    _convert_monthly_to_annual_rate,
+    _convert_prop_rate,
+    _solve_taeg,
+)
+
+SEARCH_KEYS = ("total_cost", "full_taeg")
+
+
+def _solve_missed_taeg(loan_columns: LoanInputs, results: LoanResult, converged: np.ndarray) -> np.ndarray:
+    """
+    Solve again with the scalar solver the loans missed by the vectorized pricing.
+
+    Parameters
+    ----------
+    loan_columns : LoanInputs
+        Priced loans, one array entry per loan
+    results : LoanResult
+        Results of `_price_input_columns`, the TAEG and TAEA of the loans solved
+        here are updated in place
+    converged : np.ndarray
+        Convergence mask of `_price_input_columns`
+
+    Returns
+    -------
+    np.ndarray
+        Convergence mask once the scalar solve and its SciPy fallback have run
+    """
+    converged = converged.copy()
+    for position in np.flatnonzero(~converged).tolist():
+        month_number = int(loan_columns.month_number[position])
+        initial_cost = float(loan_columns.initial_cost[position])
+        initial_capital = float(loan_columns.initial_capital[position])
+        installments_no_insurance = _calculate_average_installment(
+            float(results.total_cost_no_insurance[position]) + initial_capital, initial_cost, month_number
+        )
+
+        full_optim = _solve_taeg(
+            month_number, float(results.full_installments[position]), initial_cost, initial_capital
+        )
+        no_insurance_optim = _solve_taeg(month_number, installments_no_insurance, initial_cost, initial_capital)
+        if full_optim.converged and no_insurance_optim.converged:
+            full_taeg = _convert_monthly_to_annual_rate(full_optim.root)
+            results.full_taeg[position] = full_taeg
+            results.taea[position] = full_taeg - _convert_monthly_to_annual_rate(no_insurance_optim.root)
+            converged[position] = True
+
+    return converged
+
+
+class OfferCatalog:
+    """
+    Bank offers prepared once for repeated top-k searches.
+
+    Parameters
+    ----------
+    offers : Sequence[Offer]
+        Offers of the catalog, each one with its own rate grid by duration
+
+    Notes
+    -----
+    Every (offer, duration) point of the rate grids becomes one row. For a
+    given duration, the total cost of a row is affine in the capital:
+    C * (installment per unit of capital * n - 1 + fee_rate + insurance_rate * n / 12) + fixed_fee,
+    so both coefficients are computed when the catalog is built and ranking a
+    client by total cost is one multiply-add per row, no TAEG solve involved.
+
+    For the TAEG, the rows of each duration are sorted by the equivalent
+    annual rate (1 + r / 12)^12 - 1, which is the TAEG without any fee nor
+    insurance and therefore a lower bound of the real TAEG. Rows are solved
+    block by block in that order, the best TAEG so far being kept in a bounded
+    heap, and the search stops as soon as the next lower bound cannot beat
+    the k-th best TAEG.
+
+    Examples
+    --------
+    >>> catalog = OfferCatalog(
+    ...     [
+    ...         Offer("bank_a", {240: 0.030, 300: 0.032}, fixed_fee=1000.0, insurance_rate=0.0030),
+    ...         Offer("bank_b", {240: 0.028}, fee_rate=0.01, insurance_rate=0.0036),
+    ...         Offer("bank_c", {240: 0.031}, fixed_fee=500.0),
+    ...     ]
+    ... )
+    >>> [quote.name for quote in catalog.search(BorrowerProfile(200000.0, 240), k=2, key="full_taeg")]
+    ['bank_c', 'bank_b']
+    """
+
+    def __init__(self, offers: Sequence[Offer]):
+        if not any(offer.rate_grid for offer in offers):
+            raise ValueError("The catalog needs at least one offer with a non-empty rate grid")
+
+        rows = [
+            (index, month_number, annual_rate)
+            for index, offer in enumerate(offers)
+            for month_number, annual_rate in offer.rate_grid.items()
+        ]
+        offer_index, month_number, annual_rate = (np.array(column) for column in zip(*rows, strict=True))
+
+        self.offers = list(offers)
+        self.offer_index = offer_index.astype(np.int64)
+        self.month_number = month_number.astype(np.int64)
+        self.annual_rate = annual_rate.astype(np.float64)
+        self.fixed_fee = np.array([offers[index].fixed_fee for index in offer_index], dtype=np.float64)
+        self.fee_rate = np.array([offers[index].fee_rate for index in offer_index], dtype=np.float64)
+        insurance_rate = np.array([offers[index].insurance_rate for index in offer_index], dtype=np.float64)
+
+        # Installment and total cost per unit of capital, TAEG lower bound of every row
+        monthly_rate = _convert_prop_rate(self.annual_rate, 12)
+        self.unit_installment = _installment_per_period_batch(monthly_rate, self.month_number, 1.0)
+        self.unit_insurance = insurance_rate * self.month_number / 12
+        self.unit_total_cost = self.unit_installment * self.month_number - 1 + self.fee_rate + self.unit_insurance
+        self.taeg_lower_bound = (1 + monthly_rate) ** 12 - 1
+
+        # Rows of each duration, by increasing TAEG lower bound
+        order = np.lexsort((self.taeg_lower_bound, self.month_number))
+        durations, starts = np.unique(self.month_number[order], return_index=True)
+        self._rows_by_duration = dict(zip(durations.tolist(), np.split(order, starts[1:]), strict=True))
+
+    def __len__(self) -> int:
+        return len(self.offers)
+
+    def _loan_columns(self, rows: np.ndarray, initial_capital: float | np.ndarray) -> LoanInputs:
+        """
+        Loan inputs of some rows for given capitals.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            Row indices
+        initial_capital : float | np.ndarray
+            Amount borrowed, one for all rows or one per row
+
+        Returns
+        -------
+        LoanInputs
+            A named tuple of arrays with one entry per row
+        """
+        initial_capital = np.broadcast_to(np.asarray(initial_capital, dtype=np.float64), rows.shape)
+        return LoanInputs(
+            initial_capital=initial_capital,
+            annual_rate=self.annual_rate[rows],
+            month_number=self.month_number[rows],
+            initial_cost=self.fixed_fee[rows] + self.fee_rate[rows] * initial_capital,
+            insurance_cost=self.unit_insurance[rows] * initial_capital,
+        )
+
+    def _best_rows_by_cost(self, rows: np.ndarray, initial_capital: float, k: int) -> np.ndarray:
+        """
+        The k rows of lowest total cost, exact from the affine coefficients.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            Candidate rows, all of the same duration
+        initial_capital : float
+            Amount borrowed
+        k : int
+            Number of rows to keep
+
+        Returns
+        -------
+        np.ndarray
+            Row indices sorted by increasing total cost
+        """
+        total_cost = self.unit_total_cost[rows] * initial_capital + self.fixed_fee[rows]
+        if k < len(rows):
+            kept = np.argpartition(total_cost, k - 1)[:k]
+            rows, total_cost = rows[kept], total_cost[kept]
+        return rows[np.argsort(total_cost, kind="stable")]
+
+    def _best_rows_by_taeg(self, rows: np.ndarray, initial_capital: float, k: int, block_size: int) -> np.ndarray:
+        """
+        The k rows of lowest TAEG, solving as few rows as the lower bounds allow.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            Candidate rows, all of the same duration, sorted by TAEG lower bound
+        initial_capital : float
+            Amount borrowed
+        k : int
+            Number of rows to keep
+        block_size : int
+            Number of rows solved together
+
+        Returns
+        -------
+        np.ndarray
+            Row indices sorted by increasing TAEG, rows whose TAEG cannot be solved are left out
+        """
+        # Max-heap of the k best TAEG so far, as (-taeg, row)
+        best: list[tuple[float, int]] = []
+
+        for start in range(0, len(rows), block_size):
+            if len(best) == k and self.taeg_lower_bound[rows[start]] >= -best[0][0]:
+                break
+
+            block = rows[start : start + block_size]
+            columns = self._loan_columns(block, initial_capital)
+            total_cost = self.unit_total_cost[block] * initial_capital + self.fixed_fee[block]
+            full_installments = _calculate_average_installment(
+                total_cost + initial_capital, columns.initial_cost, columns.month_number
+            )
+            roots, converged, _ = _solve_taeg_newton(
+                columns.month_number, full_installments, columns.initial_cost, columns.initial_capital
+            )
+
+            # Rows missed by the vectorized Newton go through the scalar solve and its SciPy fallback
+            for position in np.flatnonzero(~converged).tolist():
+                taeg_optim = _solve_taeg(
+                    int(columns.month_number[position]),
+                    float(full_installments[position]),
+                    float(columns.initial_cost[position]),
+                    float(columns.initial_capital[position]),
+                )
+                roots[position], converged[position] = taeg_optim.root, taeg_optim.converged
+            taeg = np.where(converged, _convert_monthly_to_annual_rate(roots), np.inf)
+
+            # Only rows beating the current k-th best reach the heap, unsolved rows never do
+            candidates = np.flatnonzero(taeg < (-best[0][0] if len(best) == k else np.inf))
+            for position in candidates[np.argsort(taeg[candidates], kind="stable")].tolist():
+                item = (-float(taeg[position]), int(block[position]))
+                if len(best) < k:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+
+        return np.array([row for _, row in sorted(best, reverse=True)], dtype=np.int64)
+
+    def search(
+        self, profile: BorrowerProfile, k: int = 5, key: str = "total_cost", block_size: int = 256
+    ) -> list[OfferQuote]:
+        """
+        Find the k best offers of the catalog for a client.
+
+        Parameters
+        ----------
+        profile : BorrowerProfile
+            Capital and duration wanted by the client, only offers with that
+            duration in their rate grid are considered
+        k : int, optional
+            Number of offers returned, by default 5
+        key : str, optional
+            Ranking criterion, "total_cost" or "full_taeg", by default "total_cost"
+        block_size : int, optional
+            Number of offers whose TAEG is solved together when ranking by TAEG, by default 256
+
+        Returns
+        -------
+        list[OfferQuote]
+            At most k priced offers, best first
+
+        Raises
+        ------
+        ValueError
+            If the key is unknown or k is not positive
+        """
+        return self.search_batch([profile], k=k, key=key, block_size=block_size)[0]
+
+    def search_batch(
+        self, profiles: Sequence[BorrowerProfile], k: int = 5, key: str = "total_cost", block_size: int = 256
+    ) -> list[list[OfferQuote]]:
+        """
+        Find the k best offers of the catalog for many clients.
+
+        Parameters
+        ----------
+        profiles : Sequence[BorrowerProfile]
+            Capital and duration wanted by each client
+        k : int, optional
+            Number of offers returned per client, by default 5
+        key : str, optional
+            Ranking criterion, "total_cost" or "full_taeg", by default "total_cost"
+        block_size : int, optional
+            Number of offers whose TAEG is solved together when ranking by TAEG, by default 256
+
+        Returns
+        -------
+        list[list[OfferQuote]]
+            For each client, at most k priced offers, best first
+
+        Raises
+        ------
+        ValueError
+            If the key is unknown or k is not positive
+
+        Notes
+        -----
+        The catalog precomputations are shared by all clients. The selected
+        offers of every client are priced together by one vectorized call at
+        the end. Offers missed by that call are solved again one by one, and
+        those whose TAEG still cannot be solved are left out of the results.
+        """
+        if key not in SEARCH_KEYS:
+            raise ValueError(f"key must be one of {SEARCH_KEYS}, got {key!r}")
+        if k < 1:
+            raise ValueError("k must be at least 1")
+
+        empty = np.empty(0, dtype=np.int64)
+        selected = []
+        for profile in profiles:
+            rows = self._rows_by_duration.get(int(profile.month_number), empty)
+            if key == "total_cost":
+                selected.append(self._best_rows_by_cost(rows, profile.initial_capital, k))
+            else:
+                selected.append(self._best_rows_by_taeg(rows, profile.initial_capital, k, block_size))
+
+        # Price every selected offer of every client in one batch
+        capital = np.repeat([float(profile.initial_capital) for profile in profiles], [len(rows) for rows in selected])
+        all_rows = np.concatenate([empty, *selected])
+        loan_columns = self._loan_columns(all_rows, capital)
+        results, converged = _price_input_columns(loan_columns)
+        if not converged.all():
+            converged = _solve_missed_taeg(loan_columns, results, converged)
+
+        quotes = [
+            OfferQuote(
+                self.offers[self.offer_index[row]].name,
+                LoanInputs(*(column[position].item() for column in loan_columns)),
+                LoanResult(*(column[position].item() for column in results)),
+            )
+            if converged[position]
+            else None
+            for position, row in enumerate(all_rows.tolist())
+        ]
+
+        grouped = []
+        start = 0
+        for rows in selected:
+            grouped.append([quote for quote in quotes[start : start + len(rows)] if quote is not None])
+            start += len(rows)
+        return grouped
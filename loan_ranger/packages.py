@@ -0,0 +1,258 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from .batch_functions import _installment_per_period_batch
+from .cash_flows import _solve_discount_factor_chunked
+from .common_objects import PackageResult, Tranche
+from .core_functions import _convert_monthly_to_annual_rate, _convert_prop_rate
+
+
+def _tranche_columns(packages: Sequence[Sequence[Tranche]]) -> tuple[np.ndarray, ...]:
+    """
+    Flatten packages of tranches into one column per tranche attribute.
+
+    Parameters
+    ----------
+    packages : Sequence[Sequence[Tranche]]
+        Tranches of every package, each package holding at least one tranche
+
+    Returns
+    -------
+    tuple[np.ndarray, ...]
+        initial_capital, annual_rate, month_number, initial_cost, insurance_cost,
+        start_month and deferred_months of every tranche, followed by the index
+        of the first tranche of each package
+
+    Raises
+    ------
+    ValueError
+        If a package has no tranche
+    """
+    tranche_numbers = np.fromiter((len(tranches) for tranches in packages), dtype=np.int64, count=len(packages))
+    if (tranche_numbers == 0).any():
+        raise ValueError("Every package needs at least one tranche")
+
+    rows = [
+        (*tranche.loan_inputs, tranche.start_month, tranche.deferred_months)
+        for tranches in packages
+        for tranche in tranches
+    ]
+    columns = np.array(rows, dtype=np.float64).reshape(-1, 7).T
+    month_number, start_month, deferred_months = columns[[2, 5, 6]].astype(np.int64)
+
+    first_tranche = np.zeros(len(packages), dtype=np.int64)
+    np.cumsum(tranche_numbers[:-1], out=first_tranche[1:])
+
+    return columns[0], columns[1], month_number, columns[3], columns[4], start_month, deferred_months, first_tranche
+
+
+def _package_cash_flows(
+    initial_capital: np.ndarray,
+    annual_rate: np.ndarray,
+    month_number: np.ndarray,
+    initial_cost: np.ndarray,
+    insurance_cost: np.ndarray,
+    start_month: np.ndarray,
+    deferred_months: np.ndarray,
+    first_tranche: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the merged monthly cash flows of packages from their tranche columns.
+
+    Parameters
+    ----------
+    initial_capital, annual_rate, month_number, initial_cost, insurance_cost : np.ndarray
+        LoanInputs fields of every tranche
+    start_month, deferred_months : np.ndarray
+        Tranche fields of every tranche
+    first_tranche : np.ndarray
+        Index of the first tranche of each package, tranches of a package being contiguous
+
+    Returns
+    -------
+    disbursements : np.ndarray
+        Capital received net of upfront fees, one row per package and one column per month
+    payments : np.ndarray
+        Interest and principal paid, same shape
+    insurance : np.ndarray
+        Insurance paid, same shape
+    lengths : np.ndarray
+        Number of months of each package, signing month included
+    """
+    monthly_rate = _convert_prop_rate(annual_rate, 12)
+    installment = _installment_per_period_batch(monthly_rate, month_number, initial_capital)
+    payment_number = deferred_months + month_number
+    tranche_end = start_month + payment_number
+
+    # Month of each column relative to the disbursement of each tranche
+    local_month = np.arange(tranche_end.max() + 1) - start_month[:, np.newaxis]
+    deferred = (local_month >= 1) & (local_month <= deferred_months[:, np.newaxis])
+    amortizing = (local_month > deferred_months[:, np.newaxis]) & (local_month <= payment_number[:, np.newaxis])
+
+    disbursements = np.where(local_month == 0, (initial_capital - initial_cost)[:, np.newaxis], 0.0)
+    payments = np.where(deferred, (initial_capital * monthly_rate)[:, np.newaxis], 0.0)
+    payments += np.where(amortizing, installment[:, np.newaxis], 0.0)
+    insurance = np.where(deferred | amortizing, (insurance_cost / payment_number)[:, np.newaxis], 0.0)
+
+    # Tranches of a package are contiguous rows, summed in one pass per quantity
+    return (
+        np.add.reduceat(disbursements, first_tranche, axis=0),
+        np.add.reduceat(payments, first_tranche, axis=0),
+        np.add.reduceat(insurance, first_tranche, axis=0),
+        np.maximum.reduceat(tranche_end, first_tranche) + 1,
+    )
+
+
+def _price_packages(columns: tuple[np.ndarray, ...]) -> PackageResult:
+    """
+    Price packages given as tranche columns, see `_tranche_columns`.
+
+    Parameters
+    ----------
+    columns : tuple[np.ndarray, ...]
+        Tranche columns followed by the index of the first tranche of each package
+
+    Returns
+    -------
+    PackageResult
+        A named tuple where each field is an array with one entry per package
+    """
+    initial_capital, initial_cost, first_tranche = columns[0], columns[3], columns[-1]
+    disbursements, payments, insurance, lengths = _package_cash_flows(*columns)
+
+    flows_no_insurance = disbursements - payments
+    full_flows = flows_no_insurance - insurance
+
+    full_roots = _solve_discount_factor_chunked(full_flows, lengths)
+
+    # Packages without insurance reuse the full root, the others are warm started from it
+    no_insurance_roots = full_roots.copy()
+    insured = insurance.any(axis=1)
+    no_insurance_roots[insured] = _solve_discount_factor_chunked(
+        flows_no_insurance[insured], lengths[insured], x0=full_roots[insured]
+    )
+
+    full_taeg = _convert_monthly_to_annual_rate(full_roots)
+    total_cost_no_insurance = -flows_no_insurance.sum(axis=1)
+
+    return PackageResult(
+        total_capital=np.add.reduceat(initial_capital, first_tranche),
+        peak_monthly_payment=(payments + insurance).max(axis=1),
+        total_interests=total_cost_no_insurance - np.add.reduceat(initial_cost, first_tranche),
+        total_cost_no_insurance=total_cost_no_insurance,
+        total_cost=-full_flows.sum(axis=1),
+        full_taeg=full_taeg,
+        taea=full_taeg - _convert_monthly_to_annual_rate(no_insurance_roots),
+    )
+
+
+def package_cash_flows(tranches: Sequence[Tranche], include_insurance: bool = True) -> np.ndarray:
+    """
+    Merged monthly cash flows of a package, seen from the borrower.
+
+    Parameters
+    ----------
+    tranches : Sequence[Tranche]
+        Loans of the package
+    include_insurance : bool, optional
+        Whether insurance payments are part of the flows, by default True
+
+    Returns
+    -------
+    np.ndarray
+        Net cash flow of every month from the signing date to the end of the
+        last tranche, accepted by `compute_effective_rate`
+
+    Examples
+    --------
+    >>> from loan_ranger.common_objects import LoanInputs
+    >>> main_loan = Tranche(LoanInputs(1200.0, 0.12, 3))
+    >>> zero_rate_loan = Tranche(LoanInputs(300.0, 0.0, 2), deferred_months=2)
+    >>> package_cash_flows([main_loan, zero_rate_loan]).round(2)
+    array([1500.  , -408.03, -408.03, -558.03, -150.  ])
+    """
+    disbursements, payments, insurance, _ = _package_cash_flows(*_tranche_columns([tranches]))
+    flows = disbursements - payments
+    if include_insurance:
+        flows -= insurance
+    return flows[0]
+
+
+def compute_package_batch(packages: Sequence[Sequence[Tranche]], chunk_size: int = 1024) -> PackageResult:
+    """
+    Compute the consolidated results of many multi-loan packages.
+
+    Parameters
+    ----------
+    packages : Sequence[Sequence[Tranche]]
+        Tranches of every package (main loan, zero-rate loan, employer loan...),
+        each package holding at least one tranche
+    chunk_size : int, optional
+        Number of packages whose cash flows are built at once, by default 1024
+
+    Returns
+    -------
+    PackageResult
+        A named tuple where each field is an array with one entry per package
+
+    Raises
+    ------
+    ValueError
+        If a package has no tranche
+    RuntimeError
+        If the effective rate solver fails to converge for any package
+
+    Notes
+    -----
+    The TAEG and TAEA are the effective rates of the merged cash flows, not an
+    average of the tranche rates: a deferred zero-rate tranche is correctly
+    weighted by its timing. The schedules of every tranche of a chunk are built
+    as one 2-D array by masks on the months, summed per package, and all merged
+    schedules are solved together by the cash-flow engine.
+
+    Examples
+    --------
+    >>> from loan_ranger.common_objects import LoanInputs
+    >>> main_loan = Tranche(LoanInputs(200000.0, 0.035, 300, 1000.0, 12000.0))
+    >>> ptz = Tranche(LoanInputs(60000.0, 0.0, 120), deferred_months=180)
+    >>> results = compute_package_batch([[main_loan], [main_loan, ptz]])
+    >>> results.full_taeg.round(5)
+    array([0.03988, 0.02831])
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    chunks = [
+        _price_packages(_tranche_columns(packages[start : start + chunk_size]))
+        for start in range(0, len(packages), chunk_size)
+    ]
+    if not chunks:
+        return PackageResult(*(np.empty(0) for _ in PackageResult._fields))
+
+    return PackageResult(*(np.concatenate(field) for field in zip(*chunks, strict=True)))
+
+
+def compute_package(tranches: Sequence[Tranche]) -> PackageResult:
+    """
+    Compute the consolidated results of one multi-loan package.
+
+    Parameters
+    ----------
+    tranches : Sequence[Tranche]
+        Loans of the package, at least one
+
+    Returns
+    -------
+    PackageResult
+        A named tuple with the consolidated totals, TAEG and TAEA
+
+    Examples
+    --------
+    >>> from loan_ranger.common_objects import LoanInputs
+    >>> main_loan = Tranche(LoanInputs(200000.0, 0.035, 300, 1000.0, 12000.0))
+    >>> employer_loan = Tranche(LoanInputs(40000.0, 0.01, 240), start_month=6)
+    >>> round(compute_package([main_loan, employer_loan]).full_taeg, 5)
+    0.03592
+    """
+    return PackageResult(*(field.item() for field in compute_package_batch([tranches])))
@@ -0,0 +1,302 @@
+import struct
+from collections.abc import Sequence
+
+import numpy as np
+
+from .batch_functions import _as_input_columns, compute_all_quantities_batch
+from .common_objects import LoanInputs, LoanInputsBatch, LoanResult
+
+MAGIC = b"LRPORTF\x00"
+VERSION = 1
+
+# magic, version, kind, row count, capacity, column number, padded to HEADER_SIZE bytes
+_HEADER_FORMAT = "<8sIIQQI"
+HEADER_SIZE = 64
+
+# Sections start on multiples of this many bytes, so every column is aligned for its dtype
+_SECTION_ALIGNMENT = 64
+
+# Column layout of each kind of file, in section order
+_KINDS = {
+    0: (
+        LoanInputs,
+        tuple(np.dtype("<i4") if name == "month_number" else np.dtype("<f8") for name in LoanInputs._fields),
+    ),
+    1: (LoanResult, tuple(np.dtype("<f8") for _ in LoanResult._fields)),
+}
+_KIND_BY_TYPE = {record_type: kind for kind, (record_type, _) in _KINDS.items()}
+
+
+def _section_offsets(dtypes: Sequence[np.dtype], capacity: int) -> list[int]:
+    """
+    Byte offset of every column section of a file.
+
+    Parameters
+    ----------
+    dtypes : Sequence[np.dtype]
+        Dtype of each column, in section order
+    capacity : int
+        Number of rows each section can hold
+
+    Returns
+    -------
+    list[int]
+        Offset of each section, followed by the total file size
+    """
+    offsets = [HEADER_SIZE]
+    for dtype in dtypes:
+        section_size = -(-capacity * dtype.itemsize // _SECTION_ALIGNMENT) * _SECTION_ALIGNMENT
+        offsets.append(offsets[-1] + section_size)
+    return offsets
+
+
+def _read_header(path: str) -> tuple[int, int, int]:
+    """
+    Read and check the header of a portfolio file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file
+
+    Returns
+    -------
+    tuple[int, int, int]
+        Kind (0 for inputs, 1 for results), number of rows written and capacity
+
+    Raises
+    ------
+    ValueError
+        If the file is not a portfolio file of a supported version
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path} is too short to be a portfolio file")
+    magic, version, kind, row_number, capacity, column_number = struct.unpack_from(_HEADER_FORMAT, header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a portfolio file")
+    if version != VERSION or kind not in _KINDS or column_number != len(_KINDS[kind][1]):
+        raise ValueError(f"{path} has an unsupported version {version} or layout")
+    return kind, row_number, capacity
+
+
+class PortfolioWriter:
+    """
+    Append-only writer of a columnar portfolio file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file, overwritten if it exists
+    record_type : type, optional
+        LoanInputs or LoanResult, the kind of columns stored, by default LoanResult
+    capacity : int
+        Maximum number of rows, every column section is reserved for that many rows
+
+    Notes
+    -----
+    The file is a 64-byte header (magic, version, kind, number of rows written,
+    capacity, number of columns) followed by one section per field, each
+    section holding `capacity` values and starting on a 64-byte boundary.
+    `month_number` is stored as int32, every other field as float64, little-endian.
+
+    The file is sized once (sparse on most file systems) and each `append`
+    writes its rows at the end of every section, then updates the row count
+    of the header. A file whose writer was interrupted therefore still reads
+    as the rows appended so far.
+
+    Examples
+    --------
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), "results.lrp")
+    >>> with PortfolioWriter(path, LoanResult, capacity=3) as writer:
+    ...     writer.append(LoanResult(*np.ones((7, 2))))
+    ...     writer.append(LoanResult(*np.zeros((7, 1))))
+    >>> open_portfolio(path).full_taeg
+    memmap([1., 1., 0.])
+
+    Durations are checked before the int32 cast:
+
+    >>> with PortfolioWriter(path, LoanInputs, capacity=1) as writer:
+    ...     writer.append(LoanInputs(*np.array([[1000.0], [0.03], [12.5], [0.0], [0.0]])))
+    Traceback (most recent call last):
+    ...
+    ValueError: Column month_number must hold integral values
+    """
+
+    def __init__(self, path: str, record_type: type = LoanResult, *, capacity: int):
+        if record_type not in _KIND_BY_TYPE:
+            raise ValueError("record_type must be LoanInputs or LoanResult")
+        if capacity < 0:
+            raise ValueError("capacity must be non-negative")
+
+        self.path = path
+        self.record_type = record_type
+        self.capacity = capacity
+        self.row_number = 0
+
+        self._kind = _KIND_BY_TYPE[record_type]
+        self._dtypes = _KINDS[self._kind][1]
+        self._offsets = _section_offsets(self._dtypes, capacity)
+
+        self._file = open(path, "w+b")
+        self._file.truncate(self._offsets[-1])
+        self._write_header()
+
+    def __enter__(self) -> "PortfolioWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _write_header(self) -> None:
+        """
+        Write the header with the current number of rows.
+        """
+        header = struct.pack(
+            _HEADER_FORMAT, MAGIC, VERSION, self._kind, self.row_number, self.capacity, len(self._dtypes)
+        )
+        self._file.seek(0)
+        self._file.write(header.ljust(HEADER_SIZE, b"\x00"))
+
+    def append(self, columns: tuple) -> None:
+        """
+        Append rows at the end of every column section.
+
+        Parameters
+        ----------
+        columns : tuple
+            Named tuple of the record type whose fields are 1-D arrays of equal
+            length, e.g. the output of `compute_all_quantities_batch`
+
+        Raises
+        ------
+        ValueError
+            If the columns do not match the record type, are not 1-D arrays of
+            equal length, integer columns hold non-integral or out-of-range
+            values, or the rows do not fit in the remaining capacity
+        """
+        arrays = [np.asarray(column) for column in columns]
+        if len(arrays) != len(self._dtypes):
+            raise ValueError(f"Expected {len(self._dtypes)} columns for {self.record_type.__name__}, got {len(arrays)}")
+        if any(array.ndim != 1 for array in arrays) or len({len(array) for array in arrays}) != 1:
+            raise ValueError("Columns must be 1-D arrays of equal length")
+
+        chunk_rows = len(arrays[0])
+        if self.row_number + chunk_rows > self.capacity:
+            raise ValueError(f"Appending {chunk_rows} rows would exceed the capacity of {self.capacity} rows")
+
+        # Integer columns are checked before anything is written, the cast would truncate or wrap silently
+        for name, dtype, array in zip(self.record_type._fields, self._dtypes, arrays, strict=True):
+            if dtype.kind in "iu" and array.size:
+                limits = np.iinfo(dtype)
+                if array.dtype.kind not in "iu" and not np.all(np.isfinite(array) & (np.trunc(array) == array)):
+                    raise ValueError(f"Column {name} must hold integral values")
+                if array.min() < limits.min or array.max() > limits.max:
+                    raise ValueError(f"Column {name} must be between {limits.min} and {limits.max}")
+
+        for offset, dtype, array in zip(self._offsets[:-1], self._dtypes, arrays, strict=True):
+            self._file.seek(offset + self.row_number * dtype.itemsize)
+            np.ascontiguousarray(array, dtype=dtype).tofile(self._file)
+
+        self.row_number += chunk_rows
+        self._write_header()
+
+    def close(self) -> None:
+        """
+        Flush and close the file, the rows appended so far stay readable.
+        """
+        if not self._file.closed:
+            self._file.close()
+
+
+def open_portfolio(path: str, mode: str = "r") -> LoanInputs | LoanResult:
+    """
+    Map the columns of a portfolio file without reading them.
+
+    Parameters
+    ----------
+    path : str
+        Path of a file written by `PortfolioWriter` or `write_portfolio`
+    mode : str, optional
+        np.memmap mode, "r" (read only) or "r+" (in place updates), by default "r"
+
+    Returns
+    -------
+    LoanInputs | LoanResult
+        Named tuple of np.memmap columns, one entry per row written, depending
+        on the kind of the file. Pages are only read when the values are used.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a portfolio file of a supported version
+    """
+    kind, row_number, capacity = _read_header(path)
+    record_type, dtypes = _KINDS[kind]
+    offsets = _section_offsets(dtypes, capacity)
+
+    return record_type(
+        *(
+            np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=(row_number,))
+            for dtype, offset in zip(dtypes, offsets[:-1], strict=True)
+        )
+    )
+
+
+def write_portfolio(path: str, loan_inputs: LoanInputs | LoanInputsBatch | np.ndarray | Sequence[LoanInputs]) -> None:
+    """
+    Write loan inputs to a portfolio file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file, overwritten if it exists
+    loan_inputs : LoanInputs | LoanInputsBatch | np.ndarray | Sequence[LoanInputs]
+        Loans in any form accepted by `compute_all_quantities_batch`
+    """
+    columns = _as_input_columns(loan_inputs)
+    with PortfolioWriter(path, LoanInputs, capacity=len(columns.initial_capital)) as writer:
+        writer.append(columns)
+
+
+def price_portfolio_file(input_path: str, output_path: str, chunk_size: int = 1_000_000) -> int:
+    """
+    Price a portfolio file into a results file, one chunk in memory at a time.
+
+    Parameters
+    ----------
+    input_path : str
+        Portfolio file of loan inputs
+    output_path : str
+        Results file, overwritten if it exists
+    chunk_size : int, optional
+        Number of loans priced at once, by default 1 000 000
+
+    Returns
+    -------
+    int
+        Number of loans priced
+
+    Notes
+    -----
+    Inputs are read through memory maps and results appended as soon as a
+    chunk is priced, so the memory used depends on `chunk_size` only,
+    whatever the size of the portfolio.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    loan_inputs = open_portfolio(input_path)
+    if not isinstance(loan_inputs, LoanInputs):
+        raise ValueError(f"{input_path} holds results, not loan inputs")
+
+    row_number = len(loan_inputs.initial_capital)
+    with PortfolioWriter(output_path, LoanResult, capacity=row_number) as writer:
+        for start in range(0, row_number, chunk_size):
+            chunk = LoanInputs(*(column[start : start + chunk_size] for column in loan_inputs))
+            writer.append(compute_all_quantities_batch(chunk))
+
+    return row_number
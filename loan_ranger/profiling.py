@@ -0,0 +1,256 @@
+import cProfile
+import functools
+import json
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+# Profilers currently recording
+_active_profilers: list["StageProfiler"] = []
+
+# Stage of every function marked by `profiled`
+_stages: dict[Callable, str] = {}
+
+# Timing wrapper of every marked function, only while a profiler is active
+_wrappers: dict[Callable, Callable] = {}
+
+
+def _timed(function: Callable, stage: str) -> Callable:
+    """
+    Wrap a function so each call is recorded by the active profilers.
+
+    Parameters
+    ----------
+    function : Callable
+        Function to time
+    stage : str
+        Name under which the calls are recorded
+
+    Returns
+    -------
+    Callable
+        The timing wrapper
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start_time = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            for profiler in _active_profilers:
+                profiler.record(stage, elapsed)
+
+    return wrapper
+
+
+def _swap_package_functions(replacements: dict[int, Callable]) -> None:
+    """
+    Replace functions in the namespace of every imported module of the package.
+
+    Parameters
+    ----------
+    replacements : dict[int, Callable]
+        Replacement of each function, keyed by the id of the function replaced
+    """
+    package = __name__.rpartition(".")[0]
+    for name, module in list(sys.modules.items()):
+        if module is None or not (name == package or name.startswith(package + ".")):
+            continue
+        namespace = vars(module)
+        for attribute, value in list(namespace.items()):
+            replacement = replacements.get(id(value))
+            if replacement is not None:
+                namespace[attribute] = replacement
+
+
+def profiled(stage: str) -> Callable[[Callable], Callable]:
+    """
+    Mark a function as a stage timed by `profile`.
+
+    Parameters
+    ----------
+    stage : str
+        Name under which the calls are recorded
+
+    Returns
+    -------
+    Callable[[Callable], Callable]
+        The decorator. It returns the function unchanged, the timing wrapper
+        is only swapped in while a profiler is active, so calls made outside
+        `profile` run at full speed.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        _stages[function] = stage
+        # Module imported inside a profiled block, its wrapper is removed with the others on exit
+        if _active_profilers:
+            _wrappers[function] = _timed(function, stage)
+            return _wrappers[function]
+        return function
+
+    return decorator
+
+
+class StageProfiler:
+    """
+    Wall time and call count of every profiled stage.
+
+    Stages are timed inclusively: the time of `compute_all_quantities` contains
+    the time of the `compute_taeg` solves it runs.
+
+    Examples
+    --------
+    >>> import loan_ranger
+    >>> with profile() as profiler:
+    ...     result = loan_ranger.compute_all_quantities(loan_ranger.LoanInputs(200000, 0.02, 240, 1000, 8000))
+    >>> sorted((stage, row["calls"]) for stage, row in profiler.summary().items())
+    [('compute_all_quantities', 1), ('compute_interest_cost', 1), ('compute_taeg', 2)]
+    """
+
+    def __init__(self):
+        self._totals: dict[str, float] = {}
+        self._calls: dict[str, int] = {}
+        self._start_time = time.perf_counter()
+        self._elapsed: float | None = None
+
+    def record(self, stage: str, elapsed: float) -> None:
+        """
+        Add one run of a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage
+        elapsed : float
+            Wall time of the run, in seconds
+        """
+        self._totals[stage] = self._totals.get(stage, 0.0) + elapsed
+        self._calls[stage] = self._calls.get(stage, 0) + 1
+
+    def stop(self) -> None:
+        """
+        Freeze the total wall time, stages are then shared against it.
+        """
+        if self._elapsed is None:
+            self._elapsed = time.perf_counter() - self._start_time
+
+    @property
+    def elapsed(self) -> float:
+        """
+        Wall time of the profiled block.
+
+        Returns
+        -------
+        float
+            Seconds since the profiler started, up to `stop` once called
+        """
+        return time.perf_counter() - self._start_time if self._elapsed is None else self._elapsed
+
+    def summary(self) -> dict:
+        """
+        Aggregate the recorded stages, hottest first.
+
+        Returns
+        -------
+        dict
+            For each stage, by decreasing total time: number of calls, total and
+            mean wall time in seconds, and share of the profiled wall time
+        """
+        elapsed = self.elapsed
+        return {
+            stage: {
+                "calls": self._calls[stage],
+                "total_time": total,
+                "mean_time": total / self._calls[stage],
+                "share": total / elapsed if elapsed > 0 else 0.0,
+            }
+            for stage, total in sorted(self._totals.items(), key=lambda item: item[1], reverse=True)
+        }
+
+    def report(self) -> str:
+        """
+        Format the summary as a text table.
+
+        Returns
+        -------
+        str
+            One line per stage, hottest first, after the total wall time
+        """
+        lines = [
+            f"Profiled wall time: {self.elapsed:.6f} s",
+            f"{'stage':<30} {'calls':>10} {'total (s)':>12} {'mean (us)':>12} {'share':>8}",
+        ]
+        for stage, row in self.summary().items():
+            lines.append(
+                f"{stage:<30} {row['calls']:>10} {row['total_time']:>12.6f} "
+                f"{row['mean_time'] * 1e6:>12.2f} {row['share']:>8.1%}"
+            )
+        return "\n".join(lines)
+
+    def export(self, path: str) -> None:
+        """
+        Write the summary as JSON.
+
+        Parameters
+        ----------
+        path : str
+            Output file, overwritten if it exists
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"wall_time": self.elapsed, "stages": self.summary()}, file, indent=2)
+
+
+@contextmanager
+def profile(cprofile_path: str | None = None) -> Iterator[StageProfiler]:
+    """
+    Time every profiled stage run inside the `with` block.
+
+    Parameters
+    ----------
+    cprofile_path : str | None, optional
+        If given, the block also runs under cProfile and the statistics are
+        dumped to this file on exit (readable with `pstats`), by default None
+
+    Yields
+    ------
+    StageProfiler
+        The profiler, active until the block exits
+
+    Notes
+    -----
+    Profiled stages are input parsing (prompt or CSV rows), `compute_interest_cost`,
+    the TAEG solves (`compute_taeg`), `compute_all_quantities` and its batch
+    version, and result output (`pretty_print_results`, CSV chunks). cProfile adds a large overhead to every Python
+    call, unlike the stage timers which only read the clock twice per stage.
+
+    The stage timers are swapped into the namespaces of the package modules
+    when the first profiler starts, and removed when the last one stops, so
+    no timing code runs outside the block. A function imported elsewhere
+    before the block (``from loan_ranger import compute_all_quantities``)
+    keeps calling the plain function: its own stage is not recorded, the
+    stages it calls are. Look it up on the package inside the block
+    (``loan_ranger.compute_all_quantities``) to time it as well.
+    """
+    profiler = StageProfiler()
+    python_profiler = cProfile.Profile() if cprofile_path is not None else None
+
+    if not _active_profilers:
+        _wrappers.update((function, _timed(function, stage)) for function, stage in _stages.items())
+        _swap_package_functions({id(function): wrapper for function, wrapper in _wrappers.items()})
+    _active_profilers.append(profiler)
+    if python_profiler is not None:
+        python_profiler.enable()
+    try:
+        yield profiler
+    finally:
+        if python_profiler is not None:
+            python_profiler.disable()
+            python_profiler.dump_stats(cprofile_path)
+        _active_profilers.remove(profiler)
+        if not _active_profilers:
+            _swap_package_functions({id(wrapper): function for function, wrapper in _wrappers.items()})
+            _wrappers.clear()
+        profiler.stop()
@@ -0,0 +1,333 @@
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import numpy as np
+
+from .batch_functions import _installment_per_period_batch
+from .cash_flows import _solve_discount_factor_chunked
+from .common_objects import LoanEvent, LoanInputs, ScenarioResult
+from .core_functions import (
+    _calculate_compound_factor,
+    _convert_monthly_to_annual_rate,
+    _convert_prop_rate,
+    _installment_per_period,
+)
+
+
+class _Segment(NamedTuple):
+    """
+    Part of a schedule amortizing a balance with constant installments.
+    """
+
+    start_month: int
+    month_number: int
+    monthly_rate: float
+    installment: float
+    opening_balance: float
+
+
+def _balance_after(
+    opening_balance: np.ndarray, monthly_rate: np.ndarray, installment: np.ndarray, months: np.ndarray
+) -> np.ndarray:
+    """
+    Capital still due after some installments of an amortizing schedule.
+
+    Parameters
+    ----------
+    opening_balance : np.ndarray
+        Capital due at the start of the schedule
+    monthly_rate : np.ndarray
+        Interest rates per month
+    installment : np.ndarray
+        Constant monthly installments
+    months : np.ndarray
+        Number of installments paid
+
+    Returns
+    -------
+    np.ndarray
+        B_k = B * (1 + r)^k - PMT * ((1 + r)^k - 1) / r, or B - PMT * k for a zero rate
+    """
+    # Scalars from `LoanScenario.apply` go through NumPy too, so a zero rate divides without raising
+    monthly_rate = np.asarray(monthly_rate, dtype=np.float64)
+    compound_factor = _calculate_compound_factor(monthly_rate, months)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        balance = opening_balance * compound_factor - installment * (compound_factor - 1) / monthly_rate
+    return np.where(monthly_rate == 0, opening_balance - installment * months, balance)
+
+
+class LoanScenario:
+    """
+    A loan and the events already applied to it, as a list of schedule segments.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs
+        A named tuple containing all input parameters of the base loan
+
+    Notes
+    -----
+    Scenarios are immutable: `apply` returns a new scenario sharing the
+    unchanged segments of the current one. Applying an event only computes
+    the balance at the event month with the closed form of its segment and
+    one new segment for the suffix, whatever the number of earlier events.
+    Insurance is charged `insurance_cost / month_number` per month while the
+    loan is running, like the average installment of the base loan.
+
+    Examples
+    --------
+    >>> base = LoanScenario(LoanInputs(200000.0, 0.03, 240, 1000.0))
+    >>> scenario = base.apply(LoanEvent(60, prepayment=30000.0, fees=900.0))
+    >>> scenario = scenario.apply(LoanEvent(120, annual_rate=0.02))
+    >>> result = scenario.result()
+    >>> round(result.final_installment, 2), result.end_month
+    (859.54, 240)
+
+    Zero-rate segments amortize linearly:
+
+    >>> zero_rate = LoanScenario(LoanInputs(100000.0, 0.0, 120, 1000.0)).apply(LoanEvent(12, prepayment=10000.0))
+    >>> round(zero_rate.apply(LoanEvent(24, annual_rate=0.0)).result().final_installment, 2)
+    740.74
+    """
+
+    __slots__ = ("loan_inputs", "_segments", "_event_flows")
+
+    def __init__(self, loan_inputs: LoanInputs):
+        monthly_rate = _convert_prop_rate(loan_inputs.annual_rate, 12)
+        installment = _installment_per_period(monthly_rate, loan_inputs.month_number, loan_inputs.initial_capital)
+
+        self.loan_inputs = loan_inputs
+        self._segments = (
+            _Segment(0, loan_inputs.month_number, monthly_rate, installment, float(loan_inputs.initial_capital)),
+        )
+        self._event_flows: tuple[tuple[int, float, float], ...] = ()
+
+    @property
+    def end_month(self) -> int:
+        """
+        Month of the last payment.
+
+        Returns
+        -------
+        int
+            Start month of the last segment plus its number of installments
+        """
+        last = self._segments[-1]
+        return last.start_month + last.month_number
+
+    def apply(self, event: LoanEvent) -> "LoanScenario":
+        """
+        New scenario with one more event, the current one being left unchanged.
+
+        Parameters
+        ----------
+        event : LoanEvent
+            Event to apply, not earlier than the previous events
+
+        Returns
+        -------
+        LoanScenario
+            Scenario whose schedule is unchanged up to the event month
+
+        Raises
+        ------
+        ValueError
+            If the event is earlier than the last segment start or not before the end of the loan
+        """
+        last = self._segments[-1]
+        if not last.start_month <= event.month < self.end_month:
+            raise ValueError(
+                f"Event month must be between {last.start_month} and {self.end_month - 1}, got {event.month}"
+            )
+
+        balance = float(
+            _balance_after(last.opening_balance, last.monthly_rate, last.installment, event.month - last.start_month)
+        )
+        prepayment = min(event.prepayment, balance)
+        balance -= prepayment
+
+        monthly_rate = last.monthly_rate if event.annual_rate is None else _convert_prop_rate(event.annual_rate, 12)
+        month_number = self.end_month - event.month if event.month_number is None else event.month_number
+        if balance <= 0:
+            month_number = 0
+        installment = _installment_per_period(monthly_rate, month_number, balance) if month_number else 0.0
+
+        # The current segment stops at the event, earlier segments are shared with this scenario
+        truncated = last._replace(month_number=event.month - last.start_month)
+        scenario = LoanScenario.__new__(LoanScenario)
+        scenario.loan_inputs = self.loan_inputs
+        scenario._segments = (
+            *self._segments[:-1],
+            truncated,
+            _Segment(event.month, month_number, monthly_rate, installment, balance),
+        )
+        scenario._event_flows = (*self._event_flows, (event.month, prepayment, event.fees))
+        return scenario
+
+    def cash_flows(self, include_insurance: bool = True) -> np.ndarray:
+        """
+        Monthly cash flows of the scenario, seen from the borrower.
+
+        Parameters
+        ----------
+        include_insurance : bool, optional
+            Whether insurance payments are part of the flows, by default True
+
+        Returns
+        -------
+        np.ndarray
+            Capital net of initial costs at month 0, then installments, prepayments
+            and fees as negative flows, accepted by `compute_effective_rate`
+        """
+        flows = np.zeros(self.end_month + 1)
+        flows[0] = self.loan_inputs.initial_capital - self.loan_inputs.initial_cost
+        for segment in self._segments:
+            flows[segment.start_month + 1 : segment.start_month + segment.month_number + 1] -= segment.installment
+        for month, prepayment, fees in self._event_flows:
+            flows[month] -= prepayment + fees
+        if include_insurance:
+            flows[1:] -= self.loan_inputs.insurance_cost / self.loan_inputs.month_number
+        return flows
+
+    def result(self) -> ScenarioResult:
+        """
+        Totals and effective rate of the scenario.
+
+        Returns
+        -------
+        ScenarioResult
+            A named tuple with the installment after the last event, end month,
+            interest, total cost and TAEG
+        """
+        flows = self.cash_flows()
+        roots = _solve_discount_factor_chunked(flows[np.newaxis, :], np.array([len(flows)]))
+
+        total_cost = -float(flows.sum())
+        insurance = self.loan_inputs.insurance_cost * self.end_month / self.loan_inputs.month_number
+        event_fees = sum(fees for _, _, fees in self._event_flows)
+
+        return ScenarioResult(
+            final_installment=self._segments[-1].installment,
+            end_month=self.end_month,
+            total_interests=total_cost - insurance - event_fees - self.loan_inputs.initial_cost,
+            total_cost=total_cost,
+            full_taeg=float(_convert_monthly_to_annual_rate(roots[0])),
+        )
+
+
+def evaluate_scenario(loan_inputs: LoanInputs, events: Sequence[LoanEvent]) -> ScenarioResult:
+    """
+    Totals and effective rate of a loan after early repayments or renegotiations.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs
+        A named tuple containing all input parameters of the base loan
+    events : Sequence[LoanEvent]
+        Events in chronological order
+
+    Returns
+    -------
+    ScenarioResult
+        A named tuple with the installment after the last event, end month,
+        interest, total cost and TAEG
+
+    Examples
+    --------
+    >>> loan = LoanInputs(200000.0, 0.03, 240, 1000.0, 8000.0)
+    >>> result = evaluate_scenario(loan, [LoanEvent(60, prepayment=50000.0, month_number=120, fees=1500.0)])
+    >>> result.end_month, round(result.total_interests, 2)
+    (180, 44727.45)
+    """
+    scenario = LoanScenario(loan_inputs)
+    for event in events:
+        scenario = scenario.apply(event)
+    return scenario.result()
+
+
+def sweep_prepayment_month(
+    loan_inputs: LoanInputs,
+    prepayment: float,
+    months: np.ndarray | None = None,
+    annual_rate: float | None = None,
+    month_number: int | None = None,
+    fees: float = 0.0,
+) -> ScenarioResult:
+    """
+    Evaluate the same early repayment at many candidate months in one vectorized pass.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs
+        A named tuple containing all input parameters of the base loan
+    prepayment : float
+        Capital repaid early, capped to the capital still due
+    months : np.ndarray | None, optional
+        Candidate event months, by default every month from 1 to the last but one
+    annual_rate : float | None, optional
+        New annual rate after the event, by default the loan rate
+    month_number : int | None, optional
+        New number of remaining monthly payments, by default the remaining term
+    fees : float, optional
+        Penalties paid at the event, by default 0
+
+    Returns
+    -------
+    ScenarioResult
+        A named tuple where each field is an array with one entry per candidate month,
+        same values as `evaluate_scenario` with a single LoanEvent
+
+    Notes
+    -----
+    Balances at the candidate months come from the closed form of the base
+    schedule, the new installments from the vectorized annuity formula, and
+    the cash flows of all candidates are built as one 2-D array by masks on
+    the months before a single batched TAEG solve.
+
+    Examples
+    --------
+    >>> loan = LoanInputs(200000.0, 0.03, 240, 1000.0, 8000.0)
+    >>> sweep = sweep_prepayment_month(loan, 50000.0, months=np.array([12, 60, 120]), fees=1500.0)
+    >>> sweep.total_interests.round(2)
+    array([50549.56, 54054.5 , 58270.4 ])
+    """
+    base_month_number = loan_inputs.month_number
+    months = np.arange(1, base_month_number) if months is None else np.asarray(months, dtype=np.int64)
+    if ((months < 0) | (months >= base_month_number)).any():
+        raise ValueError(f"Event months must be between 0 and {base_month_number - 1}")
+
+    base_rate = _convert_prop_rate(loan_inputs.annual_rate, 12)
+    base_installment = _installment_per_period(base_rate, base_month_number, loan_inputs.initial_capital)
+    balance = _balance_after(loan_inputs.initial_capital, base_rate, base_installment, months)
+    prepaid = np.minimum(prepayment, balance)
+    balance = balance - prepaid
+
+    monthly_rate = base_rate if annual_rate is None else _convert_prop_rate(annual_rate, 12)
+    remaining_months = base_month_number - months if month_number is None else np.full_like(months, month_number)
+    remaining_months = np.where(balance > 0, remaining_months, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        installment = _installment_per_period_batch(np.full(len(months), monthly_rate), remaining_months, balance)
+    installment = np.where(remaining_months > 0, installment, 0.0)
+    end_month = months + remaining_months
+
+    # One row of cash flows per candidate month
+    month_grid = np.arange(end_month.max(initial=0) + 1)
+    before = (month_grid >= 1) & (month_grid <= months[:, np.newaxis])
+    after = (month_grid > months[:, np.newaxis]) & (month_grid <= end_month[:, np.newaxis])
+    insurance = loan_inputs.insurance_cost / base_month_number
+
+    flows = np.where(before, -(base_installment + insurance), 0.0)
+    flows -= np.where(after, (installment + insurance)[:, np.newaxis], 0.0)
+    flows[:, 0] = loan_inputs.initial_capital - loan_inputs.initial_cost
+    flows[np.arange(len(months)), months] -= prepaid + fees
+
+    roots = _solve_discount_factor_chunked(flows, end_month + 1)
+
+    total_cost = -flows.sum(axis=1)
+    return ScenarioResult(
+        final_installment=installment,
+        end_month=end_month,
+        total_interests=total_cost - insurance * end_month - fees - loan_inputs.initial_cost,
+        total_cost=total_cost,
+        full_taeg=_convert_monthly_to_annual_rate(roots),
+    )
@@ -0,0 +1,97 @@
+from collections.abc import Iterator
+
+import numpy as np
+
+from .common_objects import AmortizationSchedule, LoanInputs, ScheduleRow
+from .core_functions import _convert_prop_rate, _installment_per_period
+
+
+def iter_amortization_schedule(loan_inputs: LoanInputs) -> Iterator[ScheduleRow]:
+    """
+    Yield the amortization schedule of a loan one period at a time.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs
+        A named tuple containing all input parameters for the loan
+
+    Yields
+    ------
+    ScheduleRow
+        Interest, principal, remaining balance and insurance of each period
+
+    Notes
+    -----
+    Only the current balance is kept between two rows, so arbitrarily long
+    schedules can be consumed without holding them in memory.
+    The insurance cost is spread evenly over the periods, consistently with
+    the average installment used for the TAEG.
+
+    Examples
+    --------
+    >>> rows = iter_amortization_schedule(LoanInputs(1200, 0.12, 12))
+    >>> next(rows)
+    ScheduleRow(period=1, interest=12.0, principal=94.61854641401, remaining_balance=1105.38145358599, insurance=0.0)
+    """
+    monthly_rate = _convert_prop_rate(loan_inputs.annual_rate, 12)
+    installment = _installment_per_period(monthly_rate, loan_inputs.month_number, loan_inputs.initial_capital)
+    insurance = loan_inputs.insurance_cost / loan_inputs.month_number
+
+    remaining_balance = loan_inputs.initial_capital
+    for period in range(1, loan_inputs.month_number + 1):
+        interest = remaining_balance * monthly_rate
+        principal = installment - interest
+        remaining_balance -= principal
+        yield ScheduleRow(period, interest, principal, remaining_balance, insurance)
+
+
+def compute_amortization_schedule(loan_inputs: LoanInputs) -> AmortizationSchedule:
+    """
+    Compute the full amortization schedule of a loan as NumPy columns.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs
+        A named tuple containing all input parameters for the loan
+
+    Returns
+    -------
+    AmortizationSchedule
+        A named tuple of contiguous arrays, one entry per period
+
+    Notes
+    -----
+    Remaining balances use the closed form
+    B_k = P * (1 + r)^k - PMT * ((1 + r)^k - 1) / r
+    (B_k = P - PMT * k for a zero rate), computed in place over preallocated
+    arrays. Interest and principal follow from the balance of the previous period,
+    so no Python loop runs over the periods and no error accumulates along the schedule.
+    """
+    month_number = loan_inputs.month_number
+    initial_capital = loan_inputs.initial_capital
+    monthly_rate = _convert_prop_rate(loan_inputs.annual_rate, 12)
+    installment = _installment_per_period(monthly_rate, month_number, initial_capital)
+
+    period = np.arange(1, month_number + 1)
+    interest = np.empty(month_number)
+    principal = np.empty(month_number)
+    remaining_balance = np.empty(month_number)
+    insurance = np.full(month_number, loan_inputs.insurance_cost / month_number)
+
+    if monthly_rate == 0:
+        # Linear repayment of the capital
+        np.multiply(period, -installment, out=remaining_balance)
+        remaining_balance += initial_capital
+    else:
+        # Compound factors (1 + r)^k, then B_k = P * f_k - PMT * (f_k - 1) / r
+        np.power(1 + monthly_rate, period, out=principal)
+        np.multiply(principal, initial_capital - installment / monthly_rate, out=remaining_balance)
+        remaining_balance += installment / monthly_rate
+
+    # Interest is paid on the balance before the installment, the rest goes to principal
+    interest[0] = initial_capital
+    interest[1:] = remaining_balance[:-1]
+    interest *= monthly_rate
+    np.subtract(installment, interest, out=principal)
+
+    return AmortizationSchedule(period, interest, principal, remaining_balance, insurance)
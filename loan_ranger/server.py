@@ -0,0 +1,586 @@
+import asyncio
+import json
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor
+
+import numpy as np
+
+from .batch_functions import _as_input_columns, _price_input_columns
+from .bulk_pricer import _check_loan_inputs
+from .common_objects import LoanInputs, LoanResult
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    422: "Unprocessable Content",
+    500: "Internal Server Error",
+}
+MAX_BODY_BYTES = 64 * 1024
+
+
+def price_quotes(loans: list[LoanInputs]) -> tuple[LoanResult, np.ndarray]:
+    """
+    Price a batch of quotes, keeping loans whose TAEG does not converge.
+
+    Parameters
+    ----------
+    loans : list[LoanInputs]
+        Validated loans to price
+
+    Returns
+    -------
+    results : LoanResult
+        A named tuple of arrays with one entry per loan
+    converged : np.ndarray
+        Boolean mask of loans whose TAEG solves converged
+    """
+    return _price_input_columns(_as_input_columns(loans))
+
+
+class MicroBatcher:
+    """
+    Group concurrent quote requests into vectorized pricing calls.
+
+    Parameters
+    ----------
+    max_batch_size : int, optional
+        Maximum number of loans priced in one call, by default 256
+    max_wait : float, optional
+        Longest time, in seconds, the first request of a batch waits for others, by default 0.002
+    price_batch : Callable[[list[LoanInputs]], tuple[LoanResult, np.ndarray]], optional
+        Batch pricing function returning the results and the per-loan convergence
+        mask, by default `price_quotes`
+    executor : Executor | None, optional
+        Executor running the pricing off the event loop, by default None (asyncio default thread pool)
+    history_size : int, optional
+        Number of latest latencies and batch sizes kept for statistics, by default 10 000
+
+    Notes
+    -----
+    A batch is closed as soon as it is full or `max_wait` after its first request,
+    whichever comes first, so the extra latency of a request is bounded by `max_wait`
+    plus the pricing time of one batch. While a batch is being priced, the next one
+    fills up in the queue. A loan whose TAEG does not converge only fails its own
+    request, with a RuntimeError, the other loans of the batch are answered.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 256,
+        max_wait: float = 0.002,
+        price_batch: Callable[[list[LoanInputs]], tuple[LoanResult, np.ndarray]] = price_quotes,
+        executor: Executor | None = None,
+        history_size: int = 10_000,
+    ):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._price_batch = price_batch
+        self._executor = executor
+        self._queue: asyncio.Queue[tuple[LoanInputs, asyncio.Future, float]] = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+        self._latencies: deque[float] = deque(maxlen=history_size)
+        self._batch_sizes: deque[int] = deque(maxlen=history_size)
+        self._request_count = 0
+        self._batch_count = 0
+
+    def start(self) -> None:
+        """
+        Start the batching task on the running event loop.
+        """
+        if self._worker is None:
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the batching task, pending requests are cancelled.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            future.cancel()
+
+    async def submit(self, loan_inputs: LoanInputs) -> LoanResult:
+        """
+        Queue a loan and wait for its results.
+
+        Parameters
+        ----------
+        loan_inputs : LoanInputs
+            A named tuple containing all input parameters for the loan
+
+        Returns
+        -------
+        LoanResult
+            The results of this loan, as Python floats
+
+        Raises
+        ------
+        RuntimeError
+            If the TAEG computation fails to converge for this loan
+        """
+        future = asyncio.get_running_loop().create_future()
+        start_time = time.perf_counter()
+        await self._queue.put((loan_inputs, future, start_time))
+        result = await future
+        self._latencies.append(time.perf_counter() - start_time)
+        return result
+
+    async def _collect_batch(self) -> list[tuple[LoanInputs, asyncio.Future, float]]:
+        """
+        Wait for a first request, then gather more until the batch is full or the window ends.
+
+        Returns
+        -------
+        list[tuple[LoanInputs, asyncio.Future, float]]
+            Queued requests forming the next batch
+        """
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Take what is already queued without waiting
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if len(batch) >= self.max_batch_size:
+                break
+
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        """
+        Batching loop: collect a batch, price it off the event loop, resolve the futures.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            pending = [(loan_inputs, future) for loan_inputs, future, _ in batch if not future.done()]
+            if not pending:
+                continue
+
+            self._batch_count += 1
+            self._request_count += len(pending)
+            self._batch_sizes.append(len(pending))
+
+            try:
+                results, converged = await loop.run_in_executor(
+                    self._executor, self._price_batch, [loan_inputs for loan_inputs, _ in pending]
+                )
+            except Exception as error:  # noqa: BLE001 - forwarded to every waiting request
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            rows = zip(*(np.asarray(column).tolist() for column in results), strict=True)
+            for (_, future), row, is_converged in zip(pending, rows, converged.tolist(), strict=True):
+                if future.done():
+                    continue
+                if is_converged:
+                    future.set_result(LoanResult(*row))
+                else:
+                    future.set_exception(RuntimeError("TAEG computation failed to converge"))
+
+    def stats(self) -> dict:
+        """
+        Latency and batch size statistics over the latest requests.
+
+        Returns
+        -------
+        dict
+            Request and batch counts, latency percentiles in milliseconds and batch size statistics
+        """
+        stats = {"requests": self._request_count, "batches": self._batch_count}
+
+        if self._latencies:
+            percentiles = np.percentile(np.array(self._latencies) * 1e3, [50, 90, 99])
+            stats["latency_ms"] = dict(zip(("p50", "p90", "p99"), percentiles.tolist(), strict=True))
+        if self._batch_sizes:
+            batch_sizes = np.array(self._batch_sizes)
+            stats["batch_size"] = {"mean": float(batch_sizes.mean()), "max": int(batch_sizes.max())}
+
+        return stats
+
+
+def _reject_constant(name: str) -> float:
+    """
+    Refuse the non-standard Infinity and NaN JSON constants.
+
+    Parameters
+    ----------
+    name : str
+        The constant found in the body
+
+    Raises
+    ------
+    ValueError
+        Always
+    """
+    raise ValueError(f"non-finite value {name} is not allowed")
+
+
+def _parse_month_number(value: object) -> int:
+    """
+    Convert a JSON number of months, refusing booleans and fractional values.
+
+    Parameters
+    ----------
+    value : object
+        Decoded JSON value
+
+    Returns
+    -------
+    int
+        The number of months
+
+    Raises
+    ------
+    ValueError
+        If the value is not an integral number
+    """
+    if isinstance(value, bool) or not isinstance(value, int | float) or not float(value).is_integer():
+        raise ValueError(f"month_number must be an integer, got {value!r}")
+    return int(value)
+
+
+def _parse_quote(body: bytes) -> LoanInputs:
+    """
+    Parse and validate the JSON body of a quote request.
+
+    Parameters
+    ----------
+    body : bytes
+        JSON object with LoanInputs field names as keys, initial_cost and insurance_cost are optional
+
+    Returns
+    -------
+    LoanInputs
+        The validated loan inputs
+
+    Raises
+    ------
+    ValueError
+        If the body is not valid JSON or a value is missing, not finite or out of range
+    """
+    payload = json.loads(body, parse_constant=_reject_constant)
+    if not isinstance(payload, dict):
+        raise ValueError("request body must be a JSON object")
+
+    unknown_fields = set(payload) - set(LoanInputs._fields)
+    if unknown_fields:
+        raise ValueError(f"unknown field(s): {', '.join(sorted(unknown_fields))}")
+
+    try:
+        loan_inputs = LoanInputs(
+            initial_capital=float(payload["initial_capital"]),
+            annual_rate=float(payload["annual_rate"]),
+            month_number=_parse_month_number(payload["month_number"]),
+            initial_cost=float(payload.get("initial_cost", 0.0)),
+            insurance_cost=float(payload.get("insurance_cost", 0.0)),
+        )
+    except KeyError as error:
+        raise ValueError(f"missing field {error}") from None
+    except (TypeError, OverflowError) as error:
+        raise ValueError(str(error)) from None
+
+    _check_loan_inputs(loan_inputs)
+    return loan_inputs
+
+
+class QuoteServer:
+    """
+    Minimal JSON over HTTP/1.1 quoting server built on asyncio streams.
+
+    Endpoints
+    ---------
+    POST /quote
+        Body is a JSON object with LoanInputs fields, answer is the LoanResult as a JSON object
+    GET /stats
+        Latency percentiles and batch size statistics of the micro-batcher
+
+    Parameters
+    ----------
+    host : str, optional
+        Interface to listen on, by default "127.0.0.1"
+    port : int, optional
+        Port to listen on, by default 8000. 0 picks a free port, see `port` after `start`.
+    batcher : MicroBatcher | None, optional
+        Micro-batcher pricing the quotes, by default a new one with default settings
+
+    Examples
+    --------
+    >>> async def demo():
+    ...     async with QuoteServer(port=0) as server:
+    ...         return await request_json(server.host, server.port, "POST", "/quote", {
+    ...             "initial_capital": 200000, "annual_rate": 0.02, "month_number": 240,
+    ...         })
+    >>> round(asyncio.run(demo())[1]["monthly_installment_no_insurance"], 2)
+    1011.77
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8000, batcher: MicroBatcher | None = None):
+        self.host = host
+        self.port = port
+        self._batcher = batcher
+        self._server: asyncio.Server | None = None
+
+    async def __aenter__(self) -> "QuoteServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """
+        Start listening and batching.
+        """
+        if self._batcher is None:
+            self._batcher = MicroBatcher()
+        self._batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """
+        Stop listening, then stop the batcher.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self._batcher.stop()
+
+    async def serve_forever(self) -> None:
+        """
+        Start the server if needed and serve until cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serve the requests of one connection, keeping it alive between requests.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Incoming side of the connection
+        writer : asyncio.StreamWriter
+            Outgoing side of the connection
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = (request_line.split(" ") + ["", "", ""])[:3]
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    content_length = int(headers.get("content-length", "0") or 0)
+                except ValueError:
+                    content_length = -1
+                if content_length < 0:
+                    # The end of the body is unknown, the connection cannot be reused
+                    await self._respond(writer, 400, {"error": "invalid Content-Length"}, keep_alive=False)
+                    break
+                if content_length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(content_length) if content_length else b""
+
+                status, payload = await self._dispatch(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        """
+        Route a request, turning unexpected errors into a 500 response.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method
+        path : str
+            Request path
+        body : bytes
+            Request body
+
+        Returns
+        -------
+        tuple[int, dict]
+            HTTP status and JSON payload
+        """
+        try:
+            return await self._route(method, path, body)
+        except Exception as error:  # noqa: BLE001 - the connection must survive a failed request
+            return 500, {"error": f"internal error: {error}"}
+
+    async def _route(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        """
+        Route a request.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method
+        path : str
+            Request path
+        body : bytes
+            Request body
+
+        Returns
+        -------
+        tuple[int, dict]
+            HTTP status and JSON payload
+        """
+        if path == "/quote":
+            if method != "POST":
+                return 405, {"error": "use POST"}
+            try:
+                loan_inputs = _parse_quote(body)
+            except ValueError as error:
+                return 400, {"error": str(error)}
+            try:
+                result = await self._batcher.submit(loan_inputs)
+            except RuntimeError as error:
+                return 422, {"error": str(error)}
+            return 200, result._asdict()
+
+        if path == "/stats":
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, self._batcher.stats()
+
+        return 404, {"error": f"unknown path {path}"}
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool) -> None:
+        """
+        Write a JSON response.
+
+        Parameters
+        ----------
+        writer : asyncio.StreamWriter
+            Outgoing side of the connection
+        status : int
+            HTTP status
+        payload : dict
+            JSON-serializable response body
+        keep_alive : bool
+            Whether the connection stays open after this response
+        """
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def request_json(host: str, port: int, method: str, path: str, payload: dict | None = None) -> tuple[int, dict]:
+    """
+    Send one JSON request to a server, mainly for local tests and benchmarks.
+
+    Parameters
+    ----------
+    host : str
+        Server host
+    port : int
+        Server port
+    method : str
+        HTTP method
+    path : str
+        Request path
+    payload : dict | None, optional
+        JSON body, by default None (no body)
+
+    Returns
+    -------
+    tuple[int, dict]
+        HTTP status and decoded JSON body
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        head = f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+        status_line, *header_lines = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        response_body = await reader.readexactly(int(headers.get("content-length", "0")))
+        return int(status_line.split(" ")[1]), json.loads(response_body)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def run_server(host: str = "127.0.0.1", port: int = 8000, max_batch_size: int = 256, max_wait: float = 0.002) -> None:
+    """
+    Run a quoting server until interrupted.
+
+    Parameters
+    ----------
+    host : str, optional
+        Interface to listen on, by default "127.0.0.1"
+    port : int, optional
+        Port to listen on, by default 8000
+    max_batch_size : int, optional
+        Maximum number of loans priced in one call, by default 256
+    max_wait : float, optional
+        Batching window in seconds, by default 0.002
+    """
+
+    async def serve() -> None:
+        server = QuoteServer(host, port, MicroBatcher(max_batch_size=max_batch_size, max_wait=max_wait))
+        await server.start()
+        print(f"Serving quotes on http://{server.host}:{server.port} (POST /quote, GET /stats)")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
@@ -1,5 +1,6 @@
 from .common_objects import LoanInputs, LoanResult
 from .core_functions import compute_all_quantities
+from .profiling import profiled
 
 
 def _format_currency(value: float, width: int = 10) -> str:
@@ -75,6 +76,7 @@ def _print_loan_result_line(label: str, value: str) -> None:
     print(f"{label:<{label_width}} {value}")
 
 
+@profiled("pretty_print_results")
 def pretty_print_results(loan_inputs: LoanInputs, loan_result: LoanResult) -> None:
     """
     Print a formatted summary of loan calculation results.
@@ -243,6 +245,7 @@ def _get_loan_duration() -> int:
         return month_number
 
 
+@profiled("parse_inputs")
 def prompt_for_loan_inputs() -> LoanInputs:
     """
     Interactively prompt the user for loan parameters.
@@ -0,0 +1,234 @@
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .batch_functions import _installment_per_period_batch
+from .cash_flows import _solve_discount_factor_chunked
+from .common_objects import LoanInputs, VariableRateModel, VariableRateResult
+from .core_functions import _calculate_compound_factor, _convert_monthly_to_annual_rate, _convert_prop_rate
+
+# Paths drawn from one child seed, chunks are made of whole blocks so the draws do not
+# depend on the memory cap nor on the number of workers
+_PATHS_PER_SEED = 1024
+
+# Float64 arrays of one value per path and month alive at the peak of a chunk: the flows
+# plus the working arrays of the TAEG solver (masked and weighted flows, powers, products),
+# measured at about 5.3 and rounded up
+_ARRAYS_PER_PATH_MONTH = 6
+
+
+def _reset_rates(
+    annual_rate: float, model: VariableRateModel, reset_number: int, generator: np.random.Generator, path_number: int
+) -> np.ndarray:
+    """
+    Draw the applied annual rate of every reset period.
+
+    Parameters
+    ----------
+    annual_rate : float
+        Initial annual rate, applied until the first reset
+    model : VariableRateModel
+        Rate model and cap/floor parameters
+    reset_number : int
+        Number of rate periods of the loan, the first one included
+    generator : np.random.Generator
+        Source of the random draws
+    path_number : int
+        Number of paths to draw
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (path_number, reset_number), column 0 being the initial rate
+
+    Notes
+    -----
+    The Ornstein-Uhlenbeck process is sampled exactly at the reset dates,
+    x_(j+1) = m + (x_j - m) * e^(-a dt) + s * sqrt((1 - e^(-2 a dt)) / (2 a)) * eps,
+    so no intermediate month needs to be simulated. The cap and floor apply
+    to the rate used for the installments, not to the underlying process.
+    """
+    long_term_rate = annual_rate if model.long_term_rate is None else model.long_term_rate
+    step = model.reset_months / 12
+    decay = np.exp(-model.reversion_speed * step)
+    if model.reversion_speed > 0:
+        shock_scale = model.volatility * np.sqrt((1 - decay**2) / (2 * model.reversion_speed))
+    else:
+        shock_scale = model.volatility * np.sqrt(step)
+
+    rates = np.empty((path_number, reset_number))
+    rates[:, 0] = annual_rate
+    shocks = generator.standard_normal((path_number, reset_number - 1))
+    for reset in range(1, reset_number):
+        rates[:, reset] = long_term_rate + (rates[:, reset - 1] - long_term_rate) * decay
+        rates[:, reset] += shock_scale * shocks[:, reset - 1]
+
+    lowest_rate = max(annual_rate - model.rate_floor, 0.0)
+    return np.clip(rates, lowest_rate, annual_rate + model.rate_cap)
+
+
+def _simulate_chunk(
+    loan_inputs: LoanInputs, model: VariableRateModel, seeds: Sequence[np.random.SeedSequence], path_number: int
+) -> np.ndarray:
+    """
+    Simulate a chunk of rate paths and price the loan on each of them.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs
+        A named tuple containing all input parameters for the loan
+    model : VariableRateModel
+        Rate model and cap/floor parameters
+    seeds : Sequence[np.random.SeedSequence]
+        One child seed per block of `_PATHS_PER_SEED` paths
+    path_number : int
+        Number of paths of the chunk, the last block may be partial
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (path_number, 3): total cost, peak installment and TAEG of each path
+    """
+    month_number = loan_inputs.month_number
+    reset_months = model.reset_months
+    reset_number = -(-month_number // reset_months)
+
+    annual_rates = np.concatenate(
+        [
+            _reset_rates(
+                loan_inputs.annual_rate,
+                model,
+                reset_number,
+                np.random.default_rng(seed),
+                min(_PATHS_PER_SEED, path_number - block * _PATHS_PER_SEED),
+            )
+            for block, seed in enumerate(seeds)
+        ]
+    )
+
+    flows = np.empty((path_number, month_number + 1))
+    flows[:, 0] = loan_inputs.initial_capital - loan_inputs.initial_cost
+    balance = np.full(path_number, float(loan_inputs.initial_capital))
+    peak_installment = np.zeros(path_number)
+
+    # Re-amortize the remaining balance over the remaining months at every reset
+    for reset in range(reset_number):
+        first_month = reset * reset_months
+        period_length = min(reset_months, month_number - first_month)
+        monthly_rate = _convert_prop_rate(annual_rates[:, reset], 12)
+        installment = _installment_per_period_batch(monthly_rate, month_number - first_month, balance)
+
+        flows[:, first_month + 1 : first_month + 1 + period_length] = -installment[:, np.newaxis]
+        np.maximum(peak_installment, installment, out=peak_installment)
+
+        compound_factor = _calculate_compound_factor(monthly_rate, period_length)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            amortized_balance = balance * compound_factor - installment * (compound_factor - 1) / monthly_rate
+        balance = np.where(monthly_rate == 0, balance - installment * period_length, amortized_balance)
+
+    flows[:, 1:] -= loan_inputs.insurance_cost / month_number
+
+    roots = _solve_discount_factor_chunked(flows, np.full(path_number, month_number + 1))
+
+    results = np.empty((path_number, 3))
+    results[:, 0] = -flows.sum(axis=1)
+    results[:, 1] = peak_installment
+    results[:, 2] = _convert_monthly_to_annual_rate(roots)
+    return results
+
+
+def simulate_variable_rate(
+    loan_inputs: LoanInputs,
+    model: VariableRateModel | None = None,
+    path_number: int = 10_000,
+    quantile_levels: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95),
+    seed: int | None = None,
+    max_bytes: int = 64 * 2**20,
+    max_workers: int | None = None,
+) -> VariableRateResult:
+    """
+    Distribution of the cost of a capped variable-rate loan over simulated rate paths.
+
+    Parameters
+    ----------
+    loan_inputs : LoanInputs
+        A named tuple containing all input parameters for the loan, `annual_rate`
+        being the rate until the first reset
+    model : VariableRateModel | None, optional
+        Rate model and cap/floor parameters, by default VariableRateModel()
+    path_number : int, optional
+        Number of simulated rate paths, by default 10 000
+    quantile_levels : Sequence[float], optional
+        Probability levels of the reported quantiles, by default 5%, 25%, 50%, 75% and 95%
+    seed : int | None, optional
+        Seed of the random draws, by default None (fresh entropy)
+    max_bytes : int, optional
+        Approximate peak memory of the chunks simulated at once, shared between
+        the workers, by default 64 MiB
+    max_workers : int | None, optional
+        Maximum number of worker processes, by default None (one per CPU). A
+        single chunk, or a single worker, runs in the current process.
+
+    Returns
+    -------
+    VariableRateResult
+        Quantiles of total cost, peak installment and TAEG
+
+    Notes
+    -----
+    Paths are simulated by chunks of whole blocks of 1024 paths, each block
+    drawing from its own child of the seed, so for a given seed the results do
+    not depend on `max_bytes` nor `max_workers`. Every worker holds one chunk
+    at a time, so chunks are sized to fit `max_bytes` divided by the number of
+    workers, and fewer workers are started when `max_bytes` cannot hold one
+    block per worker. A single block is always allowed, whatever `max_bytes`.
+    Within a chunk every reset is one vectorized step over all paths: the
+    installment is recomputed on the remaining balance and remaining months,
+    and the balance is moved to the next reset with the closed form. The
+    TAEG of every path is then solved on its realized cash flows. Only three
+    numbers per path are kept once a chunk is done.
+
+    Examples
+    --------
+    >>> loan = LoanInputs(200000.0, 0.03, 240, 1000.0, 8000.0)
+    >>> result = simulate_variable_rate(loan, path_number=2000, seed=42, max_workers=1)
+    >>> result.full_taeg.round(4)
+    array([0.028 , 0.0314, 0.0343, 0.0373, 0.0406])
+    """
+    model = VariableRateModel() if model is None else model
+    if model.reset_months < 1:
+        raise ValueError("reset_months must be at least 1")
+    if path_number < 1:
+        raise ValueError("path_number must be at least 1")
+
+    block_number = -(-path_number // _PATHS_PER_SEED)
+    seeds = np.random.SeedSequence(seed).spawn(block_number)
+
+    block_bytes = _ARRAYS_PER_PATH_MONTH * (loan_inputs.month_number + 1) * np.dtype(np.float64).itemsize
+    block_bytes *= _PATHS_PER_SEED
+
+    # Every worker holds one chunk at a time, the memory cap is shared between them
+    worker_number = (os.cpu_count() or 1) if max_workers is None else max_workers
+    worker_number = max(1, min(worker_number, block_number, max_bytes // block_bytes))
+    blocks_per_chunk = max(1, max_bytes // (block_bytes * worker_number))
+    chunk_starts = range(0, block_number, blocks_per_chunk)
+    chunk_seeds = [seeds[start : start + blocks_per_chunk] for start in chunk_starts]
+    chunk_paths = [
+        min(path_number, (start + blocks_per_chunk) * _PATHS_PER_SEED) - start * _PATHS_PER_SEED
+        for start in chunk_starts
+    ]
+
+    arguments = ([loan_inputs] * len(chunk_seeds), [model] * len(chunk_seeds), chunk_seeds, chunk_paths)
+    if len(chunk_seeds) == 1 or worker_number == 1:
+        chunk_results = list(map(_simulate_chunk, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=worker_number) as executor:
+            chunk_results = list(executor.map(_simulate_chunk, *arguments))
+
+    results = np.concatenate(chunk_results)
+    levels = np.asarray(quantile_levels, dtype=np.float64)
+    total_cost, peak_installment, full_taeg = np.quantile(results, levels, axis=0).T
+
+    return VariableRateResult(path_number, levels, total_cost, peak_installment, full_taeg)